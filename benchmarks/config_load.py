@@ -0,0 +1,89 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Compares loading a large C64 config into a Device one control at a time, as add_all_c64_controls
+# used to, with the single pass bulk load. Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/config_load.py --controls 5000
+
+import argparse
+import time
+
+import dashio
+from dashio.load_config import CONFIG_INSTANCE_DICT, CONTROL_INSTANCE_DICT
+
+CONTROL_TYPES = (dashio.Knob, dashio.Dial, dashio.Slider, dashio.Button, dashio.TextBox, dashio.Label, dashio.Selector, dashio.Direction)
+
+
+def make_config(count: int) -> str:
+    """Returns a C64 config of count controls, cycling through CONTROL_TYPES."""
+    cfg = {"CFG": {"deviceSetup": ""}}
+    position = dashio.ControlPosition(0.0, 0.0, 0.5, 0.1)
+    for i in range(count):
+        control = CONTROL_TYPES[i % len(CONTROL_TYPES)](f"C{i}", control_position=position)
+        cfg.setdefault(control.ctrl_type, []).extend(control.get_cfg64(["", "", "DASH_ID", "1"]))
+    return dashio.encode_cfg64(cfg)
+
+
+def load_one_at_a_time(device: dashio.Device, cfg_dict: dict):
+    for control_type, control_list in cfg_dict.items():
+        if isinstance(control_list, list):
+            for control in control_list:
+                key = f"{control_type}\t{control['controlID']}"
+                if device.is_control_loaded(control_type, control['controlID']):
+                    cfg = CONFIG_INSTANCE_DICT[control_type].from_dict(control)
+                    device.controls_dict[key].add_config(cfg)
+                else:
+                    device.add_control(CONTROL_INSTANCE_DICT[control_type].from_cfg_dict(control))
+
+
+def load_bulk(device: dashio.Device, cfg_dict: dict):
+    device.add_all_c64_controls(cfg_dict)
+
+
+def time_load(load, c64: str, runs: int) -> float:
+    """Returns the fastest time in seconds to decode c64 and load it into a new Device."""
+    best = None
+    for _ in range(runs):
+        device = dashio.Device("BENCH", "BENCH_ID", "Bench")
+        start = time.perf_counter()
+        load(device, dashio.decode_cfg64(c64))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare loading a large config one control at a time and in bulk")
+    parser.add_argument("--controls", type=int, default=5000, help="Number of controls in the config")
+    parser.add_argument("--runs", type=int, default=3, help="Runs of each load, the fastest is reported")
+    args = parser.parse_args()
+    c64 = make_config(args.controls)
+    for name, load in (("one at a time", load_one_at_a_time), ("bulk", load_bulk)):
+        seconds = time_load(load, c64, args.runs)
+        print(f"{name:>14}: {seconds * 1000:8.1f} ms, {seconds * 1e6 / args.controls:6.1f} us per control")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Compares starting a Device from a C64 config with starting it from a ConfigSnapshot, and the
+# first CFG reply with and without a saved payload. Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/config_snapshot.py --controls 5000
+
+import argparse
+import os
+import tempfile
+import time
+
+import dashio
+
+CONTROL_TYPES = (dashio.Knob, dashio.Dial, dashio.Slider, dashio.Button, dashio.TextBox, dashio.Label, dashio.Selector, dashio.Direction)
+CFG_REQUEST = ["BENCH_ID", "CFG", "DASH_ID", "1"]
+
+
+def make_config(count: int) -> str:
+    """Returns a C64 config of count controls, cycling through CONTROL_TYPES."""
+    cfg = {"CFG": {"deviceSetup": "", "cfgRev": 1}}
+    position = dashio.ControlPosition(0.0, 0.0, 0.5, 0.1)
+    for i in range(count):
+        control = CONTROL_TYPES[i % len(CONTROL_TYPES)](f"C{i}", control_position=position)
+        cfg.setdefault(control.ctrl_type, []).extend(control.get_cfg64(["", "", "DASH_ID", "1"]))
+    return dashio.encode_cfg64(cfg)
+
+
+def best_of(runs: int, func) -> float:
+    """Returns the fastest of runs calls of func, in seconds."""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare starting a Device from a C64 config and from a ConfigSnapshot")
+    parser.add_argument("--controls", type=int, default=5000, help="Number of controls in the config")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of each case, the fastest is reported")
+    args = parser.parse_args()
+    c64 = make_config(args.controls)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "bench.cfgsnap")
+        device = dashio.Device("BENCH", "BENCH_ID", "Bench", cfg_dict=dashio.ConfigSnapshot(path, c64))
+        device._make_cfg64(CFG_REQUEST)
+
+        results = {
+            "decode_cfg64": best_of(args.runs, lambda: dashio.decode_cfg64(c64)),
+            "snapshot load": best_of(args.runs, lambda: dashio.ConfigSnapshot(path, c64)),
+        }
+
+        def compress_cfg():
+            device._cfg64_cache.clear()
+            device._cfg_snapshot = None
+            device._make_cfg64(CFG_REQUEST)
+
+        snapshot = dashio.ConfigSnapshot(path, c64)
+
+        def saved_cfg():
+            device._cfg64_cache.clear()
+            device._cfg_snapshot = snapshot
+            device._make_cfg64(CFG_REQUEST)
+
+        results["CFG compressed"] = best_of(args.runs, compress_cfg)
+        results["CFG from snapshot"] = best_of(args.runs, saved_cfg)
+        results["CFG repeated"] = best_of(args.runs, lambda: device._make_cfg64(CFG_REQUEST))
+    for name, seconds in results.items():
+        print(f"{name:>17}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Measures the memory used by a device model made of many controls. Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/control_memory.py --controls 20000
+
+import argparse
+import gc
+import tracemalloc
+
+import dashio
+
+CONTROL_TYPES = (dashio.Knob, dashio.Dial, dashio.Slider, dashio.Button, dashio.TextBox, dashio.Label, dashio.Selector, dashio.Direction)
+
+
+def build_controls(count: int) -> list:
+    """Make count controls, cycling through CONTROL_TYPES, each with a position on a DeviceView."""
+    controls = []
+    for i in range(count):
+        control_type = CONTROL_TYPES[i % len(CONTROL_TYPES)]
+        position = dashio.ControlPosition(0.0, 0.0, 0.5, 0.1)
+        controls.append(control_type(f"C{i}", control_position=position))
+    return controls
+
+
+def measure(count: int) -> int:
+    """Returns the bytes allocated while making count controls."""
+    gc.collect()
+    tracemalloc.start()
+    controls = build_controls(count)
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del controls
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory used by many controls")
+    parser.add_argument("--controls", type=int, default=20000, help="Number of controls to make")
+    args = parser.parse_args()
+    used = measure(args.controls)
+    print(f"{args.controls} controls: {used / 1e6:.1f} MB, {used / args.controls:.0f} bytes per control")
+
+
+if __name__ == "__main__":
+    main()
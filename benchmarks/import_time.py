@@ -0,0 +1,72 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Measures how long importing dashio takes, and the memory used, for a few kinds of script. Each
+# case runs in a new interpreter. Run from the repository root:
+#
+#     PYTHONPATH=. python benchmarks/import_time.py --runs 10
+
+import argparse
+import json
+import subprocess
+import sys
+
+CASES = {
+    "import dashio": "import dashio",
+    "decode_cfg64": "import dashio; dashio.decode_cfg64",
+    "TCP sensor": "import dashio; dashio.Device; dashio.TCPConnection; dashio.Knob",
+    "everything": "from dashio import *",
+}
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def run_case(statement: str) -> dict:
+    """Returns the import time, peak RSS, and number of modules loaded for statement in a new interpreter."""
+    output = subprocess.run([sys.executable, "-c", CHILD.format(statement=statement)], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the time and memory used to import dashio")
+    parser.add_argument("--runs", type=int, default=5, help="Runs of each case, the fastest is reported")
+    args = parser.parse_args()
+    for name, statement in CASES.items():
+        results = [run_case(statement) for _ in range(args.runs)]
+        best = min(results, key=lambda result: result["seconds"])
+        print(f"{name:>14}: {best['seconds'] * 1000:7.1f} ms, {best['max_rss_kb'] / 1024:5.1f} MB RSS, {best['modules']} modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,50 +32,142 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from .comms_module_connection import DashIOCommsModuleConnection
-from .dash_connection import DashConnection
-from .device import Device
-from .iotcontrol.alarm import Alarm
-from .iotcontrol.audio_visual_display import AudioVisualDisplay
-from .iotcontrol.button import Button
-from .iotcontrol.button_group import ButtonGroup
-from .iotcontrol.chart import Chart, ChartLine
-from .iotcontrol.color_picker import ColorPicker
-from .iotcontrol.control import Control, ControlPosition
-from .iotcontrol.device_view import DeviceView
-from .iotcontrol.dial import Dial
-from .iotcontrol.direction import Direction
-# from .bleconnection import BLEConnection
-from .iotcontrol.enums import (BarMode, ButtonGroupStyle, ButtonState,
-                               ButtonStyle, ChartLineType,
-                               ChartXAxisLabelsStyle, Color, ColorPickerStyle,
-                               ConnectionState, ControlName, DialMode,
-                               DialNumberPosition, DialStyle, DirectionStyle,
-                               Icon, Keyboard, KnobStyle, LabelStyle,
-                               MenuStyle, Precision, SliderBarStyle, SoundName,
-                               TextAlignment, TextFormat, TimeGraphLineType,
-                               TimeGraphPositionOfKey, TitlePosition)
-from .iotcontrol.event_log import EventData, EventLog
-from .iotcontrol.knob import Knob
-from .iotcontrol.label import Label
-from .iotcontrol.map import Map, MapLocation
-from .iotcontrol.menu import Menu
-from .iotcontrol.selector import Selector
-from .iotcontrol.slider import Slider
-from .iotcontrol.table import Table, TableRow
-from .iotcontrol.textbox import TextBox
-from .iotcontrol.time_graph import (DataPoint, DataPointArray, TimeGraph,
-                                    TimeGraphLine)
-from .load_config import (decode_cfg64, encode_cfg64,
-                          get_control_dict_from_config,
-                          get_control_from_config,
-                          load_all_controls_from_config)
-from .lte_767x_connection import Lte767xConnection
-from .mqtt_connection import MQTTConnection
-from .schedular import Schedular
-from .tcp_connection import TCPConnection
-from .zmq_connection import ZMQConnection
-from .quectel_EG800Q import EG800Q
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .comms_module_connection import DashIOCommsModuleConnection
+    from .connection_multiplexer import ConnectionMultiplexer
+    from .dash_connection import DashConnection
+    from .device import Device
+    from .iotcontrol.alarm import Alarm
+    from .iotcontrol.audio_visual_display import AudioVisualDisplay
+    from .iotcontrol.button import Button
+    from .iotcontrol.button_group import ButtonGroup
+    from .iotcontrol.chart import Chart, ChartLine
+    from .iotcontrol.color_picker import ColorPicker
+    from .iotcontrol.control import Control, ControlPosition
+    from .iotcontrol.device_view import DeviceView
+    from .iotcontrol.dial import Dial
+    from .iotcontrol.direction import Direction
+    # from .bleconnection import BLEConnection
+    from .iotcontrol.enums import (BarMode, ButtonGroupStyle, ButtonState,
+                                   ButtonStyle, ChartLineType,
+                                   ChartXAxisLabelsStyle, Color, ColorPickerStyle,
+                                   ConnectionState, ControlName, DialMode,
+                                   DialNumberPosition, DialStyle, DirectionStyle,
+                                   Icon, Keyboard, KnobStyle, LabelStyle,
+                                   MenuStyle, MessagePriority, Precision,
+                                   SliderBarStyle, SoundName,
+                                   TextAlignment, TextFormat, TimeGraphLineType,
+                                   TimeGraphPositionOfKey, TitlePosition)
+    from .iotcontrol.event_log import EventData, EventLog
+    from .iotcontrol.knob import Knob
+    from .iotcontrol.label import Label
+    from .iotcontrol.map import Map, MapLocation, MapTrack
+    from .iotcontrol.menu import Menu
+    from .iotcontrol.selector import Selector
+    from .iotcontrol.slider import Slider
+    from .iotcontrol.table import Table, TableRow
+    from .iotcontrol.textbox import TextBox
+    from .iotcontrol.time_graph import (DataPoint, DataPointArray, RollupTier,
+                                        TimeGraph, TimeGraphLine)
+    from .iotcontrol.transmit_policy import TransmitPolicy
+    from .load_config import (decode_cfg64, encode_cfg64,
+                              get_control_dict_from_config,
+                              get_control_from_config,
+                              load_all_controls_from_config)
+    from .lte_767x_connection import Lte767xConnection
+    from .mqtt_connection import MQTTConnection
+    from .rate_governor import RateGovernor
+    from .callback_executor import CallbackExecutor
+    from .config_snapshot import ConfigSnapshot
+    from .schedular import Schedular
+    from .tcp_connection import TCPConnection
+    from .zmq_connection import ZMQConnection
+    from .quectel_EG800Q import EG800Q
+
+# Where each public name is defined. Submodules, and the third party packages they use, are
+# only imported when one of their names is first used.
+_LAZY_IMPORTS = {
+    'DashIOCommsModuleConnection': '.comms_module_connection',
+    'ConnectionMultiplexer': '.connection_multiplexer',
+    'DashConnection': '.dash_connection',
+    'Device': '.device',
+    'Alarm': '.iotcontrol.alarm',
+    'AudioVisualDisplay': '.iotcontrol.audio_visual_display',
+    'Button': '.iotcontrol.button',
+    'ButtonGroup': '.iotcontrol.button_group',
+    'Chart': '.iotcontrol.chart',
+    'ChartLine': '.iotcontrol.chart',
+    'ColorPicker': '.iotcontrol.color_picker',
+    'Control': '.iotcontrol.control',
+    'ControlPosition': '.iotcontrol.control',
+    'DeviceView': '.iotcontrol.device_view',
+    'Dial': '.iotcontrol.dial',
+    'Direction': '.iotcontrol.direction',
+    'BarMode': '.iotcontrol.enums',
+    'ButtonGroupStyle': '.iotcontrol.enums',
+    'ButtonState': '.iotcontrol.enums',
+    'ButtonStyle': '.iotcontrol.enums',
+    'ChartLineType': '.iotcontrol.enums',
+    'ChartXAxisLabelsStyle': '.iotcontrol.enums',
+    'Color': '.iotcontrol.enums',
+    'ColorPickerStyle': '.iotcontrol.enums',
+    'ConnectionState': '.iotcontrol.enums',
+    'ControlName': '.iotcontrol.enums',
+    'DialMode': '.iotcontrol.enums',
+    'DialNumberPosition': '.iotcontrol.enums',
+    'DialStyle': '.iotcontrol.enums',
+    'DirectionStyle': '.iotcontrol.enums',
+    'Icon': '.iotcontrol.enums',
+    'Keyboard': '.iotcontrol.enums',
+    'KnobStyle': '.iotcontrol.enums',
+    'LabelStyle': '.iotcontrol.enums',
+    'MenuStyle': '.iotcontrol.enums',
+    'MessagePriority': '.iotcontrol.enums',
+    'Precision': '.iotcontrol.enums',
+    'SliderBarStyle': '.iotcontrol.enums',
+    'SoundName': '.iotcontrol.enums',
+    'TextAlignment': '.iotcontrol.enums',
+    'TextFormat': '.iotcontrol.enums',
+    'TimeGraphLineType': '.iotcontrol.enums',
+    'TimeGraphPositionOfKey': '.iotcontrol.enums',
+    'TitlePosition': '.iotcontrol.enums',
+    'EventData': '.iotcontrol.event_log',
+    'EventLog': '.iotcontrol.event_log',
+    'Knob': '.iotcontrol.knob',
+    'Label': '.iotcontrol.label',
+    'Map': '.iotcontrol.map',
+    'MapLocation': '.iotcontrol.map',
+    'MapTrack': '.iotcontrol.map',
+    'Menu': '.iotcontrol.menu',
+    'Selector': '.iotcontrol.selector',
+    'Slider': '.iotcontrol.slider',
+    'Table': '.iotcontrol.table',
+    'TableRow': '.iotcontrol.table',
+    'TextBox': '.iotcontrol.textbox',
+    'DataPoint': '.iotcontrol.time_graph',
+    'DataPointArray': '.iotcontrol.time_graph',
+    'RollupTier': '.iotcontrol.time_graph',
+    'TimeGraph': '.iotcontrol.time_graph',
+    'TimeGraphLine': '.iotcontrol.time_graph',
+    'TransmitPolicy': '.iotcontrol.transmit_policy',
+    'decode_cfg64': '.load_config',
+    'encode_cfg64': '.load_config',
+    'get_control_dict_from_config': '.load_config',
+    'get_control_from_config': '.load_config',
+    'load_all_controls_from_config': '.load_config',
+    'Lte767xConnection': '.lte_767x_connection',
+    'MQTTConnection': '.mqtt_connection',
+    'RateGovernor': '.rate_governor',
+    'CallbackExecutor': '.callback_executor',
+    'ConfigSnapshot': '.config_snapshot',
+    'Schedular': '.schedular',
+    'TCPConnection': '.tcp_connection',
+    'ZMQConnection': '.zmq_connection',
+    'EG800Q': '.quectel_EG800Q',
+}
 
 __all__ = [
     'Device',
@@ -83,9 +175,14 @@ __all__ = [
     'MQTTConnection',
     'ZMQConnection',
     'DashConnection',
+    'ConnectionMultiplexer',
+    'RateGovernor',
+    'CallbackExecutor',
+    'ConfigSnapshot',
     'Lte767xConnection',
     'EG800Q',
     'ConnectionState',
+    'MessagePriority',
     'DashIOCommsModuleConnection',
     'Schedular',
     'decode_cfg64',
@@ -127,6 +224,7 @@ __all__ = [
     'Button',
     'TimeGraph',
     'TimeGraphLine',
+    'RollupTier',
     'DataPoint',
     'DataPointArray',
     'Knob',
@@ -136,6 +234,7 @@ __all__ = [
     'Direction',
     'Map',
     'MapLocation',
+    'MapTrack',
     'Alarm',
     'Menu',
     'Selector',
@@ -143,6 +242,7 @@ __all__ = [
     'DeviceView',
     'Control',
     'ControlPosition',
+    'TransmitPolicy',
     'ButtonGroup',
     'EventData',
     'EventLog',
@@ -150,9 +250,41 @@ __all__ = [
 ]
 
 
-from importlib.metadata import PackageNotFoundError, version
+def _get_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("dashio")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _import_submodule(name: str):
+    # Submodules were attributes of the package when it imported everything, keep them reachable.
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module("." + name, __name__)
+    except ModuleNotFoundError as error:
+        if error.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = module
+    return module
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        # importlib.metadata is slow to import, so only look the version up when it's asked for.
+        globals()[name] = _get_version()
+        return globals()[name]
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        return _import_submodule(name)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-try:
-    __version__ = version("dashio")
-except PackageNotFoundError:
-    __version__ = "unknown"
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -37,6 +37,7 @@ from .action_station_services.modbus_service import ModbusService, make_modbus_c
 from .action_station_services.clock_servicel import ClockService, make_clock_config
 from .action_station_services.ttn_service import TtnService, make_ttn_config
 from .load_config import CONTROL_INSTANCE_DICT, CONFIG_INSTANCE_DICT, decode_cfg64, encode_cfg64
+from .priority_outbox import split_frames
 
 
 logger = logging.getLogger(__name__)
@@ -471,9 +472,9 @@ class ActionStation(threading.Thread):
                 break
             if self.device_zmq_sub in socks:
                 try:
-                    [_, msg] = self.device_zmq_sub.recv_multipart()
+                    _, msg, _ = split_frames(self.device_zmq_sub.recv_multipart())
                 except ValueError:
-                    # If there aren't two parts continue.
+                    # If there aren't two or three parts continue.
                     pass
                 if msg:
                     logger.debug("ActionStation Device RX:\n%s", msg.decode().rstrip())
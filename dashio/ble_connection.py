@@ -37,6 +37,7 @@ from gi.repository import GLib  # type: ignore
 from dashio.device import Device
 
 from .constants import CONNECTION_PUB_URL
+from .priority_outbox import split_frames
 
 
 logger = logging.getLogger(__name__)
@@ -232,15 +233,20 @@ class BLEConnection(dbus.service.Object, threading.Thread):
         self.rx_zmq_sub.close()
         self.mainloop.quit()
 
+    @property
+    def has_consumers(self) -> bool:
+        """True while a central has notifications turned on"""
+        return self.dash_service.dash_characteristics.notifying
+
     def _zmq_callback(self, queue, condition):
         # logger.debug('zmq_callback')
 
         while self.rx_zmq_sub.getsockopt(zmq.EVENTS) & zmq.POLLIN:
             try:
-                [_, data] = self.rx_zmq_sub.recv_multipart()
+                _, data, _ = split_frames(self.rx_zmq_sub.recv_multipart())
             except ValueError:
                 continue
-            if not data:
+            if not data or not self.has_consumers:
                 continue
 
             data_str = data.decode('utf-8')
@@ -0,0 +1,158 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackExecutor:
+    """Runs user callbacks on a pool of threads so they don't hold up the Device.
+
+    Calls submitted with the same key run one at a time in the order they were submitted, calls
+    with different keys run in parallel. The Device uses one key per control, so each control
+    sees its messages in order while a slow callback on one control doesn't delay the others,
+    or the replies to WHO, STATUS, and CFG.
+
+    Python threads can't be stopped, so a callback that runs for longer than timeout is logged
+    and counted in the metrics rather than cancelled.
+    """
+    def __init__(self, max_workers: int = 4, timeout: float | None = None, name: str = "Callback"):
+        """Runs user callbacks on a pool of threads.
+
+        Parameters
+        ----------
+        max_workers : int, optional
+            Number of threads, by default 4
+        timeout : float, optional
+            Log callbacks that take longer than this many seconds, by default None
+        name : str, optional
+            Prefix for the thread names, by default "Callback"
+        """
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+        self._queue_time_total = 0.0
+        self._queue_time_max = 0.0
+        self._run_time_total = 0.0
+        self._run_time_max = 0.0
+
+    def submit(self, key: Hashable, callback: Callable, *args):
+        """Queue callback(*args) to run after the calls already submitted with key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Calls with the same key run in order, one at a time.
+        callback : Callable
+            The function to call.
+        """
+        with self._lock:
+            self._submitted += 1
+            queue = self._queues.get(key)
+            start = queue is None
+            if start:
+                queue = self._queues[key] = deque()
+            queue.append((time.monotonic(), callback, args))
+        if start:
+            self._pool.submit(self._run_next, key)
+
+    def _run_next(self, key: Hashable):
+        with self._lock:
+            queued_at, callback, args = self._queues[key].popleft()
+        started = time.monotonic()
+        failed = False
+        try:
+            callback(*args)
+        except Exception:  # pylint: disable=broad-except
+            failed = True
+            logger.exception("Callback for %s failed", key)
+        finished = time.monotonic()
+        run_time = finished - started
+        if self.timeout is not None and run_time > self.timeout:
+            logger.warning("Callback for %s took %.3fs, longer than the %.3fs timeout", key, run_time, self.timeout)
+        with self._lock:
+            self._completed += 1
+            self._failed += failed
+            self._timed_out += self.timeout is not None and run_time > self.timeout
+            self._queue_time_total += started - queued_at
+            self._queue_time_max = max(self._queue_time_max, started - queued_at)
+            self._run_time_total += run_time
+            self._run_time_max = max(self._run_time_max, run_time)
+            more = bool(self._queues[key])
+            if not more:
+                del self._queues[key]
+        if more:
+            # Go to the back of the pool's queue so one busy key can't hold a thread.
+            self._pool.submit(self._run_next, key)
+
+    def metrics(self) -> dict:
+        """Returns counts and timings of the callbacks run so far.
+
+        Returns
+        -------
+        dict
+            submitted, completed, failed, timed_out, and pending counts, and the average and max
+            queue_time (waiting to start) and run_time in seconds.
+        """
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timed_out": self._timed_out,
+                "pending": self._submitted - self._completed,
+                "queue_time_avg": self._queue_time_total / completed,
+                "queue_time_max": self._queue_time_max,
+                "run_time_avg": self._run_time_total / completed,
+                "run_time_max": self._run_time_max,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the threads once the queued callbacks have run.
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Wait for the queued callbacks to finish, by default True
+        """
+        if wait:
+            while True:
+                with self._lock:
+                    if not self._queues:
+                        break
+                time.sleep(0.01)
+        self._pool.shutdown(wait=wait)
@@ -33,6 +33,7 @@ import serial
 from serial.serialutil import SerialException
 from .constants import CONNECTION_PUB_URL
 from .device import Device
+from .priority_outbox import split_frames
 from .iotcontrol.enums import ConnectionState
 
 logger = logging.getLogger(__name__)
@@ -604,7 +605,7 @@ class DashIOCommsModuleConnection(threading.Thread):
                 break
             if self.rx_zmq_sub in socks:
                 try:
-                    [msg_to, data] = self.rx_zmq_sub.recv_multipart()
+                    msg_to, data, _ = split_frames(self.rx_zmq_sub.recv_multipart())
                 except ValueError:
                     #  If there aren't two parts continue.
                     continue
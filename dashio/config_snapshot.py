@@ -0,0 +1,177 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+
+from .load_config import decode_cfg64
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"DASHCFG1"
+# marshal's format can change between Python versions, snapshots from other versions are rebuilt.
+_PYTHON_TAG = f"{sys.version_info[0]}.{sys.version_info[1]}".encode()
+
+
+def content_hash(text: str) -> str:
+    """Returns a short hash of text, used to tell configs and CFG payloads apart."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class ConfigSnapshot:
+    """A config decoded once and saved, with the C64 CFG payloads made from it.
+
+    Loading a C64 config means base64 decoding, inflating, and parsing json, and the first CFG
+    request compresses it all again. A snapshot keeps the decoded config in a compact binary
+    file, keyed by a hash of the source config, and keeps the C64 payloads the Device has sent,
+    keyed by a hash of their json. Pass it to Device as cfg_dict. When the source config hasn't
+    changed the decoded config is read straight from the file, and the Device sends the saved
+    payload rather than compressing the config again. New payloads are saved on a background
+    thread so a CFG reply doesn't wait for the file to be written, flush() waits for it.
+
+    The file is written with marshal, which isn't secure against malformed or malicious data and
+    can crash the interpreter reading it. Only keep snapshots where the device's own code is kept,
+    never load one from an untrusted source.
+    """
+    # Payloads kept, one for each screen column count is the usual case.
+    MAX_PAYLOADS = 4
+
+    def __init__(self, path: str, cfg: str | dict):
+        """Load the snapshot at path if it was made from cfg, otherwise make and save a new one.
+
+        Parameters
+        ----------
+        path : str
+            The snapshot file.
+        cfg : str | dict
+            The config, either as a C64 string or a dict loaded by decode_cfg64.
+        """
+        self.path = path
+        if isinstance(cfg, str):
+            self.source_hash = content_hash(cfg)
+        else:
+            self.source_hash = content_hash(json.dumps(cfg, sort_keys=True))
+        self._payloads = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._writer = None
+        self._file_lock = threading.Lock()
+        self.cfg_dict = self._read()
+        if self.cfg_dict is None:
+            self.cfg_dict = decode_cfg64(cfg) if isinstance(cfg, str) else cfg
+            self._try_save()
+
+    def _read(self) -> dict | None:
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                data = snapshot_file.read()
+        except OSError:
+            return None
+        magic, _, rest = data.partition(b"\n")
+        python_tag, _, body = rest.partition(b"\n")
+        if magic != _MAGIC or python_tag != _PYTHON_TAG:
+            return None
+        try:
+            source_hash, cfg_dict, payloads = marshal.loads(body)
+        except (EOFError, ValueError, TypeError):
+            logger.debug("Unreadable config snapshot: %s", self.path)
+            return None
+        if source_hash != self.source_hash:
+            return None
+        if (
+            not isinstance(cfg_dict, dict)
+            or not isinstance(payloads, dict)
+            or not all(isinstance(key, str) and isinstance(value, str) for key, value in payloads.items())
+        ):
+            logger.debug("Unreadable config snapshot: %s", self.path)
+            return None
+        self._payloads = payloads
+        return cfg_dict
+
+    def save(self):
+        """Write the snapshot, replacing the file in one step so a crash never leaves half a file."""
+        with self._lock:
+            self._dirty = False
+            body = marshal.dumps((self.source_hash, self.cfg_dict, self._payloads))
+        self._write(body)
+
+    def _write(self, body: bytes):
+        tmp_path = self.path + ".tmp"
+        with self._file_lock:
+            with open(tmp_path, "wb") as snapshot_file:
+                snapshot_file.write(_MAGIC + b"\n" + _PYTHON_TAG + b"\n" + body)
+            os.replace(tmp_path, self.path)
+
+    def get_payload(self, cfg_hash: str) -> str | None:
+        """Returns the saved C64 payload for the config json with hash cfg_hash, or None."""
+        return self._payloads.get(cfg_hash)
+
+    def add_payload(self, cfg_hash: str, payload: str):
+        """Save the C64 payload made from the config json with hash cfg_hash."""
+        with self._lock:
+            if self._payloads.get(cfg_hash) == payload:
+                return
+            self._payloads[cfg_hash] = payload
+            while len(self._payloads) > self.MAX_PAYLOADS:
+                del self._payloads[next(iter(self._payloads))]
+            self._dirty = True
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_changes, name="ConfigSnapshot", daemon=True)
+                self._writer.start()
+
+    def _write_changes(self):
+        while True:
+            with self._lock:
+                if not self._dirty:
+                    self._writer = None
+                    return
+                self._dirty = False
+                body = marshal.dumps((self.source_hash, self.cfg_dict, self._payloads))
+            self._try_write(body)
+
+    def flush(self):
+        """Wait for the payloads added so far to be saved."""
+        writer = self._writer
+        while writer is not None:
+            writer.join()
+            writer = self._writer
+
+    def _try_save(self):
+        # The snapshot only saves time, a read only or full disk shouldn't stop the device.
+        try:
+            self.save()
+        except OSError as err:
+            logger.warning("Can't save config snapshot %s: %s", self.path, err)
+
+    def _try_write(self, body: bytes):
+        try:
+            self._write(body)
+        except OSError as err:
+            logger.warning("Can't save config snapshot %s: %s", self.path, err)
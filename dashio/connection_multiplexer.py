@@ -0,0 +1,243 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import logging
+import socket
+import threading
+import time
+
+import zmq
+
+logger = logging.getLogger(__name__)
+
+
+class _MultiplexedClient:
+    """Book keeping for a connection served by the ConnectionMultiplexer."""
+
+    def __init__(self, connection, mqtt_client):
+        self.connection = connection
+        self.mqtt_client = mqtt_client
+        self.sock = None
+        self.fileno = -1
+        self.rx_registered = False
+        self.last_misc = 0.0
+
+
+class ConnectionMultiplexer(threading.Thread):
+    """Drives many MQTT based connections from a single thread.
+
+    Each MQTTConnection or DashConnection normally runs its own thread and calls paho's
+    loop_start(), which spawns a second network thread. Connections created with a
+    multiplexer don't start either thread. Instead the multiplexer polls every paho socket
+    together with the connections ZMQ inproc sockets and calls loop_read(), loop_write() and
+    loop_misc() as required. Connections connect on their own short lived thread so a slow
+    server doesn't hold up the others, and a connection that fails while being serviced is
+    logged and reconnected without affecting the rest.
+
+    Methods
+    -------
+    add_connection(connection, mqtt_client) :
+        Called by a connection to hand itself over to the multiplexer.
+    close() :
+        Close the multiplexer and all of its connections.
+    """
+
+    def __init__(self, poll_timeout: int = 100, misc_interval: float = 1.0, max_messages_per_pass: int = 100):
+        """Setups and runs a thread to service many MQTT connections.
+
+        Parameters
+        ----------
+        poll_timeout : int, optional
+            Max time in ms to wait for socket activity, by default 100
+        misc_interval : float, optional
+            Interval in seconds between calls to each clients loop_misc(), by default 1.0
+        max_messages_per_pass : int, optional
+            Max ZMQ messages serviced for one connection before moving to the next, by default 100
+        """
+        threading.Thread.__init__(self, daemon=True)
+        self.poll_timeout = poll_timeout
+        self.misc_interval = misc_interval
+        self.max_messages_per_pass = max_messages_per_pass
+        self.running = True
+        self._clients = []
+        self._new_clients = []
+        self._lock = threading.Lock()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self.start()
+
+    def add_connection(self, connection, mqtt_client):
+        """Add a connection to the multiplexer.
+
+        Parameters
+        ----------
+        connection : MQTTConnection | DashConnection
+            The connection to service.
+        mqtt_client : paho.mqtt.client.Client
+            The paho client used by the connection.
+        """
+        mqtt_client.on_socket_open = self._on_socket_event
+        mqtt_client.on_socket_close = self._on_socket_event
+        mqtt_client.on_socket_register_write = self._on_socket_event
+        with self._lock:
+            self._new_clients.append(_MultiplexedClient(connection, mqtt_client))
+        self._wake()
+
+    @property
+    def number_of_connections(self) -> int:
+        """The number of connections serviced by the multiplexer"""
+        with self._lock:
+            return len(self._clients) + len(self._new_clients)
+
+    def close(self):
+        """Close the multiplexer."""
+        self.running = False
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _on_socket_event(self, client, userdata, sock):
+        # Paho calls this from whichever thread queued the packet, so just break the poll.
+        if threading.current_thread() is not self:
+            self._wake()
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _update_registration(self, poller: zmq.Poller, m_client: _MultiplexedClient):
+        connection = m_client.connection
+        want_rx = connection._zmq_rx_ready()
+        if want_rx and not m_client.rx_registered:
+            poller.register(connection.rx_zmq_sub, zmq.POLLIN)
+        elif not want_rx and m_client.rx_registered:
+            poller.unregister(connection.rx_zmq_sub)
+        m_client.rx_registered = want_rx
+
+        # Leave paho alone while it connects on another thread, or after the connection was lost.
+        sock = m_client.mqtt_client.socket() if connection._socket_active() else None
+        if sock is not m_client.sock and m_client.sock is not None:
+            try:
+                poller.unregister(m_client.sock)
+            except KeyError:
+                pass
+        m_client.sock = sock
+        if sock is not None:
+            m_client.fileno = sock.fileno()
+            flags = zmq.POLLIN
+            if m_client.mqtt_client.want_write():
+                flags |= zmq.POLLOUT
+            poller.register(sock, flags)
+
+    def _service_client(self, m_client: _MultiplexedClient, socks: dict, now: float):
+        client = m_client.mqtt_client
+        connection = m_client.connection
+        sock = m_client.sock
+        if sock is not None:
+            events = socks.get(m_client.fileno, 0)
+            if events & zmq.POLLIN or getattr(sock, 'pending', lambda: 0)() > 0:
+                client.loop_read()
+            if events & zmq.POLLOUT and client.socket() is sock:
+                client.loop_write()
+            if now - m_client.last_misc >= self.misc_interval:
+                m_client.last_misc = now
+                client.loop_misc()
+        if m_client.rx_registered and connection.rx_zmq_sub in socks:
+            # Cap the messages per pass so a busy connection can't starve the others.
+            for _ in range(self.max_messages_per_pass):
+                if not (connection._zmq_rx_ready() and connection.rx_zmq_sub.getsockopt(zmq.EVENTS) & zmq.POLLIN):
+                    break
+                connection._service_zmq_rx()
+        connection._service_tx_queues()
+        connection._check_reconnect()
+
+    def _client_failed(self, m_client: _MultiplexedClient):
+        logger.exception("Servicing %s failed, reconnecting it", m_client.connection.zmq_connection_uuid)
+        m_client.connection._connection_lost()
+
+    def _remove_client(self, poller: zmq.Poller, m_client: _MultiplexedClient):
+        if m_client.rx_registered:
+            poller.unregister(m_client.connection.rx_zmq_sub)
+        if m_client.sock is not None:
+            try:
+                poller.unregister(m_client.sock)
+            except KeyError:
+                pass
+        m_client.mqtt_client.disconnect()
+        m_client.connection._close_sockets()
+        self._clients.remove(m_client)
+
+    def run(self):
+        poller = zmq.Poller()
+        poller.register(self._wake_r, zmq.POLLIN)
+
+        while self.running:
+            with self._lock:
+                self._clients.extend(self._new_clients)
+                self._new_clients = []
+            timeout = self.poll_timeout
+            for m_client in list(self._clients):
+                if not m_client.connection.running:
+                    self._remove_client(poller, m_client)
+                    continue
+                try:
+                    self._update_registration(poller, m_client)
+                except Exception:  # pylint: disable=broad-except
+                    self._client_failed(m_client)
+                    continue
+                # SSL sockets may hold decrypted bytes that poll can't see.
+                if m_client.sock is not None and getattr(m_client.sock, 'pending', lambda: 0)() > 0:
+                    timeout = 0
+                elif m_client.connection._tx_pending():
+                    # Come back soon for messages held by the outbox.
+                    timeout = min(timeout, 10)
+            try:
+                socks = dict(poller.poll(timeout))
+            except zmq.error.ContextTerminated:
+                break
+            # zmq.Poller reports plain sockets by file descriptor.
+            if self._wake_r.fileno() in socks:
+                self._drain_wake()
+
+            now = time.monotonic()
+            for m_client in self._clients:
+                try:
+                    self._service_client(m_client, socks, now)
+                except Exception:  # pylint: disable=broad-except
+                    self._client_failed(m_client)
+
+        for m_client in list(self._clients):
+            self._remove_client(poller, m_client)
+        self._wake_r.close()
+        self._wake_w.close()
@@ -0,0 +1,145 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import threading
+from types import MappingProxyType
+from typing import Iterator, Mapping
+
+
+def _build_index(controls: dict) -> Mapping[str, tuple]:
+    index = {}
+    for control in controls.values():
+        index.setdefault(control.ctrl_type, []).append(control)
+    return MappingProxyType({ctrl_type: tuple(members) for ctrl_type, members in index.items()})
+
+
+class ControlRegistry:
+    """The controls of a Device, keyed by "ctrl_type\\tcontrol_id".
+
+    Works like a dict, but every change makes a new copy of the contents and publishes it in one
+    assignment. Readers take the current copy without locking and can iterate it while other
+    threads add and remove controls. Changes are serialised with a lock, and the per type index
+    used for STATUS and CFG is only rebuilt when the contents change.
+    """
+    def __init__(self, controls: dict | None = None):
+        self._lock = threading.Lock()
+        self._publish(dict(controls or {}))
+
+    def _publish(self, controls: dict):
+        # One assignment, so readers see either the old or the new contents and index together.
+        self._snapshot = (MappingProxyType(controls), _build_index(controls))
+
+    def snapshot(self) -> Mapping:
+        """Returns the current contents, a read only mapping that never changes."""
+        return self._snapshot[0]
+
+    def types(self) -> Mapping[str, tuple]:
+        """Returns the controls grouped by ctrl_type, in the order they were added."""
+        return self._snapshot[1]
+
+    def by_type(self, ctrl_type: str) -> tuple:
+        """Returns the controls of ctrl_type, in the order they were added."""
+        return self._snapshot[1].get(ctrl_type, ())
+
+    def __getitem__(self, key: str):
+        return self._snapshot[0][key]
+
+    def get(self, key: str, default=None):
+        return self._snapshot[0].get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return key in self._snapshot[0]
+
+    def __len__(self) -> int:
+        return len(self._snapshot[0])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot[0])
+
+    def keys(self):
+        return self._snapshot[0].keys()
+
+    def values(self):
+        return self._snapshot[0].values()
+
+    def items(self):
+        return self._snapshot[0].items()
+
+    def __setitem__(self, key: str, control):
+        with self._lock:
+            controls = dict(self._snapshot[0])
+            controls[key] = control
+            self._publish(controls)
+
+    def __delitem__(self, key: str):
+        with self._lock:
+            controls = dict(self._snapshot[0])
+            del controls[key]
+            self._publish(controls)
+
+    def pop(self, key: str, *default):
+        """Remove key and return its control, or default if given and key isn't there."""
+        with self._lock:
+            controls = dict(self._snapshot[0])
+            control = controls.pop(key, *default)
+            self._publish(controls)
+            return control
+
+    def setdefault(self, key: str, control):
+        """Add control if key isn't there. Returns the control stored for key."""
+        with self._lock:
+            current = self._snapshot[0]
+            if key in current:
+                return current[key]
+            controls = dict(current)
+            controls[key] = control
+            self._publish(controls)
+            return control
+
+    def update(self, controls: Mapping):
+        """Add or replace many controls with one copy."""
+        with self._lock:
+            new_controls = dict(self._snapshot[0])
+            new_controls.update(controls)
+            self._publish(new_controls)
+
+    def update_missing(self, controls: Mapping) -> list:
+        """Add the controls whose keys aren't there yet, with one copy. Returns the controls added."""
+        with self._lock:
+            current = self._snapshot[0]
+            added = {key: control for key, control in controls.items() if key not in current}
+            if added:
+                new_controls = dict(current)
+                new_controls.update(added)
+                self._publish(new_controls)
+            return list(added.values())
+
+    def clear(self):
+        """Remove all the controls."""
+        with self._lock:
+            self._publish({})
+
+    def __repr__(self) -> str:
+        return f"ControlRegistry({dict(self._snapshot[0])!r})"
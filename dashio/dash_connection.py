@@ -28,14 +28,16 @@ import logging
 import ssl
 import threading
 import time
-from socket import gaierror
 
 import paho.mqtt.client as mqtt
 import shortuuid
 import zmq
 
+from .connection_multiplexer import ConnectionMultiplexer
 from .constants import CONNECTION_PUB_URL
-from .iotcontrol.enums import ConnectionState
+from .priority_outbox import PriorityOutbox, split_frames
+from .rate_governor import ALARM_LANE, ANNOUNCE_LANE, DATA_LANE, RateGovernor
+from .iotcontrol.enums import ConnectionState, MessagePriority
 
 logger = logging.getLogger(__name__)
 
@@ -222,11 +224,23 @@ class DashConnection(threading.Thread):
     def connect(self):
         """Connect to the server."""
         logger.debug("Connecting..")
+        if self._multiplexer is None:
+            self._connect()
+            return
+        # paho's connect blocks, so connect on another thread rather than hold up every
+        # connection on the multiplexer. The multiplexer leaves the client alone until it's done.
+        self.connection_state = ConnectionState.CONNECTING
+        self._connect_thread = threading.Thread(target=self._connect, name=f"{self.zmq_connection_uuid} connect", daemon=True)
+        self._connect_thread.start()
+
+    def _connect(self):
         try:
             self._dash_c.connect(self.host, self.port)
             self.connection_state = ConnectionState.CONNECTING
-        except (gaierror, ConnectionRefusedError) as error:
+        except (OSError, ValueError) as error:
+            # Name lookup, refused, timed out, TLS, and bad host or port errors are all retried later.
             logger.debug("No connection to server: %s", str(error))
+            self.connection_state = ConnectionState.DISCONNECTED
 
     def set_connection(self, username: str, password: str):
         """Changes the connection to the DashIO server
@@ -249,7 +263,9 @@ class DashConnection(threading.Thread):
         host='dash.dashio.io',
         port=8883,
         use_ssl=True,
-        context: zmq.Context | None = None
+        context: zmq.Context | None = None,
+        multiplexer: ConnectionMultiplexer | None = None,
+        rate_governor: RateGovernor | None = None
     ):
         """
         Setups and manages a connection thread to the Dash Server.
@@ -266,6 +282,12 @@ class DashConnection(threading.Thread):
                 password for the dash connection.
             use_ssl : Boolean
                 Defaults to True.
+            context : optional
+                ZMQ context. Defaults to None.
+            multiplexer : ConnectionMultiplexer, optional
+                Service the connection from a shared ConnectionMultiplexer instead of its own threads. Defaults to None.
+            rate_governor : RateGovernor, optional
+                Pace announce, alarm, and data publishes with token buckets. Defaults to None, no pacing.
         """
 
         threading.Thread.__init__(self, daemon=True)
@@ -290,6 +312,16 @@ class DashConnection(threading.Thread):
         self._dash_c.on_connect = self._on_connect
         self._dash_c.on_disconnect = self._on_disconnect  # type: ignore
         self._dash_c.on_subscribe = self._on_subscribe
+
+        self.tx_zmq_pub = self.context.socket(zmq.PUB)
+        self.tx_zmq_pub.bind(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
+
+        #  Subscribe on ALL, and my connection
+        self.rx_zmq_sub = self.context.socket(zmq.SUB)
+        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "ALL")
+        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "DASH")
+        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "ANNOUNCE")
+        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, self.zmq_connection_uuid)
         # self.connection_control = DashControl(self.zmq_connection_uuid, username, host)
         if use_ssl:
             self._dash_c.tls_set(
@@ -305,13 +337,20 @@ class DashConnection(threading.Thread):
         self._dash_c.username_pw_set(self.username, self.password)
         # self.dash_c.on_log = self.__on_log
         # self._dash_c.will_set(self.data_topic, self.LWD, qos=1, retain=False)
+        # Start subscribe, with QoS level 0
+        self._disconnect_timeout = 1.0
+        self._reconnect_time = None
+        self.rate_governor = rate_governor
+        self._outbox = PriorityOutbox()
+        self._multiplexer = multiplexer
+        self._connect_thread = None
         # Connect
         if username and password:
             self.connect()
-        # Start subscribe, with QoS level 0
-        self.rx_zmq_sub = self.context.socket(zmq.SUB)
-        self._disconnect_timeout = 1.0
-        self.start()
+        if multiplexer is None:
+            self.start()
+        else:
+            multiplexer.add_connection(self, self._dash_c)
 
     def close(self):
         """Close the connection."""
@@ -324,62 +363,128 @@ class DashConnection(threading.Thread):
         if msg_dict['msgType'] == 'disconnect':
             self._del_device_rx(msg_dict)
 
+    @property
+    def has_consumers(self) -> bool:
+        """True while the connection is running. The Dash server stores data for storage enabled
+        controls, and messages wait in the queue while the connection is down."""
+        return self.running
+
+    def _zmq_rx_ready(self) -> bool:
+        return self.connection_state == ConnectionState.CONNECTED
+
+    def _service_zmq_rx(self):
+        try:
+            msg_to, data, priority = split_frames(self.rx_zmq_sub.recv_multipart())
+        except ValueError:
+            logger.debug("DASH value error")
+            return
+        if not data:
+            logger.debug("DASH no data error")
+            return
+        # logger.debug("DASH: %s ,%s", msg_to, data)
+        if msg_to == b'COMMAND':
+            logger.debug("DASH RX COMMAND")
+            self._dash_command(json.loads(data))
+            return
+        msg_l = data.split(b'\t')
+        control_type = ""
+        if len(msg_l) > 3:
+            control_type = msg_l[2]
+        try:
+            device_id = msg_l[1].decode().strip()
+        except IndexError:
+            return
+        data_topic = f"{self.username}/{device_id}/data"
+        lane = DATA_LANE
+        if control_type == b'ALM' or priority == MessagePriority.ALARM:
+            data_topic = f"{self.username}/{device_id}/alarm"
+            lane = ALARM_LANE
+        elif msg_to == b"ANNOUNCE":
+            data_topic = f"{self.username}/{device_id}/announce"
+            lane = ANNOUNCE_LANE
+        logger.debug("DASH Tx →\n%s", data.decode().rstrip())
+        self._publish(priority, lane, data_topic, data.decode())
+
+    def _socket_active(self) -> bool:
+        """True when the multiplexer should service paho's socket."""
+        if self._connect_thread is not None and self._connect_thread.is_alive():
+            return False
+        return self.connection_state != ConnectionState.DISCONNECTED
+
+    def _connection_lost(self):
+        """Called by the multiplexer when servicing the connection fails, it reconnects later."""
+        self.connection_state = ConnectionState.DISCONNECTED
+
+    def _check_reconnect(self):
+        if self.connection_state != ConnectionState.DISCONNECTED:
+            self._reconnect_time = None
+            return
+        now = time.monotonic()
+        if self._reconnect_time is None:
+            self._disconnect_timeout = min(self._disconnect_timeout, 900)
+            self._reconnect_time = now + self._disconnect_timeout
+            return
+        if now < self._reconnect_time:
+            return
+        self._reconnect_time = None
+        self.connect()
+        self._disconnect_timeout = self._disconnect_timeout * 2
+
+    def _publish(self, priority: MessagePriority, lane: str, topic: str, payload: str):
+        self._outbox.put(priority, (lane, topic, payload))
+
+    def _can_send(self, priority: MessagePriority, item: tuple) -> bool:
+        # Hold bulk frames back until paho has written what it already has, so alarms and
+        # interactive messages queued behind them don't wait for a whole bulk reply.
+        if priority == MessagePriority.BULK and self._dash_c.want_write():
+            return False
+        if self.rate_governor is None:
+            return True
+        lane, _, payload = item
+        return self.rate_governor.try_acquire(lane, len(payload))
+
+    def _tx_pending(self) -> bool:
+        return len(self._outbox) > 0
+
+    def _service_tx_queues(self):
+        """Publish queued messages in priority order while the rate governor has tokens for them."""
+        if self.connection_state != ConnectionState.CONNECTED:
+            return
+        while True:
+            item = self._outbox.pop(self._can_send)
+            if item is None:
+                break
+            _, topic, payload = item
+            self._dash_c.publish(topic, payload)
+
+    @property
+    def queued_messages(self) -> dict:
+        """The number of messages waiting to be published for each message priority"""
+        return self._outbox.queued()
+
+    def _close_sockets(self):
+        self.tx_zmq_pub.close()
+        self.rx_zmq_sub.close()
+
     def run(self):
         self._dash_c.loop_start()
 
-        self.tx_zmq_pub = self.context.socket(zmq.PUB)
-        self.tx_zmq_pub.bind(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
-
-        #  Subscribe on ALL, and my connection
-        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "ALL")
-        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "DASH")
-        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "ANNOUNCE")
-        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, self.zmq_connection_uuid)
         poller = zmq.Poller()
         poller.register(self.rx_zmq_sub, zmq.POLLIN)
-        data_topic = ""
-        control_type = ""
         while self.running:
             try:
-                socks = dict(poller.poll(10 ))
+                socks = dict(poller.poll(10))
             except zmq.error.ContextTerminated:
                 break
-
-            if self.rx_zmq_sub in socks and self.connection_state == ConnectionState.CONNECTED:
-                try:
-                    [msg_to, data] = self.rx_zmq_sub.recv_multipart()
-                except ValueError:
-                    logger.debug("DASH value error")
-                    continue
-                if not data:
-                    logger.debug("DASH no data error")
-                    continue
-                # logger.debug("DASH: %s ,%s", msg_to, data)
-                if msg_to == b'COMMAND':
-                    logger.debug("DASH RX COMMAND")
-                    self._dash_command(json.loads(data))
-                    continue
-                msg_l = data.split(b'\t')
-                if len(msg_l) > 3:
-                    control_type = msg_l[2]
-                try:
-                    device_id = msg_l[1].decode().strip()
-                except IndexError:
-                    continue
-                data_topic = f"{self.username}/{device_id}/data"
-                if control_type == b'ALM':
-                    data_topic = f"{self.username}/{device_id}/alarm"
-                    control_type = ""
-                elif msg_to == b"ANNOUNCE":
-                    data_topic = f"{self.username}/{device_id}/announce"
-                logger.debug("DASH Tx →\n%s", data.decode().rstrip())
-                self._dash_c.publish(data_topic, data.decode())
-            if self.connection_state == ConnectionState.DISCONNECTED:
-                self._disconnect_timeout = min(self._disconnect_timeout, 900)
-                time.sleep(self._disconnect_timeout)
-                self.connect()
-                self._disconnect_timeout = self._disconnect_timeout * 2
+            if not self._zmq_rx_ready():
+                # Leave messages queued until the broker connection is back.
+                time.sleep(0.1)
+            elif self.rx_zmq_sub in socks:
+                # Queue everything waiting so the outbox can order it by priority.
+                while self.rx_zmq_sub.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                    self._service_zmq_rx()
+            self._service_tx_queues()
+            self._check_reconnect()
 
         self._dash_c.loop_stop()
-        self.tx_zmq_pub.close()
-        self.rx_zmq_sub.close()
+        self._close_sockets()
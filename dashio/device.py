@@ -25,18 +25,26 @@ from __future__ import annotations
 
 import json
 import logging
+import socket
 import threading
 import time
+from collections import deque
+from typing import TYPE_CHECKING, Iterable
 
 import shortuuid
 import zmq
 
+from .callback_executor import CallbackExecutor
 from .constants import BAD_CHARS, CONNECTION_PUB_URL
+from .control_registry import ControlRegistry
 from .iotcontrol.alarm import Alarm
+from .iotcontrol.control import ControlConfig
 from .iotcontrol.device_view import DeviceView
-from .iotcontrol.enums import ControlName
-from .load_config import (CONFIG_INSTANCE_DICT, CONTROL_INSTANCE_DICT,
-                          encode_cfg64)
+from .iotcontrol.enums import ControlName, MessagePriority
+from .priority_outbox import priority_frame, split_reply
+
+if TYPE_CHECKING:
+    from .config_snapshot import ConfigSnapshot
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +60,8 @@ class Device(threading.Thread):
         A unique identifier for this device
     device_name : str
         The name for this device (E.g. GlassHouse, MothersZimmerFrame...)
+    max_frame_size : int
+        Bulk replies (STATUS, CFG, and control history) are sent in frames of whole lines no larger than this.
 
     Methods
     -------
@@ -122,73 +132,145 @@ class Device(threading.Thread):
         Specify a callback function to be called when The Dash server sends ota data.
     """
 
-    def _on_message(self, payload):
+    def _on_message(self, payload) -> list:
         data = str(payload, "utf-8").strip()
         command_array = data.split("\n")
-        reply = ""
+        replies = []
         for command in command_array:
             try:
-                reply += self._on_command(command.strip())
+                reply, priority = self._on_command(command.strip())
             except TypeError:
-                pass
-        return reply
+                continue
+            if reply:
+                replies.append((reply, priority))
+        return replies
 
-    def _on_command(self, data):
+    def _on_command(self, data) -> tuple:
         data_array = data.split("\t")
         rx_device_id = data_array[0]
         if rx_device_id == "WHO":
+            if self._cfg_rev_from_content:
+                self._update_content_revision()
             if 'cfgRev' in self._cfg:
-                return self._device_id_str + f"\tWHO\t{self.device_type}\t{self.device_name}\t{self._cfg['cfgRev']}\n"
-            return self._device_id_str + f"\tWHO\t{self.device_type}\t{self.device_name}\n"
+                return self._device_id_str + f"\tWHO\t{self.device_type}\t{self.device_name}\t{self._cfg['cfgRev']}\n", MessagePriority.INTERACTIVE
+            return self._device_id_str + f"\tWHO\t{self.device_type}\t{self.device_name}\n", MessagePriority.INTERACTIVE
         if rx_device_id != self.device_id:
-            return ""
+            return "", MessagePriority.INTERACTIVE
         try:
             ctrl_type = data_array[1]
-        except KeyError:
-            return ""
+        except IndexError:
+            return "", MessagePriority.INTERACTIVE
         if ctrl_type in self._device_commands_dict:
-            return self._device_commands_dict[ctrl_type](data_array)
+            if self._callback_executor is not None and ctrl_type not in self._protocol_commands:
+                # Setup, clock and OTA messages run user callbacks, keep them off the Device thread.
+                self._callback_executor.submit(self._device_id_str, self._device_commands_dict[ctrl_type], data_array)
+                return "", MessagePriority.INTERACTIVE
+            priority = MessagePriority.BULK if ctrl_type in self._bulk_commands else MessagePriority.INTERACTIVE
+            return self._device_commands_dict[ctrl_type](data_array), priority
         try:
-            reply = self.controls_dict[ctrl_type + "\t" + data_array[2]]._message_rx_event(data_array)
-            if reply:
-                return reply.replace("{device_id}", self.device_id)
+            control = self.controls_dict[ctrl_type + "\t" + data_array[2]]
+            reply = control._process_rx_message(data_array)
+            if isinstance(reply, str):
+                if reply:
+                    return reply.replace("{device_id}", self.device_id), control.reply_priority
+            elif reply is not None:
+                return (piece.replace("{device_id}", self.device_id) for piece in reply), control.reply_priority
         except (KeyError, IndexError):
             pass
-        return ""
+        return "", MessagePriority.INTERACTIVE
 
     def _make_connect(self, _):
         return self._device_id_str + "\tCONNECT\n"
 
     def _make_status(self, _):
-        reply = f"\t{self.device_id}\tNAME\t{self._device_name}\n"
+        yield f"\t{self.device_id}\tNAME\t{self._device_name}\n"
         for value in self.controls_dict.values():
             try:
-                reply += value.get_state().replace("{device_id}", self.device_id)
+                yield value.get_state().replace("{device_id}", self.device_id)
             except (TypeError, KeyError):
                 pass
-        return reply
 
     def _make_cfg64(self, data):
         try:
             dashboard_id = data[2]
         except IndexError:
             return ""
+        if self._cfg_rev_from_content:
+            self._update_content_revision()
         reply = self._device_id_str + f"\tCFG\t{dashboard_id}\tC64\t"
         cfg = {}
         cfg["CFG"] = self._cfg
-        for control in self.controls_dict.values():
-            if control.ctrl_type == "ALM":
+        for ctrl_type, controls in self.controls_dict.types().items():
+            if ctrl_type == "ALM":
                 continue
-            if control.ctrl_type in ("BLE"):
-                cfg[control.ctrl_type] = control.get_cfg64(data)
+            if ctrl_type in ("BLE"):
+                for control in controls:
+                    cfg[ctrl_type] = control.get_cfg64(data)
                 continue
-            if control.ctrl_type not in cfg:
-                cfg[control.ctrl_type] = []
-            cfg[control.ctrl_type].extend(control.get_cfg64(data))
-        c64_json = encode_cfg64(cfg)
-        reply += c64_json + "\n"
+            cfg[ctrl_type] = [ctrl_cfg for control in controls for ctrl_cfg in control.get_cfg64(data)]
+        reply += self._encode_cfg64(cfg) + "\n"
         return reply
 
+    def _encode_cfg64(self, cfg: dict) -> str:
+        # Compressing is the slow part of a CFG reply, reuse the payload while the config is unchanged.
+        # load_config imports every control, so it's only imported once a config is used.
+        from .config_snapshot import ConfigSnapshot, content_hash
+        from .load_config import encode_cfg64_json
+
+        cfg_json = json.dumps(cfg)
+        cfg_hash = content_hash(cfg_json)
+        payload = self._cfg64_cache.get(cfg_hash)
+        if payload is not None:
+            return payload
+        if self._cfg_snapshot is not None:
+            payload = self._cfg_snapshot.get_payload(cfg_hash)
+        if payload is None:
+            payload = encode_cfg64_json(cfg_json)
+            if self._cfg_snapshot is not None:
+                self._cfg_snapshot.add_payload(cfg_hash, payload)
+        self._cfg64_cache[cfg_hash] = payload
+        while len(self._cfg64_cache) > ConfigSnapshot.MAX_PAYLOADS:
+            del self._cfg64_cache[next(iter(self._cfg64_cache))]
+        return payload
+
+    def _config_fingerprint(self) -> tuple:
+        # Adding or removing a control publishes a new registry snapshot and adding or removing a
+        # config replaces the control's column tuple, so comparing these by identity is enough.
+        # ControlConfig's setters count their in place edits.
+        controls = self.controls_dict.snapshot()
+        columns = tuple(control._columns_cfg for control in controls.values())
+        device_cfg = tuple((key, value) for key, value in self._cfg.items() if key != "cfgRev")
+        return controls, columns, device_cfg, ControlConfig._edit_count
+
+    def _update_content_revision(self):
+        fingerprint = self._config_fingerprint()
+        previous = self._cfg_fingerprint
+        if (
+            previous is not None
+            and fingerprint[0] is previous[0]
+            and fingerprint[1] == previous[1]
+            and fingerprint[2] == previous[2]
+            and fingerprint[3] == previous[3]
+        ):
+            return
+        self._cfg_fingerprint = fingerprint
+        self._cfg["cfgRev"] = self._content_revision(fingerprint[0])
+
+    def _content_revision(self, controls) -> int:
+        from .config_snapshot import content_hash
+
+        # Hash every column layout so the revision doesn't depend on what the app asked for.
+        canonical = {
+            "CFG": {key: value for key, value in self._cfg.items() if key != "cfgRev"},
+            "controls": [
+                [control.ctrl_type, control.control_id, [[cfg.get_cfg64() for cfg in column] for column in control._columns_cfg]]
+                for control in controls.values()
+            ],
+        }
+        cfg_json = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+        # The Dash app stores cfgRev as a positive 32 bit int.
+        return int(content_hash(cfg_json)[:8], 16) & 0x7FFFFFFF or 1
+
     def _server_clk(self, data):
         if self._clk_rx_callback is not None:
             self._clk_rx_callback(data)
@@ -203,6 +285,8 @@ class Device(threading.Thread):
             #  no_views = data[3]
         except IndexError:
             return ""
+        if self._cfg_rev_from_content:
+            self._update_content_revision()
         reply = self._device_id_str + f"\tCFG\t{dashboard_id}\tDVCE\t{json.dumps(self._cfg)}\n"
         dvvw_str = ""
         for control in self.controls_dict.values():
@@ -222,21 +306,55 @@ class Device(threading.Thread):
     def _send_alarm(self, alarm_id, message_header, message_body):
         payload = self._device_id_str + f"\tALM\t{alarm_id}\t{message_header}\t{message_body}\n"
         logger.debug("ALARM: %s", payload)
-        self.tx_zmq_pub.send_multipart([b"ALL", payload.encode('utf-8')])
+        self._publish([b"ALL", payload.encode('utf-8'), priority_frame(MessagePriority.ALARM)])
 
     def _send_data(self, data: str):
-        if not data:
+        if not data or not self.has_consumers:
             return
         reply_send = ""
         if isinstance(data, str):
             reply_send = data.replace("{device_id}", self.device_id)
         elif isinstance(data, list):
             reply_send = "\t" + "\t".join(data) + "\n"
+        self._publish([b"ALL", reply_send.encode('utf-8')])
+
+    def _publish(self, frames: list):
+        if threading.current_thread() is self:
+            try:
+                self.tx_zmq_pub.send_multipart(frames)
+            except zmq.error.ZMQError:
+                pass
+            return
+        # Controls are set from user threads, executor and mailbox threads, and transmit timers.
+        # ZMQ sockets aren't thread safe, so queue the message and wake the Device thread to send it.
+        self._tx_queue.append(frames)
         try:
-            self.tx_zmq_pub.send_multipart([b"ALL", reply_send.encode('utf-8')])
-        except zmq.error.ZMQError:
+            self._wake_tx.send(b"\0")
+        except OSError:
+            # The socket buffer is full, so the Device thread has already been woken.
             pass
 
+    def _send_queued(self):
+        try:
+            while self._wake_rx.recv(4096):
+                pass
+        except OSError:
+            pass
+        while self._tx_queue:
+            self._publish(self._tx_queue.popleft())
+
+    def _send_reply(self, msg_to: bytes, reply: str | Iterable[str], priority: MessagePriority):
+        b_priority = priority_frame(priority)
+        if priority == MessagePriority.BULK:
+            # Send bulk replies as several frames, as they are generated, so connections can
+            # slot other messages between them and the whole reply is never held in memory.
+            for frame in split_reply(reply, self.max_frame_size):
+                self.tx_zmq_pub.send_multipart([msg_to, frame.encode('utf-8'), b_priority])
+        else:
+            if not isinstance(reply, str):
+                reply = "".join(reply)
+            self.tx_zmq_pub.send_multipart([msg_to, reply.encode('utf-8'), b_priority])
+
     def storage_enable(self, control_type: ControlName, control_id: str) -> None:
         """Turn On Dash Server Storage for the Event Log, Map, or Time Graph control."""
         key = f"{control_type.value}\t{control_id}"
@@ -246,33 +364,33 @@ class Device(threading.Thread):
             return
         payload = self._device_id_str + f"\tSTE\t{control_type.value}\t{control_id}\n"
         logger.debug("STORAGE ENABLE: %s", payload)
-        self.tx_zmq_pub.send_multipart([b"ANNOUNCE", payload.encode('utf-8')])
+        self._publish([b"ANNOUNCE", payload.encode('utf-8')])
 
     def _send_announce(self):
         payload = self._device_id_str + f"\tWHO\t{self.device_type}\t{self.device_name}\n"
         logger.debug("ANNOUNCE: %s", payload.rstrip())
-        self.tx_zmq_pub.send_multipart([b"ANNOUNCE", payload.encode('utf-8')])
+        self._publish([b"ANNOUNCE", payload.encode('utf-8')])
 
     def request_clock(self):
         """Requests UTC Timestamp from the Dash Server
         """
         payload = self._device_id_str + "\tCLK\n"
         logger.debug("ANNOUNCE: %s", payload.rstrip())
-        self.tx_zmq_pub.send_multipart([b"ANNOUNCE", payload.encode('utf-8')])
+        self._publish([b"ANNOUNCE", payload.encode('utf-8')])
 
     def request_ota_build_number(self):
         """Requests requests latest build number for over the air updates from the Dash Server
         """
         payload = self._device_id_str + f"\tOTA\t{self.device_type}\n"
         logger.debug("ANNOUNCE: %s", payload.rstrip())
-        self.tx_zmq_pub.send_multipart([b"ANNOUNCE", payload.encode('utf-8')])
+        self._publish([b"ANNOUNCE", payload.encode('utf-8')])
 
     def request_ota(self, build_number, chunk_number):
         """Requests requests latest ota build from the Dash Server
         """
         payload = self._device_id_str + f"\tOTA\t{self.device_type}\t{build_number}\t{chunk_number}\n"
         logger.debug("ANNOUNCE: %s", payload.rstrip())
-        self.tx_zmq_pub.send_multipart([b"ANNOUNCE", payload.encode('utf-8')])
+        self._publish([b"ANNOUNCE", payload.encode('utf-8')])
 
     def is_control_loaded(self, control_type, control_id: str) -> bool:
         """Is the control loaded in the device?"""
@@ -290,46 +408,62 @@ class Device(threading.Thread):
             The DashIO app reports the size of the screen in no of columns. You can load a separate
             config for each reported column number.
         """
+        from .load_config import load_all_controls_from_config
+
         if not 1 <= column_no <= 3:
             column_no = 1
-        for control_type, control_list in c64_dict.items():
-            if isinstance(control_list, list):
-                for control in control_list:
-                    key = f"{control_type}\t{control['controlID']}"
-                    if self.is_control_loaded(control_type, control['controlID']):
-                        cfg = CONFIG_INSTANCE_DICT[control_type].from_dict(control)
-                        self.controls_dict[key].add_config(cfg, column_no=column_no)
-                    else:
-                        new_control = CONTROL_INSTANCE_DICT[control_type].from_cfg_dict(control, column_no=column_no)
-                        self.add_control(new_control)
-            elif control_type == "CFG" and isinstance(control_list, dict):
-                if 'name' in control_list['deviceSetup']:
-                    self._set_device_setup("name", True)
-                    self.set_name_callback(self._name_callback)
+        load_all_controls_from_config(self, c64_dict, column_no)
+        cfg = c64_dict.get("CFG")
+        if isinstance(cfg, dict) and 'name' in cfg['deviceSetup']:
+            self._set_device_setup("name", True)
+            self.set_name_callback(self._name_callback)
 
-    def add_control(self, iot_control):
-        """Add a control to the device.
-
-        Parameters
-        ----------
-            iot_control : iotControl
-        """
+    def _attach_control(self, iot_control):
         try:
             if isinstance(iot_control, Alarm):
                 iot_control.add_transmit_message_callback(self._send_alarm)
             else:
                 iot_control.add_transmit_message_callback(self._send_data)
+            iot_control._callback_executor = self._callback_executor
         except AttributeError:
             pass
+
+    def add_control(self, iot_control):
+        """Add a control to the device.
+
+        Parameters
+        ----------
+            iot_control : iotControl
+        """
+        self._attach_control(iot_control)
         key = f"{iot_control.ctrl_type}\t{iot_control.control_id}"
 
-        if key not in self.controls_dict:
+        if self.controls_dict.setdefault(key, iot_control) is iot_control:
             if isinstance(iot_control, DeviceView):
                 self._cfg["numDeviceViews"] += 1
-            self.controls_dict[key] = iot_control
             return True
         return False
 
+    def add_controls(self, iot_controls: Iterable) -> int:
+        """Add many controls to the device at once. Controls already in the device are skipped.
+
+        Parameters
+        ----------
+            iot_controls : Iterable of iotControl
+
+        Returns
+        -------
+            int
+                The number of controls added.
+        """
+        new_controls = {}
+        for iot_control in iot_controls:
+            self._attach_control(iot_control)
+            new_controls.setdefault(iot_control.ctrl_type + "\t" + iot_control.control_id, iot_control)
+        added = self.controls_dict.update_missing(new_controls)
+        self._cfg["numDeviceViews"] += sum(isinstance(iot_control, DeviceView) for iot_control in added)
+        return len(added)
+
     def get_control(self, control_type: ControlName, control_id: str):
         """Get the control instance.
 
@@ -358,8 +492,19 @@ class Device(threading.Thread):
         if isinstance(iot_control, DeviceView):
             self._cfg["numDeviceViews"] -= 1
         key = f"{iot_control.ctrl_type}\t{iot_control.control_id}"
-        if key in self.controls_dict:
-            del self.controls_dict[key]
+        if self.controls_dict.pop(key, None) is not None:
+            iot_control._callback_executor = None
+
+    @property
+    def callback_executor(self) -> CallbackExecutor | None:
+        """The CallbackExecutor that runs control and setup callbacks, or None to run them on the Device thread."""
+        return self._callback_executor
+
+    @callback_executor.setter
+    def callback_executor(self, executor: CallbackExecutor | None):
+        self._callback_executor = executor
+        for control in self.controls_dict.values():
+            control._callback_executor = executor
 
     def _set_device_setup(self, control_name: str, settable: bool):
         if settable:
@@ -452,7 +597,7 @@ class Device(threading.Thread):
         if self._wifi_rx_callback is not None:
             if self._wifi_rx_callback(msg):
                 data = self._device_id_str + "\tWIFI\n"
-                self.tx_zmq_pub.send_multipart([b"ALL", data.encode('utf-8')])
+                self._publish([b"ALL", data.encode('utf-8')])
         return ""
 
     def set_dashio_callback(self, callback):
@@ -479,7 +624,7 @@ class Device(threading.Thread):
         if self._dashio_rx_callback is not None:
             if self._dashio_rx_callback(msg):
                 data = self._device_id_str + "\tDASHIO\n"
-                self.tx_zmq_pub.send_multipart([b"ALL", data.encode('utf-8')])
+                self._publish([b"ALL", data.encode('utf-8')])
         return ""
 
     def set_name_callback(self, callback):
@@ -512,7 +657,7 @@ class Device(threading.Thread):
             if name:
                 self._device_name = name
                 data = self._device_id_str + f"\tNAME\t{name}\n"
-                self.tx_zmq_pub.send_multipart([b"ALL", data.encode('utf-8')])
+                self._publish([b"ALL", data.encode('utf-8')])
         return ""
 
     def set_tcp_callback(self, callback):
@@ -538,7 +683,7 @@ class Device(threading.Thread):
         if self._tcp_rx_callback is not None:
             if self._tcp_rx_callback(msg):
                 data = self._device_id_str + "\tTCP\n"
-                self.tx_zmq_pub.send_multipart([b"ALL", data.encode('utf-8')])
+                self._publish([b"ALL", data.encode('utf-8')])
             return ""
 
     def set_mqtt_callback(self, callback):
@@ -565,7 +710,7 @@ class Device(threading.Thread):
         if self._mqtt_rx_callback is not None:
             if self._mqtt_rx_callback(msg):
                 data = self._device_id_str + "\tMQTT\n"
-                self.tx_zmq_pub.send_multipart([b"ALL", data.encode('utf-8')])
+                self._publish([b"ALL", data.encode('utf-8')])
         return ""
 
     def register_connection(self, connection):
@@ -573,14 +718,25 @@ class Device(threading.Thread):
         if connection.zmq_connection_uuid not in self.connections_list:
             logger.debug("DEVICE REG CONECTION")
             self.connections_list.append(connection.zmq_connection_uuid)
+            self._connections[connection.zmq_connection_uuid] = connection
             self.rx_zmq_sub.connect(CONNECTION_PUB_URL.format(id=connection.zmq_connection_uuid))
             connection.rx_zmq_sub.connect(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
 
+    @property
+    def has_consumers(self) -> bool:
+        """True if any registered connection has someone listening for control updates.
+
+        Connections that can't tell are assumed to have consumers. With no connections
+        registered there is nobody to send to.
+        """
+        return any(getattr(connection, 'has_consumers', True) for connection in list(self._connections.values()))
+
     def de_register_connection(self, connection):
         """Connections unregistered here"""
         if connection.zmq_connection_uuid in self.connections_list:
             logger.debug("DEVICE DE-REG CONECTION")
             self.connections_list.remove(connection.zmq_connection_uuid)
+            del self._connections[connection.zmq_connection_uuid]
             self.rx_zmq_sub.disconnect(CONNECTION_PUB_URL.format(id=connection.zmq_connection_uuid))
             connection.rx_zmq_sub.disconnect(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
 
@@ -589,8 +745,10 @@ class Device(threading.Thread):
         device_type: str,
         device_id: str,
         device_name: str,
-        cfg_dict: dict | None = None,
-        context: zmq.Context | None = None
+        cfg_dict: dict | ConfigSnapshot | None = None,
+        context: zmq.Context | None = None,
+        callback_executor: CallbackExecutor | None = None,
+        cfg_rev_from_content: bool = False
     ) -> None:
         """DashDevice
 
@@ -602,10 +760,19 @@ class Device(threading.Thread):
                 A unique identifier for this device
             device_name : str
                 The name for this device
-            cfg_dict : dict optional
-                Setup dict to cfgRev and adds controls defined in cfg_dict, defaults None
+            cfg_dict : dict | ConfigSnapshot, optional
+                Setup dict to cfgRev and adds controls defined in cfg_dict, defaults None. A
+                ConfigSnapshot also supplies the C64 CFG payloads saved from earlier runs.
             context : optional
                 ZMQ context. Defaults to None.
+            callback_executor : CallbackExecutor, optional
+                Run control receive callbacks and setup callbacks on the executor's threads, so a
+                slow callback doesn't hold up replies to the Dash app. Defaults to None, which
+                runs them on the Device thread. The caller owns the executor, it can be shared by
+                several devices so close() doesn't shut it down.
+            cfg_rev_from_content : bool, optional
+                Derive cfgRev from a hash of the config instead of counting revisions, so the Dash
+                app only downloads the CFG again when the config has actually changed. Defaults to False.
         """
         threading.Thread.__init__(self, daemon=True)
 
@@ -625,19 +792,40 @@ class Device(threading.Thread):
         self._device_name = device_name.strip()
         self._device_setup_list = []
         self.connections_list = []
+        self._connections = {}
         self._device_commands_dict = {}
         self._device_commands_dict['CONNECT'] = self._make_connect
         self._device_commands_dict['STATUS'] = self._make_status
         self._device_commands_dict['CFG'] = self._make_cfg64
         self._device_commands_dict['CLK'] = self._server_clk
         self._device_commands_dict['OTA'] = self._server_ota
-        self.controls_dict = {}
+        self._bulk_commands = ('STATUS', 'CFG')
+        # Commands answered by the Device itself, these always run on the Device thread.
+        self._protocol_commands = ('CONNECT', 'STATUS', 'CFG')
+        self._callback_executor = callback_executor
+        # Messages from other threads, sent by the Device thread when _wake_tx wakes it.
+        self._tx_queue = deque()
+        self._wake_rx, self._wake_tx = socket.socketpair()
+        self._wake_rx.setblocking(False)
+        self._wake_tx.setblocking(False)
+        self.max_frame_size = 16384
+        self.controls_dict = ControlRegistry()
         self._cfg = {}
         self._cfg["deviceSetup"] = ''
         self._cfg["cfgRev"] = 1
         self._device_id_str = f"\t{device_id}"
         self._cfg["numDeviceViews"] = 0
+        # C64 CFG payloads by the hash of their json.
+        self._cfg64_cache = {}
+        self._cfg_snapshot = None
+        self._cfg_rev_from_content = cfg_rev_from_content
+        self._cfg_fingerprint = None
         if cfg_dict is not None:
+            from .config_snapshot import ConfigSnapshot
+
+            if isinstance(cfg_dict, ConfigSnapshot):
+                self._cfg_snapshot = cfg_dict
+                cfg_dict = cfg_dict.cfg_dict
             self._cfg["cfgRev"] = cfg_dict['CFG']['cfgRev']
             self.add_all_c64_controls(cfg_dict)
             self.use_cfg64()
@@ -680,14 +868,41 @@ class Device(threading.Thread):
         int
             The cfgRev number
         """
+        if self._cfg_rev_from_content:
+            self._update_content_revision()
         return self._cfg["cfgRev"]
 
     @config_revision.setter
     def config_revision(self, val: int):
         self._cfg["cfgRev"] = val
 
+    @property
+    def cfg_rev_from_content(self) -> bool:
+        """Derive cfgRev from a hash of the config rather than counting revisions.
+
+        Returns
+        -------
+        bool
+            True if cfgRev is derived from the config content
+        """
+        return self._cfg_rev_from_content
+
+    @cfg_rev_from_content.setter
+    def cfg_rev_from_content(self, val: bool):
+        self._cfg_rev_from_content = val
+        self._cfg_fingerprint = None
+
     def inc_config_revision(self):
-        """Incements the configuration revision."""
+        """Incements the configuration revision.
+
+        With cfg_rev_from_content set the revision is recalculated from the config instead. The
+        config setters are picked up on their own, call this after editing a config's cfg dict
+        directly.
+        """
+        if self._cfg_rev_from_content:
+            self._cfg_fingerprint = None
+            self._update_content_revision()
+            return
         if "cfgRev" in self._cfg:
             self._cfg["cfgRev"] = self._cfg["cfgRev"] + 1
         else:
@@ -710,8 +925,15 @@ class Device(threading.Thread):
         self._send_data(f"\t{{device_id}}\tNAME\t{self._device_name}\t")
 
     def close(self):
-        """Close the device"""
+        """Close the device.
+
+        A callback_executor isn't shut down, call its shutdown() once every device using it is
+        closed. Its threads are joined when the interpreter exits, so a callback that never
+        returns will hold up the exit.
+        """
         self.running = False
+        if self._cfg_snapshot is not None:
+            self._cfg_snapshot.flush()
 
     def _local_command(self, msg_dict):
         logging.debug("LOCAL COMMAND: %s", msg_dict)
@@ -731,12 +953,14 @@ class Device(threading.Thread):
 
         poller = zmq.Poller()
         poller.register(self.rx_zmq_sub, zmq.POLLIN)
+        poller.register(self._wake_rx, zmq.POLLIN)
 
         while self.running:
             try:
                 socks = dict(poller.poll(100))
             except zmq.error.ContextTerminated:
                 break
+            self._send_queued()
             if self.rx_zmq_sub in socks:
                 try:
                     [data, msg_from] = self.rx_zmq_sub.recv_multipart()
@@ -747,11 +971,12 @@ class Device(threading.Thread):
                     msg_dict = json.loads(msg_from)
                     self._local_command(msg_dict)
                     continue
-                reply = self._on_message(data)
-                if reply != "":
+                for reply, priority in self._on_message(data):
                     #  logger.debug("DEVICE TX: %s ,%s", msg_from, data)
-                    self.tx_zmq_pub.send_multipart([msg_from, reply.encode('utf-8')])
+                    self._send_reply(msg_from, reply, priority)
         self.tx_zmq_pub.close()
         self.rx_zmq_sub.close()
+        self._wake_rx.close()
+        self._wake_tx.close()
         self.context.term()
         self.context.term()
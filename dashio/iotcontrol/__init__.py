@@ -1,26 +1,141 @@
 """The DashIO module is for creating devices, controls and connections for the DashIO app.
 """
-from .enums import Color, Icon, Precision, Keyboard, TextAlignment, SliderBarStyle, DialNumberPosition, DialStyle, \
-    SoundName, ChartLineType, TimeGraphLineType, TimeGraphPositionOfKey, ButtonState, LabelStyle, KnobStyle, \
-    TitlePosition, ChartXAxisLabelsStyle, TextFormat, DirectionStyle, ColorPickerStyle, ControlName, ButtonStyle, \
-    MenuStyle, ButtonGroupStyle, ConnectionState, BarMode, DialMode
-from .audio_visual_display import AudioVisualDisplay
-from .chart import Chart, ChartLine, ChartConfig
-from .slider import Slider, SliderConfig
-from .textbox import TextBox, TextBoxConfig
-from .button import Button, ButtonConfig
-from .time_graph import TimeGraph, TimeGraphLine, DataPoint, DataPointArray, TimeGraphConfig
-from .knob import Knob, KnobConfig
-from .dial import Dial, DialConfig
-from .direction import Direction, DirectionConfig
-from .map import Map, MapLocation
-from .alarm import Alarm
-from .menu import Menu, MenuConfig
-from .selector import Selector
-from .label import Label, LabelConfig
-from .device_view import DeviceView, DeviceViewConfig
-from .control import Control, ControlPosition, ControlConfig
-from .button_group import ButtonGroup, ButtonGroupConfig
-from .event_log import EventLog, EventData
-from .color_picker import ColorPicker, ColorPickerConfig
-from .table import Table, TableRow, TableConfig
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .enums import Color, Icon, Precision, Keyboard, TextAlignment, SliderBarStyle, DialNumberPosition, DialStyle, \
+        SoundName, ChartLineType, TimeGraphLineType, TimeGraphPositionOfKey, ButtonState, LabelStyle, KnobStyle, \
+        TitlePosition, ChartXAxisLabelsStyle, TextFormat, DirectionStyle, ColorPickerStyle, ControlName, ButtonStyle, \
+        MenuStyle, ButtonGroupStyle, ConnectionState, BarMode, DialMode, MessagePriority
+    from .audio_visual_display import AudioVisualDisplay
+    from .chart import Chart, ChartLine, ChartConfig
+    from .slider import Slider, SliderConfig
+    from .textbox import TextBox, TextBoxConfig
+    from .button import Button, ButtonConfig
+    from .time_graph import TimeGraph, TimeGraphLine, DataPoint, DataPointArray, TimeGraphConfig, RollupTier
+    from .knob import Knob, KnobConfig
+    from .dial import Dial, DialConfig
+    from .direction import Direction, DirectionConfig
+    from .map import Map, MapLocation, MapTrack
+    from .alarm import Alarm
+    from .menu import Menu, MenuConfig
+    from .selector import Selector, SelectorConfig
+    from .label import Label, LabelConfig
+    from .device_view import DeviceView, DeviceViewConfig
+    from .control import Control, ControlPosition, ControlConfig
+    from .transmit_policy import TransmitPolicy
+    from .button_group import ButtonGroup, ButtonGroupConfig
+    from .event_log import EventLog, EventData
+    from .color_picker import ColorPicker, ColorPickerConfig
+    from .table import Table, TableRow, TableConfig
+
+# Where each public name is defined. Submodules, and the third party packages they use, are
+# only imported when one of their names is first used.
+_LAZY_IMPORTS = {
+    'Color': '.enums',
+    'Icon': '.enums',
+    'Precision': '.enums',
+    'Keyboard': '.enums',
+    'TextAlignment': '.enums',
+    'SliderBarStyle': '.enums',
+    'DialNumberPosition': '.enums',
+    'DialStyle': '.enums',
+    'SoundName': '.enums',
+    'ChartLineType': '.enums',
+    'TimeGraphLineType': '.enums',
+    'TimeGraphPositionOfKey': '.enums',
+    'ButtonState': '.enums',
+    'LabelStyle': '.enums',
+    'KnobStyle': '.enums',
+    'TitlePosition': '.enums',
+    'ChartXAxisLabelsStyle': '.enums',
+    'TextFormat': '.enums',
+    'DirectionStyle': '.enums',
+    'ColorPickerStyle': '.enums',
+    'ControlName': '.enums',
+    'ButtonStyle': '.enums',
+    'MenuStyle': '.enums',
+    'ButtonGroupStyle': '.enums',
+    'ConnectionState': '.enums',
+    'BarMode': '.enums',
+    'DialMode': '.enums',
+    'MessagePriority': '.enums',
+    'AudioVisualDisplay': '.audio_visual_display',
+    'Chart': '.chart',
+    'ChartLine': '.chart',
+    'ChartConfig': '.chart',
+    'Slider': '.slider',
+    'SliderConfig': '.slider',
+    'TextBox': '.textbox',
+    'TextBoxConfig': '.textbox',
+    'Button': '.button',
+    'ButtonConfig': '.button',
+    'TimeGraph': '.time_graph',
+    'TimeGraphLine': '.time_graph',
+    'DataPoint': '.time_graph',
+    'DataPointArray': '.time_graph',
+    'TimeGraphConfig': '.time_graph',
+    'RollupTier': '.time_graph',
+    'Knob': '.knob',
+    'KnobConfig': '.knob',
+    'Dial': '.dial',
+    'DialConfig': '.dial',
+    'Direction': '.direction',
+    'DirectionConfig': '.direction',
+    'Map': '.map',
+    'MapLocation': '.map',
+    'MapTrack': '.map',
+    'Alarm': '.alarm',
+    'Menu': '.menu',
+    'MenuConfig': '.menu',
+    'Selector': '.selector',
+    'SelectorConfig': '.selector',
+    'Label': '.label',
+    'LabelConfig': '.label',
+    'DeviceView': '.device_view',
+    'DeviceViewConfig': '.device_view',
+    'Control': '.control',
+    'ControlPosition': '.control',
+    'ControlConfig': '.control',
+    'TransmitPolicy': '.transmit_policy',
+    'ButtonGroup': '.button_group',
+    'ButtonGroupConfig': '.button_group',
+    'EventLog': '.event_log',
+    'EventData': '.event_log',
+    'ColorPicker': '.color_picker',
+    'ColorPickerConfig': '.color_picker',
+    'Table': '.table',
+    'TableRow': '.table',
+    'TableConfig': '.table',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def _import_submodule(name: str):
+    # Submodules were attributes of the package when it imported everything, keep them reachable.
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = importlib.import_module("." + name, __name__)
+    except ModuleNotFoundError as error:
+        if error.name != f"{__name__}.{name}":
+            raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = module
+    return module
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        return _import_submodule(name)
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -38,6 +38,8 @@ class Alarm(Control):
         Send an alarm with a header and body
     """
 
+    __slots__ = ()
+
     def get_cfg(self, data):
         """Alarms do not appear in the CFG
         """
@@ -31,6 +31,8 @@ class AudioVisualDisplay(Control):
     """AudioVisualDisplay Control
     """
 
+    __slots__ = ('_url')
+
     def __init__(
         self,
         control_id: str,
@@ -58,7 +60,7 @@ class AudioVisualDisplay(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("AVD", control_id)
-        self._app_columns_cfg[str(column_no)].append(ControlConfig(control_id, title, control_position, title_position))
+        self._append_config(ControlConfig(control_id, title, control_position, title_position), column_no)
         self.url = ""
 
     @classmethod
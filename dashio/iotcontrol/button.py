@@ -29,6 +29,9 @@ from .enums import ButtonState, Color, Icon, TitlePosition, ButtonStyle
 
 class ButtonConfig(ControlConfig):
     """ButtonGroupConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -118,6 +121,8 @@ class Button(Control):
         Instantiates Button from cfg dictionary
     """
 
+    __slots__ = ('_btn_state', '_icon_name', '_text')
+
     def toggle_btn(self):
         """
         Toggles the current ButtonState
@@ -144,7 +149,7 @@ class Button(Control):
         column_no=1
     ):
         super().__init__("BTTN", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             ButtonConfig(
                 control_id,
                 title,
@@ -156,7 +161,8 @@ class Button(Control):
                 off_color,
                 text,
                 control_position
-            )
+            ),
+            column_no
         )
         self._btn_state = ButtonState.OFF
         self._text = text.translate(BAD_CHARS)
@@ -31,6 +31,9 @@ from .enums import Icon, TitlePosition, ButtonGroupStyle
 
 class ButtonGroupConfig(ControlConfig):
     """ButtonGroupConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -93,6 +96,8 @@ class ButtonGroup(Control):
         Add a button to the ButtonGroup
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id,
@@ -131,7 +136,7 @@ class ButtonGroup(Control):
                 phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("BTGP", control_id)
-        self._app_columns_cfg[str(column_no)].append(ButtonGroupConfig(control_id, title, text, style, icon, grid_view, control_position, title_position))
+        self._append_config(ButtonGroupConfig(control_id, title, text, style, icon, grid_view, control_position, title_position), column_no)
 
     @classmethod
     def from_cfg_dict(cls, cfg_dict: dict, column_no=1):
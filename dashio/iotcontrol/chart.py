@@ -27,18 +27,122 @@ from .control import Control, ControlPosition, ControlConfig, _get_title_positio
 from .enums import Color, ChartLineType, ChartXAxisLabelsStyle, TitlePosition
 
 
+def _format_value(formatter, value) -> str:
+    try:
+        return formatter(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+class _ChartData(list):
+    """A list that tells its ChartLine when it is changed in place, so the line's text is only
+    made again when it's needed."""
+
+    __slots__ = ('_line',)
+
+    def __init__(self, values, line: ChartLine):
+        super().__init__(values)
+        self._line = line
+
+    def _changed(self):
+        self._line.data_changed()
+
+
+def _mutator(name: str):
+    method = getattr(list, name)
+
+    def _wrapper(self, *args):
+        result = method(self, *args)
+        self._changed()
+        return result
+    _wrapper.__name__ = name
+    return _wrapper
+
+
+for _name in (
+    'append', 'extend', 'insert', 'pop', 'remove', 'clear', 'sort', 'reverse',
+    '__setitem__', '__delitem__', '__iadd__', '__imul__'
+):
+    setattr(_ChartData, _name, _mutator(_name))
+del _name
+
+
 class ChartLine:
     """ChartLine class
     """
-    def __init__(self, name="", line_type=ChartLineType.LINE, color=Color.BLACK, right_axis=False):
+    def __init__(self, name="", line_type=ChartLineType.LINE, color=Color.BLACK, right_axis=False, precision: int | None = None):
+        """ChartLine class
+
+        Parameters
+        ----------
+        name : str, optional
+            The name of the line, by default ""
+        line_type : ChartLineType, optional
+            Which line type to use, by default ChartLineType.LINE
+        color : Color, optional
+            The color of the line, by default Color.BLACK
+        right_axis : bool, optional
+            Defaults to left, right if true.
+        precision : int, optional
+            Send the data with this many decimal places, by default None which sends str() of each value.
+        """
         self.name = name.translate(BAD_CHARS)
         self.line_type = line_type
         self.color = color
-        self.data = []
+        # The formatted data, None when it needs making again.
+        self._data_str = None
+        self._precision = precision
+        self._data = _ChartData((), self)
         self.axis_side = 'left'
         if right_axis:
             self.axis_side = 'right'
 
+    @property
+    def data(self):
+        """The values of the line. A list, or any sequence with tolist() such as a NumPy array.
+
+        Lists are watched for changes. Call data_changed() after changing an array in place.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, val):
+        if isinstance(val, list):
+            val = _ChartData(val, self)
+        self._data = val
+        self._data_str = None
+
+    @property
+    def precision(self) -> int | None:
+        """The number of decimal places sent, None sends str() of each value."""
+        return self._precision
+
+    @precision.setter
+    def precision(self, val: int | None):
+        self._precision = val
+        self._data_str = None
+
+    def data_changed(self):
+        """Make the text sent for the data again, for when the data was changed in place."""
+        self._data_str = None
+
+    def _format_data(self) -> str:
+        if self._data_str is not None:
+            return self._data_str
+        # NumPy arrays have tolist(), which is much quicker than iterating over them.
+        values = self._data.tolist() if hasattr(self._data, 'tolist') else self._data
+        if self._precision is None:
+            data_str = "\t".join(map(str, values))
+        else:
+            # One % operation formats the whole line, rather than a call per value.
+            try:
+                data_str = "\t".join([f"%.{self._precision}f"] * len(values)) % tuple(values)
+            except (TypeError, ValueError):
+                formatter = f"{{:.{self._precision}f}}".format
+                data_str = "\t".join(_format_value(formatter, value) for value in values)
+        self._data_str = data_str
+        return data_str
+
     def get_line_data(self):
         """Returns the line data formatted for the **Dash** app
 
@@ -47,14 +151,14 @@ class ChartLine:
         str
             The formatted line data
         """
-        data_str = f"\t{self.name}\t{self.line_type.value}\t{self.color.value}\t{self.axis_side}\t"
-        data_str += "\t".join(map(str, self.data))
-        data_str += "\n"
-        return data_str
+        return f"\t{self.name}\t{self.line_type.value}\t{self.color.value}\t{self.axis_side}\t{self._format_data()}\n"
 
 
 class ChartConfig(ControlConfig):
     """ChartConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id,
@@ -132,6 +236,8 @@ class Chart(Control):
         The control base class
     """
 
+    __slots__ = ('line_dict', 'precision', '_sent_lines', '_x_axis_min', '_x_axis_max', '_x_axis_num_bars', '_y_axis_min', '_y_axis_max', '_y_axis_num_bars', '_y_axis_min_rt', '_y_axis_max_rt')
+
     def get_state(self):
         """Called by Device"""
         state_str = ""
@@ -157,7 +263,8 @@ class Chart(Control):
         y_axis_min_rt=0.0,
         y_axis_max_rt=1000.0,
         control_position=None,
-        column_no=1
+        column_no=1,
+        precision: int | None = None
     ):
         """A Chart Control
 
@@ -193,9 +300,11 @@ class Chart(Control):
             The Dash App reports its screen size in columns. column_no allows you to specify which column no to load into.
             Each control can store three configs that define how the device looks for Dash apps installed on single column
             phones or 2 column fold out phones or 3 column tablets.
+        precision : int, optional
+            The number of decimal places for lines added without their own precision, by default None
         """
         super().__init__("CHRT", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             ChartConfig(
                 control_id,
                 title,
@@ -213,9 +322,13 @@ class Chart(Control):
                 y_axis_min_rt,
                 y_axis_max_rt,
                 control_position
-            )
+            ),
+            column_no
         )
         self.line_dict = {}
+        self.precision = precision
+        # The text last sent for each line, so send_chart can skip lines that haven't changed.
+        self._sent_lines = {}
         self._x_axis_min = x_axis_min
         self._x_axis_max = x_axis_max
         self._x_axis_num_bars = x_axis_num_bars
@@ -310,12 +423,26 @@ class Chart(Control):
         gline : GraphLine
             The line to add
         """
+        if gline.precision is None:
+            gline.precision = self.precision
         self.line_dict[line_id.translate(BAD_CHARS)] = gline
 
-    def send_chart(self):
+    def send_chart(self, changed_only: bool = False):
         """Sends the chart to any connected  **Dash** app.
+
+        Parameters
+        ----------
+        changed_only : bool, optional
+            Only send the lines that have changed since they were last sent, by default False
         """
+        if not self.has_consumers:
+            return
         state_str = ""
         for key, line in self.line_dict.items():
-            state_str += self._control_hdr_str + key + line.get_line_data()
-        self.state_str = state_str
+            line_str = line.get_line_data()
+            if changed_only and self._sent_lines.get(key) == line_str:
+                continue
+            self._sent_lines[key] = line_str
+            state_str += self._control_hdr_str + key + line_str
+        if state_str:
+            self.state_str = state_str
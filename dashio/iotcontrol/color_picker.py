@@ -29,6 +29,9 @@ from .enums import (ColorPickerStyle, TitlePosition)
 
 class ColorPickerConfig(ControlConfig):
     """ColorPickerConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -59,7 +62,7 @@ class ColorPickerConfig(ControlConfig):
             cfg_dict["controlID"],
             cfg_dict["title"],
             _get_title_position(cfg_dict["titlePosition"]),
-            _get_color_picker_style(cfg_dict["pickerStyle"]),
+            _get_color_picker_style(cfg_dict.get("style", cfg_dict.get("pickerStyle"))),
             cfg_dict["sendOnlyOnRelease"],
             ControlPosition(cfg_dict["xPositionRatio"], cfg_dict["yPositionRatio"], cfg_dict["widthRatio"], cfg_dict["heightRatio"])
         )
@@ -71,6 +74,10 @@ class ColorPicker(Control):
     """Color Picker Control
     """
 
+    __slots__ = ('_color_value')
+
+    continuous_rx = True
+
     def __init__(
         self,
         control_id: str,
@@ -103,7 +110,7 @@ class ColorPicker(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("CLR", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             ColorPickerConfig(
                 control_id,
                 title,
@@ -111,7 +118,8 @@ class ColorPicker(Control):
                 style,
                 send_only_on_release,
                 control_position
-            )
+            ),
+            column_no
         )
         self._color_value = "#4F5GA2"
 
@@ -132,7 +140,7 @@ class ColorPicker(Control):
             cfg_dict["controlID"],
             cfg_dict["title"],
             _get_title_position(cfg_dict["titlePosition"]),
-            _get_color_picker_style(cfg_dict["pickerStyle"]),
+            _get_color_picker_style(cfg_dict.get("style", cfg_dict.get("pickerStyle"))),
             cfg_dict["sendOnlyOnRelease"],
             ControlPosition(cfg_dict["xPositionRatio"], cfg_dict["yPositionRatio"], cfg_dict["widthRatio"], cfg_dict["heightRatio"]),
             column_no
@@ -24,17 +24,69 @@ SOFTWARE.
 
 from __future__ import annotations
 import json
+import threading
+import time
+from enum import Enum
 
 from ..constants import BAD_CHARS
 from .enums import ColorPickerStyle, DeviceViewStyle, DialNumberPosition, DirectionStyle, ChartXAxisLabelsStyle, \
     Keyboard, KnobStyle, Precision, TextAlignment, TitlePosition, Icon, Color, TextFormat, LabelStyle, SliderBarStyle, \
-    DialStyle, TimeGraphPositionOfKey, ButtonStyle, ButtonGroupStyle, MenuStyle, DialMode, BarMode, CaptionMode
+    DialStyle, TimeGraphPositionOfKey, ButtonStyle, ButtonGroupStyle, MenuStyle, DialMode, BarMode, CaptionMode, \
+    MessagePriority
 from .event import Event
+from .rx_mailbox import RxMailbox
+from .transmit_policy import TransmitPolicy
+
+# Guards making the per control transmit state, which is only made for controls with a TransmitPolicy.
+_TX_STATE_LOCK = threading.Lock()
+
+
+def _enum_table(enum_cls: type[Enum]) -> dict:
+    """Maps the string forms of enum_cls members found in configs, the value, name, and name as
+    words in a few cases, to the members. Used so configs can be loaded without changing case and
+    replacing characters in every string."""
+    table = {}
+    for member in enum_cls:
+        value = str(member.value)
+        words = member.name.replace("_", " ")
+        for form in (value, value.upper(), value.lower(), value.title(), member.name, words, words.title(), words.lower()):
+            table.setdefault(form, member)
+    return table
+
+
+def _lookup(table: dict, enum_cls: type[Enum], text: str, separator: str):
+    try:
+        return table[text]
+    except KeyError:
+        return enum_cls[text.upper().replace(" ", separator)]
+
+
+_ICONS = _enum_table(Icon)
+_COLORS = _enum_table(Color)
+_TITLE_POSITIONS = _enum_table(TitlePosition)
+_CAPTION_MODES = _enum_table(CaptionMode)
+_DIAL_MODES = _enum_table(DialMode)
+_BAR_MODES = _enum_table(BarMode)
+_TEXT_ALIGNMENTS = _enum_table(TextAlignment)
+_TEXT_FORMATS = _enum_table(TextFormat)
+_KEYBOARDS = _enum_table(Keyboard)
+_BUTTON_STYLES = _enum_table(ButtonStyle)
+_MENU_STYLES = _enum_table(MenuStyle)
+_BUTTON_GROUP_STYLES = _enum_table(ButtonGroupStyle)
+_DEVICE_VIEW_STYLES = _enum_table(DeviceViewStyle)
+_COLOR_PICKER_STYLES = _enum_table(ColorPickerStyle)
+_DIAL_NUMBER_POSITIONS = _enum_table(DialNumberPosition)
+_DIRECTION_STYLES = _enum_table(DirectionStyle)
+_CHART_X_AXIS_LABELS_STYLES = _enum_table(ChartXAxisLabelsStyle)
+_KNOB_STYLES = _enum_table(KnobStyle)
+_LABEL_STYLES = _enum_table(LabelStyle)
+_SLIDER_BAR_STYLES = _enum_table(SliderBarStyle)
+_DIAL_STYLES = _enum_table(DialStyle)
+_TIME_GRAPH_POSITION_OF_KEYS = _enum_table(TimeGraphPositionOfKey)
 
 
 def _get_icon(icon_str: str) -> Icon:
-    icon_name = icon_str.upper().replace(" ", "_")
-    return Icon[icon_name]
+    return _lookup(_ICONS, Icon, icon_str, "_")
 
 
 def _get_color_str(color: str | Color) -> str:
@@ -53,38 +105,31 @@ def _get_color(color_str: str) -> Color | str:
         return color_str
     if color_str[0] == '#':
         return color_str
-    color_name = color_str.upper().replace(" ", "_")
-    return Color[color_name]
+    return _lookup(_COLORS, Color, color_str, "_")
 
 
 def _get_title_position(position_str: str) -> TitlePosition:
-    t_pos_name = position_str.upper().replace(" ", "")
-    return TitlePosition[t_pos_name]
+    return _lookup(_TITLE_POSITIONS, TitlePosition, position_str, "")
 
 
 def _get_caption_mode(caption_mode_str: str) -> CaptionMode:
-    t_caption_mode = caption_mode_str.upper().replace(" ", "")
-    return CaptionMode[t_caption_mode]
+    return _lookup(_CAPTION_MODES, CaptionMode, caption_mode_str, "")
 
 
 def _get_dial_mode(dial_mode_str: str) -> DialMode:
-    t_dial_mode = dial_mode_str.upper().replace(" ", "")
-    return DialMode[t_dial_mode]
+    return _lookup(_DIAL_MODES, DialMode, dial_mode_str, "")
 
 
 def _get_bar_mode(bar_mode_str: str) -> BarMode:
-    t_bar_mode = bar_mode_str.upper().replace(" ", "")
-    return BarMode[t_bar_mode]
+    return _lookup(_BAR_MODES, BarMode, bar_mode_str, "")
 
 
 def _get_text_align(text_align_str: str) -> TextAlignment:
-    t_align_name = text_align_str.upper().replace(" ", "")
-    return TextAlignment[t_align_name]
+    return _lookup(_TEXT_ALIGNMENTS, TextAlignment, text_align_str, "")
 
 
 def _get_text_format(text_format_str: str) -> TextFormat:
-    t_format_name = text_format_str.upper().replace(" ", "")
-    return TextFormat[t_format_name]
+    return _lookup(_TEXT_FORMATS, TextFormat, text_format_str, "")
 
 
 def _get_precision(precision_int: int) -> Precision:
@@ -92,73 +137,59 @@ def _get_precision(precision_int: int) -> Precision:
 
 
 def _get_keyboard_type(keyboard_str: str) -> Keyboard:
-    t_keyboard = keyboard_str.upper().replace(" ", "")
-    return Keyboard[t_keyboard]
+    return _lookup(_KEYBOARDS, Keyboard, keyboard_str, "")
 
 
 def _get_button_style(button_style: str) -> ButtonStyle:
-    btn_style = button_style.upper()
-    return ButtonStyle[btn_style]
+    return _lookup(_BUTTON_STYLES, ButtonStyle, button_style, " ")
 
 
 def _get_menu_style(button_style: str) -> MenuStyle:
-    menu_style = button_style.upper()
-    return MenuStyle[menu_style]
+    return _lookup(_MENU_STYLES, MenuStyle, button_style, " ")
 
 
 def _get_button_group_style(button_group_style: str) -> ButtonGroupStyle:
-    btn_grp_style = button_group_style.upper()
-    return ButtonGroupStyle[btn_grp_style]
+    return _lookup(_BUTTON_GROUP_STYLES, ButtonGroupStyle, button_group_style, " ")
 
 
 def _get_device_view_style(device_view_style: str) -> DeviceViewStyle:
-    dvs_name = device_view_style.upper().replace(" ", "")
-    return DeviceViewStyle[dvs_name]
+    return _lookup(_DEVICE_VIEW_STYLES, DeviceViewStyle, device_view_style, "")
 
 
 def _get_color_picker_style(color_picker_style: str) -> ColorPickerStyle:
-    cps_name = color_picker_style.upper().replace(" ", "")
-    return ColorPickerStyle[cps_name]
+    return _lookup(_COLOR_PICKER_STYLES, ColorPickerStyle, color_picker_style, "")
 
 
 def _get_dial_number_position(dn_position_str: str) -> DialNumberPosition:
-    dnp_name = dn_position_str.upper().replace(" ", "")
-    return DialNumberPosition[dnp_name]
+    return _lookup(_DIAL_NUMBER_POSITIONS, DialNumberPosition, dn_position_str, "")
 
 
 def _get_direction_style(dir_style_str: str) -> DirectionStyle:
-    ds_name = dir_style_str.upper().replace(" ", "")
-    return DirectionStyle[ds_name]
+    return _lookup(_DIRECTION_STYLES, DirectionStyle, dir_style_str, "")
 
 
 def _get_chart_x_axis_labels_style(gxal_style_str: str) -> ChartXAxisLabelsStyle:
-    ds_name = gxal_style_str.upper().replace(" ", "")
-    return ChartXAxisLabelsStyle[ds_name]
+    return _lookup(_CHART_X_AXIS_LABELS_STYLES, ChartXAxisLabelsStyle, gxal_style_str, "")
 
 
 def _get_knob_style(knob_style_str: str) -> KnobStyle:
-    ks_name = knob_style_str.upper().replace(" ", "")
-    return KnobStyle[ks_name]
+    return _lookup(_KNOB_STYLES, KnobStyle, knob_style_str, "")
 
 
 def _get_label_style(label_style_str: str) -> LabelStyle:
-    ks_name = label_style_str.upper().replace(" ", "")
-    return LabelStyle[ks_name]
+    return _lookup(_LABEL_STYLES, LabelStyle, label_style_str, "")
 
 
 def _get_bar_style(bar_style_str: str) -> SliderBarStyle:
-    bs_name = bar_style_str.upper().replace(" ", "")
-    return SliderBarStyle[bs_name]
+    return _lookup(_SLIDER_BAR_STYLES, SliderBarStyle, bar_style_str, "")
 
 
 def _get_dial_style(dial_style_str: str) -> DialStyle:
-    bs_name = dial_style_str.upper().replace(" ", "")
-    return DialStyle[bs_name]
+    return _lookup(_DIAL_STYLES, DialStyle, dial_style_str, "")
 
 
 def _get_time_graph_position_of_key(tgp_of_key: str) -> TimeGraphPositionOfKey:
-    tgp_of_key = tgp_of_key.upper().replace(" ", "")
-    return TimeGraphPositionOfKey[tgp_of_key]
+    return _lookup(_TIME_GRAPH_POSITION_OF_KEYS, TimeGraphPositionOfKey, tgp_of_key, "")
 
 
 class ControlPosition:
@@ -167,6 +198,8 @@ class ControlPosition:
         Used to describe a controls position.
     """
 
+    __slots__ = ('x_position_ratio', 'y_position_ratio', 'width_ratio', 'height_ratio')
+
     def __init__(self, x_position_ratio: float, y_position_ratio: float, width_ratio: float, height_ratio: float):
         """The ControlPosition class describes the location and size of a control on a DeviceView. The
         x_position and y_position ratio place the top left hand corner of the control. The width and height ratio
@@ -193,6 +226,12 @@ class ControlPosition:
 class ControlConfig:
     """Base ControlConfig"""
 
+    __slots__ = ('cfg',)
+
+    # Counts the in place edits of every ControlConfig, so a Device deriving cfgRev from the
+    # config content knows to hash it again.
+    _edit_count = 0
+
     def get_cfg_json(self) -> str:
         """Returns the CFG str for the control called when the **Dash** app asks for a CFG
 
@@ -237,6 +276,7 @@ class ControlConfig:
         self.cfg["yPositionRatio"] = control_position.y_position_ratio
         self.cfg["widthRatio"] = control_position.width_ratio
         self.cfg["heightRatio"] = control_position.height_ratio
+        ControlConfig._edit_count += 1
 
     def __init__(
         self,
@@ -249,7 +289,6 @@ class ControlConfig:
         self.cfg = {}
         if title is not None:
             self.cfg["title"] = title.translate(BAD_CHARS)
-        self._title_position = None
         if title_position is not None:
             self.cfg["titlePosition"] = title_position.value
         if control_position is not None:
@@ -298,11 +337,95 @@ class ControlConfig:
     def parent_id(self, val: str):
         _val = val.translate(BAD_CHARS)
         self.cfg["parentID"] = _val
+        ControlConfig._edit_count += 1
+
+
+class _TransmitStream:
+    """The last message sent and any held message for one stream of a controls messages."""
+
+    __slots__ = ('last', 'last_time', 'pending', 'timer')
+
+    def __init__(self):
+        self.last = None
+        self.last_time = 0.0
+        self.pending = None
+        self.timer = None
+
+
+# Shared by every control until a config is added to one of its three columns.
+_NO_COLUMNS = ((), (), ())
 
 
 class Control():
     """Base class for controls. """
 
+    # Controls are slotted so large device models stay small. __dict__ is only made when an
+    # attribute without a slot is set, such as a per control transmit_policy.
+    __slots__ = (
+        'ctrl_type', 'control_id', '_columns_cfg', '_is_active', '_message_rx_event', '_message_tx_event',
+        '_tx_state', '_rx_mailbox', '_callback_executor', '_control_hdr_str', '__dict__', '__weakref__'
+    )
+    _cfg_max_no_columns = 3
+
+    # Priority the Device uses when sending a reply returned by _process_rx_message.
+    reply_priority = MessagePriority.INTERACTIVE
+    # Filters and paces messages set with state_str, None sends every message.
+    transmit_policy: TransmitPolicy | None = None
+    # Controls the user drags, whose messages are a stream of positions where only the latest matters.
+    continuous_rx = False
+
+    def _transmit_key(self, message: str) -> str:
+        """Messages with different keys are filtered and paced separately. Controls whose messages
+        update one of several parts, such as table rows, return the part."""
+        return ""
+
+    def _process_rx_message(self, data_array: list) -> str:
+        """Fires the receive message event. Controls that answer a request directly return the reply,
+        either as a str or an iterable of str for replies that are generated a few lines at a time."""
+        self._fire_rx(data_array)
+        return ""
+
+    def _fire_rx(self, data_array: list):
+        """Hands an incoming message to the receive callbacks, through the rx mailbox or the
+        Device's callback executor when there is one."""
+        if self._rx_mailbox is not None:
+            self._rx_mailbox.put(data_array)
+        elif self._callback_executor is not None:
+            self._callback_executor.submit(self._control_hdr_str, self._message_rx_event, data_array)
+        else:
+            self._message_rx_event(data_array)
+
+    def enable_rx_coalescing(self, max_rate: float | None = None):
+        """Deliver incoming messages to the receive callbacks on their own thread, newest first.
+
+        While a callback is busy only the newest message is kept, older ones are dropped, so a
+        slow callback follows the users finger rather than a growing backlog. Only controls the
+        user drags (Slider, Knob, Direction, and ColorPicker) can do this, other controls keep
+        every message in order. Messages sent from the callbacks are passed to the Device thread
+        to send.
+
+        Parameters
+        ----------
+        max_rate : float, optional
+            The most messages per second to deliver, by default None which delivers as soon as
+            the callbacks are free.
+
+        Raises
+        ------
+        ValueError
+            If the control isn't one the user drags.
+        """
+        if not self.continuous_rx:
+            raise ValueError(f"{type(self).__name__} messages can't be coalesced")
+        self.disable_rx_coalescing()
+        self._rx_mailbox = RxMailbox(self._message_rx_event, max_rate, f"{self.control_id} RX")
+
+    def disable_rx_coalescing(self):
+        """Go back to delivering every incoming message as it arrives."""
+        if self._rx_mailbox is not None:
+            self._rx_mailbox.close()
+            self._rx_mailbox = None
+
     def get_state(self) -> str:
         """This is called by **Dash** app. Controls need to implement their own version."""
         return ""
@@ -328,7 +451,7 @@ class Control():
             return cfg_list
         if 1 <= num_columns <= self._cfg_max_no_columns:
             while num_columns >= 1:
-                cfgs = self._app_columns_cfg[str(num_columns)]
+                cfgs = self._columns_cfg[num_columns - 1]
                 if cfgs:
                     for cfg in cfgs:
                         cfg_list.append(f"\tCFG\t{dashboard_id}\t{self.ctrl_type}\t{cfg.get_cfg_json()}")
@@ -355,14 +478,14 @@ class Control():
         except (IndexError, ValueError):
             return []
         if 1 <= num_columns <= self._cfg_max_no_columns:
-            cfgs = self._app_columns_cfg[str(num_columns)]
+            cfgs = self._columns_cfg[num_columns - 1]
             if cfgs:
                 for cfg in cfgs:
                     cfg_list.append(cfg.get_cfg64())
                 return cfg_list
             num_columns = 1
             while num_columns <= 3:
-                cfgs = self._app_columns_cfg[str(num_columns)]
+                cfgs = self._columns_cfg[num_columns - 1]
                 if cfgs:
                     for cfg in cfgs:
                         cfg_list.append(cfg.get_cfg64())
@@ -373,8 +496,14 @@ class Control():
     def add_config(self, config, column_no=1):
         """Add a duplicate Config for DashIO Apps with wider screens"""
         config.cfg["controlID"] = self.control_id
+        ControlConfig._edit_count += 1
+        self._append_config(config, column_no)
+
+    def _append_config(self, config, column_no=1):
         if 1 <= column_no <= self._cfg_max_no_columns:
-            self._app_columns_cfg[str(column_no)].append(config)
+            columns = list(self._columns_cfg)
+            columns[column_no - 1] += (config,)
+            self._columns_cfg = tuple(columns)
 
     def add_receive_message_callback(self, callback):
         """Add a callback to receive incoming messages to the control."""
@@ -402,29 +531,31 @@ class Control():
         control_id : str
             An unique control identity string. The control identity string must be a unique string for each control per device
         """
-        # List to store control CFG json
-        self._app_columns_cfg = {
-            '1': [],
-            '2': [],
-            '3': []
-        }
+        # The configs for each of the three columns.
+        self._columns_cfg = _NO_COLUMNS
 
         self._is_active = True
 
-        self._cfg_max_no_columns = 3
         self.ctrl_type = ctrl_type.translate(BAD_CHARS)
         self.control_id = control_id.translate(BAD_CHARS)
         if not self.control_id:
             raise ValueError('control_id cannot be an empty string')
         self._message_rx_event = Event()
         self._message_tx_event = Event()
+        self._tx_state = None
+        self._rx_mailbox = None
+        # Set by the Device to run the receive callbacks off its thread.
+        self._callback_executor = None
         # This may break things but makes all controls able to be setup from tasks.
         self._message_rx_event += self._message_tx_event
         self._control_hdr_str = f"\t{{device_id}}\t{self.ctrl_type}\t{self.control_id}\t"
 
     def del_config(self, column_no=1):
         """Deletes all the columnar config layout entries"""
-        self._app_columns_cfg[str(column_no)] = []
+        if 1 <= column_no <= self._cfg_max_no_columns:
+            columns = list(self._columns_cfg)
+            columns[column_no - 1] = ()
+            self._columns_cfg = tuple(columns)
 
     @property
     def state_str(self) -> str:
@@ -439,6 +570,80 @@ class Control():
 
     @state_str.setter
     def state_str(self, val):
+        if not self.has_consumers:
+            return
+        policy = self.transmit_policy
+        if policy is None:
+            self._message_tx_event(val)
+        else:
+            self._transmit(policy, val)
+
+    @property
+    def has_consumers(self) -> bool:
+        """False when nothing is listening for the control's messages, so they needn't be made.
+
+        Messages are sent to the transmit message callbacks. A Device that has none of its
+        connections listening doesn't count, any other callback does.
+        """
+        for handler in self._message_tx_event.handlers:
+            if getattr(getattr(handler, '__self__', None), 'has_consumers', True):
+                return True
+        return False
+
+    def _transmit_stream(self, key: str) -> tuple[threading.Lock, _TransmitStream]:
+        with _TX_STATE_LOCK:
+            if self._tx_state is None:
+                self._tx_state = (threading.Lock(), {})
+        lock, streams = self._tx_state
+        with lock:
+            if key not in streams:
+                streams[key] = _TransmitStream()
+            return lock, streams[key]
+
+    def _transmit(self, policy: TransmitPolicy, val: str):
+        lock, stream = self._transmit_stream(self._transmit_key(val))
+        with lock:
+            if not policy.is_significant(stream.last, val):
+                # Back within the deadband of what was sent, a held message is no longer needed.
+                stream.pending = None
+                return
+            now = time.monotonic()
+            wait = stream.last_time + policy.min_interval - now
+            if wait > 0:
+                # Too soon, hold the latest message and send it when the interval is up.
+                stream.pending = val
+                if stream.timer is None:
+                    stream.timer = threading.Timer(wait, self._send_pending, (lock, stream))
+                    stream.timer.daemon = True
+                    stream.timer.start()
+                return
+            stream.last = val
+            stream.last_time = now
+        self._message_tx_event(val)
+
+    def _reset_transmit(self):
+        """Forget what has been sent and drop any held messages, for when the whole control is reset."""
+        with _TX_STATE_LOCK:
+            tx_state = self._tx_state
+            self._tx_state = None
+        if tx_state is None:
+            return
+        lock, streams = tx_state
+        with lock:
+            for stream in streams.values():
+                if stream.timer is not None:
+                    stream.timer.cancel()
+                stream.pending = None
+
+    def _send_pending(self, lock: threading.Lock, stream: _TransmitStream):
+        with lock:
+            stream.timer = None
+            val = stream.pending
+            stream.pending = None
+            if val is None:
+                return
+            stream.last = val
+            stream.last_time = time.monotonic()
         self._message_tx_event(val)
 
     #  Use getter, setter properties to store the settings in the config dictionary
@@ -453,11 +658,11 @@ class Control():
         """
         if not 1 <= column_no <= self._cfg_max_no_columns:
             column_no = 1
-        return self._app_columns_cfg[str(column_no)][index]["parentID"]
+        return self._columns_cfg[column_no - 1][index].parent_id
 
     @parent_id.setter
     def parent_id(self, val: str, index=0, column_no=1):
         _val = val.translate(BAD_CHARS)
         if not 1 <= column_no <= self._cfg_max_no_columns:
             column_no = 1
-        self._app_columns_cfg[str(column_no)][index].parent_id = _val
+        self._columns_cfg[column_no - 1][index].parent_id = _val
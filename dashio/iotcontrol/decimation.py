@@ -0,0 +1,102 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def bucket_bounds(length: int, buckets: int) -> list[tuple[int, int]]:
+    """Split range(length) into buckets contiguous (start, end) ranges of near equal size."""
+    buckets = max(1, min(buckets, length))
+    return [(length * i // buckets, length * (i + 1) // buckets) for i in range(buckets)]
+
+
+def lttb(times: Sequence[float], values: Sequence[float], budget: int) -> list[int]:
+    """Largest Triangle Three Buckets downsampling.
+
+    Keeps the first and last points and, from each bucket in between, the point that makes the
+    largest triangle with the previously kept point and the average of the next bucket. This
+    keeps the peaks and troughs that give a line its shape.
+
+    Returns
+    -------
+    list[int]
+        Indices of the points to keep, in order.
+    """
+    length = len(values)
+    if budget >= length or length <= 2:
+        return list(range(length))
+    if budget < 3:
+        return [0, length - 1][:max(budget, 1)]
+    every = (length - 2) / (budget - 2)
+    kept = [0]
+    a_index = 0
+    for i in range(budget - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, length)
+        avg_len = avg_end - avg_start
+        avg_x = sum(times[avg_start:avg_end]) / avg_len
+        avg_y = sum(values[avg_start:avg_end]) / avg_len
+        a_x = times[a_index]
+        a_y = values[a_index]
+        max_area = -1.0
+        max_index = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((a_x - avg_x) * (values[j] - a_y) - (a_x - times[j]) * (avg_y - a_y))
+            if area > max_area:
+                max_area = area
+                max_index = j
+        kept.append(max_index)
+        a_index = max_index
+    kept.append(length - 1)
+    return kept
+
+
+def min_max(values: Sequence[float], budget: int) -> list[int]:
+    """Keep the minimum and maximum of each of budget // 2 buckets.
+
+    Used for step like data, such as BOOL lines, where every change within a bucket must show.
+
+    Returns
+    -------
+    list[int]
+        Indices of the points to keep, in order.
+    """
+    length = len(values)
+    if budget >= length:
+        return list(range(length))
+    kept = []
+    for start, end in bucket_bounds(length, max(budget // 2, 1)):
+        bucket = range(start, end)
+        low = min(bucket, key=values.__getitem__)
+        high = max(bucket, key=values.__getitem__)
+        kept.extend(sorted({low, high}))
+    return kept
+
+
+def stride(length: int, budget: int) -> list[int]:
+    """Evenly spaced indices, always including the last."""
+    if budget >= length:
+        return list(range(length))
+    return [end - 1 for _, end in bucket_bounds(length, budget)]
@@ -28,6 +28,9 @@ from .enums import Color, Icon, DeviceViewStyle
 
 class DeviceViewConfig(ControlConfig):
     """DeviceViewConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -170,6 +173,8 @@ class DeviceView(Control):
         A class method to instantiate a DeviceView object from a dictionary
     """
 
+    __slots__ = ('_state_str')
+
     def __init__(
         self,
         control_id,
@@ -193,7 +198,7 @@ class DeviceView(Control):
         column_no=1
     ):
         super().__init__("DVVW", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             DeviceViewConfig(
                 control_id,
                 title,
@@ -213,7 +218,8 @@ class DeviceView(Control):
                 num_grid_columns,
                 num_grid_rows,
                 user_tappable_color
-            )
+            ),
+            column_no
         )
         self._state_str = ""
 
@@ -30,6 +30,8 @@ from .enums import (Color, DialNumberPosition, DialStyle, Precision,
 class DialConfig(ControlConfig):
     """DialConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -95,13 +97,15 @@ class DialConfig(ControlConfig):
 class Dial(Control):
     """Dial Control"""
 
+    __slots__ = ('_dial_value', '_dial_min', '_dial_max', '_red_value')
+
     def add_config(self, config: DialConfig, column_no=1):
         if isinstance(config, DialConfig):
             config.cfg["min"] = self.dial_min
             config.cfg["max"] = self.dial_max
             config.cfg["redValue"] = self.red_value
             config.cfg["ControlID"] = self.control_id
-            self._app_columns_cfg[str(column_no)].append(config)
+            self._append_config(config, column_no)
 
     def __init__(
         self,
@@ -159,7 +163,7 @@ class Dial(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("DIAL", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             DialConfig(
                 control_id,
                 title,
@@ -175,7 +179,8 @@ class Dial(Control):
                 precision,
                 units,
                 control_position
-            )
+            ),
+            column_no
         )
         self._dial_value = 0
         self._dial_min = dial_min
@@ -30,6 +30,8 @@ from .enums import Color, DirectionStyle, Precision, TitlePosition
 class DirectionConfig(ControlConfig):
     """DirectionConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -80,11 +82,15 @@ class DirectionConfig(ControlConfig):
 class Direction(Control):
     """Direction control"""
 
+    __slots__ = ('_cal_angle', '_direction_value', '_direction_text')
+
+    continuous_rx = True
+
     def add_config(self, config: DirectionConfig, column_no=1):
         if isinstance(config, DirectionConfig):
             config.cfg["calAngle"] = self.cal_angle
             config.cfg["ControlID"] = self.control_id
-            self._app_columns_cfg[str(column_no)].append(config)
+            self._append_config(config, column_no)
 
     def __init__(
         self,
@@ -127,7 +133,7 @@ class Direction(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("DIR", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             DirectionConfig(
                 control_id,
                 title,
@@ -138,7 +144,8 @@ class Direction(Control):
                 precision,
                 calibration_angle,
                 control_position
-            )
+            ),
+            column_no
         )
         self._cal_angle = calibration_angle
         self._direction_value = 0
@@ -21,7 +21,7 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class ConnectionState(Enum):
@@ -33,6 +33,15 @@ class ConnectionState(Enum):
     DISCONNECTED = 2
 
 
+class MessagePriority(IntEnum):
+    """
+    Priority of a message sent from a Device to its connections. Lower values are sent first.
+    """
+    ALARM = 0
+    INTERACTIVE = 1
+    BULK = 2
+
+
 class ControlName(Enum):
     """
     All the control names
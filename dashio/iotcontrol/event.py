@@ -27,8 +27,13 @@ class Event:
     """
     Event class that call multiple functions/methods in a set
     """
+
+    # handlers is a tuple that is replaced, not changed, when handlers are added or removed. Events
+    # without handlers share the empty tuple, and fire can run while handlers are changed.
+    __slots__ = ('handlers',)
+
     def __init__(self):
-        self.handlers = set()
+        self.handlers = ()
 
     def handle(self, handler):
         """Add handler to set
@@ -43,7 +48,8 @@ class Event:
         Event
             Itself with the added handler
         """
-        self.handlers.add(handler)
+        if handler not in self.handlers:
+            self.handlers += (handler,)
         return self
 
     def unhandle(self, handler):
@@ -64,10 +70,9 @@ class Event:
         ValueError
             IF the handler isn't in the set
         """
-        try:
-            self.handlers.remove(handler)
-        except KeyError as not_in_set:
-            raise ValueError("Handler is not handling this event, so cannot unhandle it.") from not_in_set
+        if handler not in self.handlers:
+            raise ValueError("Handler is not handling this event, so cannot unhandle it.")
+        self.handlers = tuple(h for h in self.handlers if h != handler)
         return self
 
     def fire(self, *args, **kargs):
@@ -21,13 +21,16 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from __future__ import annotations
+
 import datetime
 import json
-import dateutil.parser
 from ..constants import BAD_CHARS
 from .control import Control, ControlPosition, ControlConfig, _get_title_position
-from .enums import Color, TitlePosition
+from .enums import Color, TitlePosition, MessagePriority
+from .event_log_store import EventLogStore
 from .ring_buffer import RingBuffer
+from .timestamps import datetime_to_epoch, iso_to_epoch
 from .event import Event
 
 
@@ -44,6 +47,7 @@ class EventData:
         color : Color, optional
             The color to display this data point on the **Dash** app, by default Color.WHITE
         """
+        self._json = None
         self.color = color
         self.timestamp = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
         self.event_lines = []
@@ -56,19 +60,40 @@ class EventData:
                 break
 
     def to_json(self):
-        """Convert to JSON
+        """Convert to JSON. The JSON is made once, so don't change the EventData after it has been logged.
 
         Returns
         -------
         str
             json representation
         """
-        event_dict = {
-            'time': self.timestamp.isoformat(),
-            'color': str(self.color.value),
-            'lines': self.event_lines
-        }
-        return json.dumps(event_dict)
+        if self._json is None:
+            event_dict = {
+                'time': self.timestamp.isoformat(),
+                'color': str(self.color.value),
+                'lines': self.event_lines
+            }
+            self._json = json.dumps(event_dict)
+        return self._json
+
+    @classmethod
+    def from_json(cls, json_str: str) -> EventData:
+        """Make an EventData from the JSON made by to_json.
+
+        Parameters
+        ----------
+        json_str : str
+            json representation
+
+        Returns
+        -------
+        EventData
+        """
+        event_dict = json.loads(json_str)
+        event = cls("\n".join(event_dict['lines']), Color(int(event_dict['color'])))
+        event.timestamp = datetime.datetime.fromisoformat(event_dict['time'])
+        event._json = json_str
+        return event
 
     def __str__(self):
         header = f"{self.timestamp.isoformat()}\t{str(self.color.value)}"
@@ -82,6 +107,16 @@ class EventLog(Control):
     """EventLog control
     """
 
+    __slots__ = ('log', 'store')
+
+    reply_priority = MessagePriority.BULK
+    # Long histories are sent as several lines so they can be split into frames.
+    HISTORY_ENTRIES_PER_LINE = 50
+
+    def _process_rx_message(self, data_array: list) -> str:
+        self._fire_rx(data_array)
+        return self._get_log_from_timestamp(data_array)
+
     def __init__(
         self,
         control_id: str,
@@ -89,7 +124,10 @@ class EventLog(Control):
         title_position=TitlePosition.BOTTOM,
         control_position=None,
         max_log_entries=100,
-        column_no=1
+        column_no=1,
+        storage_dir: str | None = None,
+        max_storage_bytes: int | None = None,
+        max_storage_age: int | None = None
     ):
         """An EventLog control
 
@@ -111,13 +149,23 @@ class EventLog(Control):
             The Dash App reports its screen size in columns. column_no allows you to specify which column no to load into.
             Each control can store three configs that define how the device looks for Dash apps installed on single column
             phones or 2 column fold out phones or 3 column tablets.
+        storage_dir : str, optional
+            Also keep the log in segment files in this directory, history requests are then
+            answered from the files so the log can be far longer than max_log_entries and
+            survives a restart, by default None
+        max_storage_bytes : int, optional
+            Remove the oldest segment files when the stored log is larger than this, by default None
+        max_storage_age : int, optional
+            Remove segment files with entries all older than this many seconds, by default None
         """
         super().__init__("LOG", control_id)
-        self._app_columns_cfg[str(column_no)].append(ControlConfig(control_id, title, control_position, title_position))
+        self._append_config(ControlConfig(control_id, title, control_position, title_position), column_no)
 
         self._message_rx_event = Event()
-        self._message_rx_event += self._get_log_from_timestamp
-        self.log = RingBuffer(max_log_entries)
+        self.log = RingBuffer(max_log_entries, timestamp_key=lambda event: datetime_to_epoch(event.timestamp))
+        self.store = None
+        if storage_dir is not None:
+            self.store = EventLogStore(storage_dir, max_bytes=max_storage_bytes, max_age=max_storage_age)
 
     @classmethod
     def from_cfg_dict(cls, cfg_dict: dict, column_no=1):
@@ -143,21 +191,25 @@ class EventLog(Control):
         return tmp_cls
 
     def _get_log_from_timestamp(self, msg):
-        data_str = ""
+        """Yields the log entries after the timestamp, HISTORY_ENTRIES_PER_LINE entries to a line."""
         try:
             dashboard_id = msg[3]
-            from_date = dateutil.parser.isoparse(msg[4])
+            from_epoch = iso_to_epoch(msg[4])
         except (IndexError, ValueError):
-            return ""
-        data_str += self._control_hdr_str + dashboard_id
-        has_data = False
-        for log in self.log.get():
-            if log.timestamp > from_date:
-                data_str += "\t" + log.to_json()
-                has_data = True
-        if has_data:
-            data_str += "\n"
-        return data_str
+            return
+        header = self._control_hdr_str + dashboard_id
+        if self.store is not None:
+            history = self.store.since(from_epoch)
+        else:
+            history = (log.to_json() for log in self.log.since(from_epoch))
+        entries = []
+        for entry in history:
+            entries.append(entry)
+            if len(entries) >= self.HISTORY_ENTRIES_PER_LINE:
+                yield header + "\t" + "\t".join(entries) + "\n"
+                entries = []
+        if entries:
+            yield header + "\t" + "\t".join(entries) + "\n"
 
     def add_event_data(self, data: EventData):
         """Add a data point to the log and send it to any connected **Dash** app
@@ -169,7 +221,13 @@ class EventLog(Control):
         """
         if isinstance(data, EventData):
             self.log.append(data)
-            self.state_str = self._control_hdr_str + str(data)
+            # Make the JSON now so history requests don't have to.
+            if self.store is not None:
+                self.store.append(datetime_to_epoch(data.timestamp), data.to_json())
+            else:
+                data.to_json()
+            if self.has_consumers:
+                self.state_str = self._control_hdr_str + str(data)
 
     def send_event(self, event: EventData):
         """Send event.
@@ -184,5 +242,15 @@ class EventLog(Control):
     def send_latest_data(self):
         """Send the latest log entry to any connected **Dash** app.
         """
+        if not self.has_consumers:
+            return
         if self.log:
             self.state_str = self._control_hdr_str + str(self.log.get_latest())
+        elif self.store is not None and self.store.latest() is not None:
+            # Nothing logged since a restart, use the newest stored entry.
+            self.state_str = self._control_hdr_str + str(EventData.from_json(self.store.latest()))
+
+    def close(self):
+        """Close the storage files of a log made with a storage_dir."""
+        if self.store is not None:
+            self.store.close()
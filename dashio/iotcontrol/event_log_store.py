@@ -0,0 +1,248 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+from array import array
+from bisect import bisect_right
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".log"
+_SEGMENT_NAME = re.compile(r"^(\d{10})\.log$")
+
+
+class _Segment:
+    """One append only segment file and its sparse index."""
+
+    __slots__ = ('seq', 'path', 'size', 'entries', 'first_epoch', 'last_epoch', 'index_epochs', 'index_offsets')
+
+    def __init__(self, seq: int, path: str):
+        self.seq = seq
+        self.path = path
+        self.size = 0
+        self.entries = 0
+        self.first_epoch = None
+        self.last_epoch = None
+        self.index_epochs = array('q')
+        self.index_offsets = array('q')
+
+
+class EventLogStore:
+    """An append only log of time stamped text kept in segment files on disk.
+
+    Each entry is written once, as an epoch seconds prefix and the text, so the text is never
+    made again when it is read back. Every index_every entries the epoch and file offset are
+    kept in a sparse index, so since() seeks close to the first wanted entry and only reads from
+    there. When a segment reaches segment_bytes a new one is started and the oldest segments are
+    removed to keep within max_bytes and max_age.
+    """
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 1 << 20,
+        max_bytes: int | None = None,
+        max_age: int | None = None,
+        index_every: int = 32
+    ):
+        """An append only log of time stamped text kept in segment files on disk.
+
+        Parameters
+        ----------
+        directory : str
+            Where to keep the segment files, it is created if needed. Existing segments are
+            loaded so the log carries on after a restart.
+        segment_bytes : int, optional
+            Start a new segment when the current one reaches this size, by default 1MB
+        max_bytes : int, optional
+            Remove the oldest segments when the log is larger than this, by default None
+        max_age : int, optional
+            Remove segments whose newest entry is more than max_age seconds older than the newest
+            entry in the log, by default None
+        index_every : int, optional
+            How many entries between sparse index points, by default 32
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.index_every = max(int(index_every), 1)
+        self._segments: list[_Segment] = []
+        self._file = None
+        self._latest = None
+        self._monotonic = True
+        os.makedirs(directory, exist_ok=True)
+        for name in sorted(os.listdir(directory)):
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                self._load_segment(_Segment(int(match.group(1)), os.path.join(directory, name)))
+        self._apply_retention()
+
+    def _add_to_index(self, segment: _Segment, epoch: int, offset: int):
+        if segment.entries % self.index_every == 0:
+            segment.index_epochs.append(epoch)
+            segment.index_offsets.append(offset)
+        if segment.first_epoch is None:
+            segment.first_epoch = epoch
+        previous = segment.last_epoch if segment.last_epoch is not None else self._last_epoch()
+        if previous is not None and epoch < previous:
+            self._monotonic = False
+        segment.last_epoch = epoch
+        segment.entries += 1
+
+    def _last_epoch(self) -> int | None:
+        for segment in reversed(self._segments):
+            if segment.last_epoch is not None:
+                return segment.last_epoch
+        return None
+
+    def _load_segment(self, segment: _Segment):
+        offset = 0
+        with open(segment.path, 'rb') as infile:
+            for record in infile:
+                if not record.endswith(b"\n"):
+                    break
+                epoch, _, text = record.partition(b"\t")
+                try:
+                    self._add_to_index(segment, int(epoch), offset)
+                except ValueError:
+                    break
+                self._latest = text
+                offset += len(record)
+        if offset != os.path.getsize(segment.path):
+            # The last write was cut short, drop it so the next entry starts on a new line.
+            logger.debug("Truncating partial entry in %s", segment.path)
+            os.truncate(segment.path, offset)
+        segment.size = offset
+        self._segments.append(segment)
+
+    def _roll(self):
+        if self._file is not None:
+            self._file.close()
+        seq = self._segments[-1].seq + 1 if self._segments else 1
+        segment = _Segment(seq, os.path.join(self.directory, f"{seq:010d}{SEGMENT_SUFFIX}"))
+        self._segments.append(segment)
+        self._file = open(segment.path, 'ab')
+        self._apply_retention()
+
+    def _apply_retention(self):
+        newest = self._last_epoch()
+        total = sum(segment.size for segment in self._segments)
+        # The segment being written to is never removed.
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            too_big = self.max_bytes is not None and total > self.max_bytes
+            too_old = (
+                self.max_age is not None and newest is not None and oldest.last_epoch is not None
+                and oldest.last_epoch < newest - self.max_age
+            )
+            if not (too_big or too_old):
+                break
+            total -= oldest.size
+            self._segments.pop(0)
+            try:
+                os.remove(oldest.path)
+            except OSError as err:
+                logger.debug("Unable to remove %s: %s", oldest.path, err)
+
+    def append(self, epoch: int, text: str):
+        """Append an entry. text must not contain a newline.
+
+        Parameters
+        ----------
+        epoch : int
+            The time of the entry in epoch seconds.
+        text : str
+            The entry, stored and returned as is.
+        """
+        if self._file is None:
+            if self._segments and self._segments[-1].size < self.segment_bytes:
+                self._file = open(self._segments[-1].path, 'ab')
+            else:
+                self._roll()
+        elif self._segments[-1].size >= self.segment_bytes:
+            self._roll()
+        segment = self._segments[-1]
+        record = f"{epoch}\t{text}\n".encode()
+        self._file.write(record)
+        self._file.flush()
+        self._add_to_index(segment, epoch, segment.size)
+        segment.size += len(record)
+        self._latest = record.partition(b"\t")[2]
+
+    def since(self, epoch: int):
+        """Yields the text of the entries after epoch, oldest to newest.
+
+        Only the segments, and the part of the first segment, that can hold later entries are read.
+        If entries were appended out of time order every segment is read.
+
+        Parameters
+        ----------
+        epoch : int
+            Epoch seconds.
+        """
+        segments = list(self._segments)
+        first = 0
+        if self._monotonic:
+            last_epochs = [segment.last_epoch if segment.last_epoch is not None else epoch + 1 for segment in segments]
+            first = bisect_right(last_epochs, epoch)
+        for i, segment in enumerate(segments[first:]):
+            offset = 0
+            if self._monotonic and i == 0:
+                point = bisect_right(segment.index_epochs, epoch) - 1
+                if point >= 0:
+                    offset = segment.index_offsets[point]
+            end = segment.size
+            try:
+                infile = open(segment.path, 'rb')
+            except OSError:
+                # Removed by retention while being read.
+                continue
+            with infile:
+                infile.seek(offset)
+                while offset < end:
+                    record = infile.readline()
+                    if not record.endswith(b"\n"):
+                        break
+                    offset += len(record)
+                    entry_epoch, _, text = record.partition(b"\t")
+                    if int(entry_epoch) > epoch:
+                        yield text[:-1].decode()
+
+    def latest(self) -> str | None:
+        """The text of the newest entry, or None if the log is empty."""
+        if self._latest is None:
+            return None
+        return self._latest.rstrip(b"\n").decode()
+
+    def __len__(self) -> int:
+        return sum(segment.entries for segment in self._segments)
+
+    def close(self):
+        """Close the segment being written to."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -29,6 +29,8 @@ from .enums import Color, KnobStyle, TitlePosition, DialMode
 class KnobConfig(ControlConfig):
     """KnobConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -92,13 +94,17 @@ class Knob(Control):
     """A Knob control
     """
 
+    __slots__ = ('_control_id_dial', '_knob_value', '_knob_dial_value', '_state_str_knob', '_state_str_dial', '_knob_dial_state_str', '_dial_min', '_dial_max', '_red_value')
+
+    continuous_rx = True
+
     def add_config_columnar(self, config: KnobConfig, column_no=1):
         if isinstance(config, KnobConfig):
             config.cfg["min"] = self.dial_min
             config.cfg["max"] = self.dial_max
             config.cfg["redValue"] = self.red_value
             config.cfg["ControlID"] = self.control_id
-            self._app_columns_cfg[str(column_no)].append(config)
+            self._append_config(config, column_no)
 
     def __init__(
         self,
@@ -153,7 +159,7 @@ class Knob(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("KNOB", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             KnobConfig(
                 control_id,
                 title,
@@ -168,7 +174,8 @@ class Knob(Control):
                 dial_color,
                 knob_color,
                 control_position
-            )
+            ),
+            column_no
         )
 
         self._control_id_dial = f"\t{{device_id}}\tKBDL\t{control_id}\t"
@@ -197,15 +204,15 @@ class Knob(Control):
         self._is_active = active
         if active:
             self._state_str_knob = self._control_hdr_str + f"{self._knob_value}\n"
-            self._message_tx_event(self._state_str_knob)
+            self.state_str = self._state_str_knob
             self._state_str_dial = self._control_id_dial + f"{self._knob_dial_value}\n"
-            self._message_tx_event(self._state_str_dial)
+            self.state_str = self._state_str_dial
             self._knob_dial_state_str = self._state_str_knob + self._state_str_dial
         else:
             self._state_str_knob = self._control_hdr_str + "na\n"
-            self._message_tx_event(self._state_str_knob)
+            self.state_str = self._state_str_knob
             self._state_str_dial = self._control_id_dial + "na\n"
-            self._message_tx_event(self._state_str_dial)
+            self.state_str = self._state_str_dial
             self._knob_dial_state_str = self._state_str_knob + self._state_str_dial
 
     @property
@@ -255,6 +262,10 @@ class Knob(Control):
         tmp_cls.parent_id = cfg_dict["parentID"]
         return tmp_cls
 
+    def _transmit_key(self, message: str) -> str:
+        # The KNOB and KBDL messages are filtered and paced on their own.
+        return message.split('\t', 3)[2]
+
     def get_state(self):
         return self._knob_dial_state_str
 
@@ -275,9 +286,9 @@ class Knob(Control):
         if not self._is_active:
             self._is_active = True
             self._state_str_dial = self._control_id_dial + f"{self._knob_dial_value}\n"
-            self._message_tx_event(self._state_str_dial)
+            self.state_str = self._state_str_dial
         self._state_str_knob = self._control_hdr_str + f"{self._knob_value}\n"
-        self._message_tx_event(self._state_str_knob)
+        self.state_str = self._state_str_knob
         self._knob_dial_state_str = self._state_str_knob + self._state_str_dial
 
     @property
@@ -297,7 +308,7 @@ class Knob(Control):
         if not self._is_active:
             self._is_active = True
             self._state_str_knob = self._control_hdr_str + f"{self._knob_value}\n"
-            self._message_tx_event(self._state_str_knob)
+            self.state_str = self._state_str_knob
         self._state_str_dial = self._control_id_dial + f"{self._knob_dial_value}\n"
-        self._message_tx_event(self._state_str_dial)
+        self.state_str = self._state_str_dial
         self._knob_dial_state_str = self._state_str_knob + self._state_str_dial
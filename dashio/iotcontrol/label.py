@@ -28,6 +28,9 @@ from .enums import Color, LabelStyle, TitlePosition
 
 class LabelConfig(ControlConfig):
     """LabelConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -69,6 +72,8 @@ class LabelConfig(ControlConfig):
 class Label(Control):
     """A Config only control"""
 
+    __slots__ = ('_state_str')
+
     def __init__(
         self,
         control_id: str,
@@ -109,7 +114,7 @@ class Label(Control):
             style,
             control_position
         )
-        self._app_columns_cfg[str(column_no)].append(control_config)
+        self._append_config(control_config, column_no)
         self._state_str = ""
 
     @classmethod
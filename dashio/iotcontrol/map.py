@@ -21,14 +21,49 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from __future__ import annotations
+
 import datetime
 import json
-from dateutil import parser
+import math
 
 from ..constants import BAD_CHARS
 from .control import Control, ControlPosition, ControlConfig, _get_title_position
-from .enums import TitlePosition, Color
+from .enums import TitlePosition, Color, MessagePriority
 from .event import Event
+from .ring_buffer import RingBuffer
+from .timestamps import epoch_to_iso, iso_to_epoch, to_epoch
+
+EARTH_RADIUS = 6371000.0
+# Most fixes dropped in a row when simplifying a track, bounds the work done per fix.
+MAX_DROPPED_FIXES = 100
+
+
+def _coordinate(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _offset_from_line(point: tuple, start: tuple, end: tuple) -> float:
+    """The distance in metres of point from the line from start to end, all (latitude, longitude)."""
+    scale = math.cos(math.radians(start[0]))
+
+    def _xy(coords):
+        return (
+            math.radians(coords[1] - start[1]) * scale * EARTH_RADIUS,
+            math.radians(coords[0] - start[0]) * EARTH_RADIUS
+        )
+    p_x, p_y = _xy(point)
+    e_x, e_y = _xy(end)
+    length = e_x * e_x + e_y * e_y
+    fraction = 0.0 if length == 0 else min(max((p_x * e_x + p_y * e_y) / length, 0.0), 1.0)
+    return math.hypot(p_x - fraction * e_x, p_y - fraction * e_y)
+
+
+def _location_epoch(location: MapLocation) -> int:
+    return location.epoch
 
 
 class MapLocation:
@@ -36,7 +71,9 @@ class MapLocation:
     A json version of a map location.
     """
 
-    def __init__(self, latitude: str, longitude: str, average_speed=None, peak_speed=None, course=None, altitude=None, distance=None):
+    __slots__ = ('epoch', 'latitude', 'longitude', 'average_speed', 'peak_speed', 'course', 'altitude', 'distance', '_json')
+
+    def __init__(self, latitude: str, longitude: str, average_speed=None, peak_speed=None, course=None, altitude=None, distance=None, timestamp=None):
         """MapLocation
 
         Parameters
@@ -55,55 +92,103 @@ class MapLocation:
             altitude, by default None
         distance : str, optional
             distance, by default None
+        timestamp : datetime, int, float, or str, optional
+            The time of the fix as a datetime, epoch seconds, or ISO 8601 string, by default the current time
         """
-        self.timestamp = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
-        self._map_loc = {}
-        self._map_loc["time"] = self.timestamp.isoformat()
-        self._map_loc["latitude"] = latitude.translate(BAD_CHARS)
-        self._map_loc["longitude"] = longitude.translate(BAD_CHARS)
-        if average_speed:
-            self._map_loc["avgeSpeed"] = average_speed
-        if peak_speed:
-            self._map_loc["peakSpeed"] = peak_speed
-        if course:
-            self._map_loc["course"] = course
-        if altitude:
-            self._map_loc["altitude"] = altitude
-        if distance:
-            self._map_loc["distance"] = distance
+        self.epoch = to_epoch(timestamp)
+        self.latitude = latitude.translate(BAD_CHARS)
+        self.longitude = longitude.translate(BAD_CHARS)
+        self.average_speed = average_speed
+        self.peak_speed = peak_speed
+        self.course = course
+        self.altitude = altitude
+        self.distance = distance
+        self._json = None
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        """The time of the fix"""
+        return datetime.datetime.fromtimestamp(self.epoch, datetime.timezone.utc)
 
     def to_json(self):
-        """Make a json representation of a map point.
+        """Make a json representation of a map point. It is made once and reused.
 
         Returns
         -------
         str
         """
-        return json.dumps(self._map_loc)
+        if self._json is None:
+            map_loc = {"time": epoch_to_iso(self.epoch), "latitude": self.latitude, "longitude": self.longitude}
+            if self.average_speed:
+                map_loc["avgeSpeed"] = self.average_speed
+            if self.peak_speed:
+                map_loc["peakSpeed"] = self.peak_speed
+            if self.course:
+                map_loc["course"] = self.course
+            if self.altitude:
+                map_loc["altitude"] = self.altitude
+            if self.distance:
+                map_loc["distance"] = self.distance
+            self._json = json.dumps(map_loc)
+        return self._json
 
     def get_simple_format(self):
         """Returns the simple format of the MAP Location
 
         Returns
         -------
-        _type_
-            _description_
+        str
+            The location as "\tlatitude,longitude\n"
         """
-        lat = self._map_loc["latitude"]
-        long = self._map_loc["longitude"]
-        return f"\t{lat},{long}\n"
+        return f"\t{self.latitude},{self.longitude}\n"
 
 
 class MapTrack:
     """A Map track
     """
 
-    def __init__(self, track_id: str, text="", color=Color.RED) -> None:
+    def __init__(self, track_id: str, text="", color=Color.RED, max_points=1000, max_age=None, tolerance=0.0) -> None:
+        """A Map track
+
+        Parameters
+        ----------
+        track_id : str
+            The track identity.
+        text : str, optional
+            Text for the track, by default ""
+        color : Color, optional
+            The color of the track, by default Color.RED
+        max_points : int, optional
+            The locations are stored in a ring buffer this sets its size, by default 1000
+        max_age : int, optional
+            Only keep locations up to this many seconds older than the newest, by default None
+        tolerance : float, optional
+            Drop fixes that are within this many metres of the straight line between the fixes
+            either side of them, so a track along a road doesn't store every fix. By default 0.0,
+            which keeps every fix.
+        """
         self.track_id = track_id.translate(BAD_CHARS)
         self.text = text.translate(BAD_CHARS)
         self.color = color
         self.track_start_time = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
-        self.locations = []
+        self.max_age = max_age
+        self.tolerance = tolerance
+        self.locations = RingBuffer(max_points, timestamp_key=_location_epoch)
+        # (latitude, longitude) of the fixes dropped since the last one that was kept.
+        self._dropped = []
+
+    def _can_drop_latest(self, location: MapLocation) -> bool:
+        if not self.tolerance or len(self.locations) < 2 or len(self._dropped) >= MAX_DROPPED_FIXES:
+            return False
+        view = self.locations.view()
+        points = []
+        for loc in (view[-2], view[-1], location):
+            lat, lon = _coordinate(loc.latitude), _coordinate(loc.longitude)
+            if lat is None or lon is None:
+                return False
+            points.append((lat, lon))
+        anchor, latest, new = points
+        return all(_offset_from_line(point, anchor, new) <= self.tolerance for point in self._dropped + [latest])
 
     def add_location(self, location: MapLocation) -> None:
         """Add a location to the Track
@@ -113,21 +198,54 @@ class MapTrack:
         location : MapLocation
             The Map location to add to the track.
         """
-        if isinstance(location, MapLocation):
+        if not isinstance(location, MapLocation):
+            return
+        if self._can_drop_latest(location):
+            # The new fix takes the place of the latest one, which is on the line to it.
+            latest = self.locations.get_latest()
+            self._dropped.append((_coordinate(latest.latitude), _coordinate(latest.longitude)))
+            self.locations.replace_latest(location)
+        else:
+            self._dropped = []
             self.locations.append(location)
+        if self.max_age is not None:
+            # Dropping copies the kept fixes, so wait for an eighth of the track to be too old.
+            self.locations.drop_until(
+                self.locations.get_latest().epoch - self.max_age,
+                min_items=len(self.locations) // 8
+            )
+
+    def get_locations(self, from_epoch: int | None = None):
+        """Returns the stored locations after from_epoch, oldest to newest, limited by max_age.
 
-    def get_track(self) -> str:
+        Parameters
+        ----------
+        from_epoch : int, optional
+            Epoch seconds, by default all the stored locations
+        """
+        if self.locations.empty():
+            return []
+        if from_epoch is None:
+            from_epoch = -1
+        if self.max_age is not None:
+            from_epoch = max(from_epoch, self.locations.get_latest().epoch - self.max_age)
+        return self.locations.since(from_epoch)
+
+    def get_track(self, from_epoch: int | None = None) -> str:
         """Returns the track in DashIO long format
 
+        Parameters
+        ----------
+        from_epoch : int, optional
+            Only include the locations after this time in epoch seconds, by default all of them
+
         Returns
         -------
         str
             track in DashIO long format
         """
         reply = f"\t{self.track_id}\t{self.text}\t{self.color.value}"
-        for loc in self.locations:
-            reply += f"\t{loc.map_to_json()}"
-        return reply
+        return reply + "".join("\t" + loc.to_json() for loc in self.get_locations(from_epoch))
 
     def get_last_location(self) -> str:
         """Returns the last track location in short format
@@ -137,7 +255,7 @@ class MapTrack:
         str
             The last location in track in short format
         """
-        reply = f"{self.track_id}" + self.locations[-1].get_simple_format()
+        reply = f"{self.track_id}" + self.locations.get_latest().get_simple_format()
         return reply
 
 
@@ -145,13 +263,24 @@ class Map(Control):
     """A Map control
     """
 
+    __slots__ = ('tracks', 'max_track_points', 'max_track_age', 'track_tolerance')
+
+    reply_priority = MessagePriority.BULK
+
+    def _process_rx_message(self, data_array: list) -> str:
+        self._fire_rx(data_array)
+        return self._get_tracks_from_timestamp(data_array)
+
     def __init__(
         self,
         control_id,
         title="A Map",
         title_position=TitlePosition.BOTTOM,
         control_position=None,
-        column_no=1
+        column_no=1,
+        max_track_points=1000,
+        max_track_age=None,
+        track_tolerance=0.0
     ):
         """A Map control
 
@@ -169,13 +298,21 @@ class Map(Control):
             The Dash App reports its screen size in columns. column_no allows you to specify which column no to load into.
             Each control can store three configs that define how the device looks for Dash apps installed on single column
             phones or 2 column fold out phones or 3 column tablets.
+        max_track_points : int, optional
+            max_points for tracks made by add_location_to_track, by default 1000
+        max_track_age : int, optional
+            max_age for tracks made by add_location_to_track, by default None
+        track_tolerance : float, optional
+            tolerance in metres for tracks made by add_location_to_track, by default 0.0
         """
         super().__init__("MAP", control_id)
-        self._app_columns_cfg[str(column_no)].append(ControlConfig(control_id, title, control_position, title_position))
+        self._append_config(ControlConfig(control_id, title, control_position, title_position), column_no)
         self.tracks = {}
+        self.max_track_points = max_track_points
+        self.max_track_age = max_track_age
+        self.track_tolerance = track_tolerance
 
         self._message_rx_event = Event()
-        self._message_rx_event += self._get_tracks_from_timestamp
 
     @classmethod
     def from_cfg_dict(cls, cfg_dict: dict, column_no=1):
@@ -201,17 +338,26 @@ class Map(Control):
         return tmp_cls
 
     def _get_tracks_from_timestamp(self, msg):
-        reply = ""
+        """Yields the locations of each track after the timestamp, one track to a line."""
         try:
             dashboard_id = msg[3]
-            from_timestamp = parser.isoparse(msg[4])
-        except IndexError:
-            return ""
-        if self.tracks:
-            for _, value in self.tracks:
-                if value.track_start_time > from_timestamp:
-                    reply += self._control_hdr_str + dashboard_id + value.get_track() + "\n"
-        return reply
+            from_epoch = iso_to_epoch(msg[4])
+        except (IndexError, ValueError):
+            return
+        for track in list(self.tracks.values()):
+            if track.get_locations(from_epoch):
+                yield self._control_hdr_str + dashboard_id + track.get_track(from_epoch) + "\n"
+
+    def add_track(self, track: MapTrack) -> None:
+        """Add a track to the map, use this to set the text, color, or storage of a track.
+
+        Parameters
+        ----------
+        track : MapTrack
+            The track to add, it replaces any track with the same track_id.
+        """
+        if isinstance(track, MapTrack):
+            self.tracks[track.track_id] = track
 
     def add_location_to_track(self, location: MapLocation, track_id: str) -> None:
         """Add Location to the map
@@ -222,16 +368,26 @@ class Map(Control):
             The location to add to the map
         track_id : Track ID for the location.
         """
-        if track_id in self.tracks:
-            self.tracks[track_id].add_location(location)
-        else:
-            self.tracks[track_id] = MapTrack("track_id")
-            self.tracks[track_id].add_location(location)
+        track_id = track_id.translate(BAD_CHARS)
+        if track_id not in self.tracks:
+            self.tracks[track_id] = MapTrack(
+                track_id,
+                max_points=self.max_track_points,
+                max_age=self.max_track_age,
+                tolerance=self.track_tolerance
+            )
+        self.tracks[track_id].add_location(location)
         self.send_location(location, track_id)
 
+    def _transmit_key(self, message: str) -> str:
+        # Each track is filtered and paced on its own.
+        return message[len(self._control_hdr_str):].split('\t', 1)[0]
+
     def send_location(self, location: MapLocation, track_id: str = ""):
         """Sends the locations to the map
         """
+        if not self.has_consumers:
+            return
         state_str = ""
-        state_str += self._control_hdr_str + track_id + location.get_simple_format()
+        state_str += self._control_hdr_str + track_id.translate(BAD_CHARS) + location.get_simple_format()
         self.state_str = state_str
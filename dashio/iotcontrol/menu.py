@@ -33,6 +33,9 @@ from .textbox import TextBox
 
 class MenuConfig(ControlConfig):
     """MenuConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -78,6 +81,8 @@ class Menu(Control):
     """A Menu Control
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -111,7 +116,7 @@ class Menu(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("MENU", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             MenuConfig(
                 control_id,
                 title,
@@ -120,7 +125,8 @@ class Menu(Control):
                 style,
                 icon_name,
                 control_position
-            )
+            ),
+            column_no
         )
 
     @classmethod
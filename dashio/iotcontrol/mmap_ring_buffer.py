@@ -0,0 +1,313 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import sys
+import threading
+from bisect import bisect_right
+from typing import Callable
+
+from .ring_buffer import RingBufferView
+
+MAGIC = b'DIOR'
+VERSION = 2
+HEADER_SIZE = 64
+
+# Header slots, each an int64 so they are written in one store.
+_CAPACITY = 1
+_WRITTEN = 2
+_COUNT = 3
+
+# Value kinds kept in the kinds column.
+_FLOAT = 0
+_INT = 1
+_BOOL = 2
+_BREAK = 3
+
+BREAK_VALUE = "B"
+
+
+def _encode(value) -> tuple[int, float]:
+    if isinstance(value, bool):
+        return _BOOL, float(value)
+    if isinstance(value, int):
+        return _INT, float(value)
+    if isinstance(value, float):
+        return _FLOAT, value
+    if isinstance(value, str):
+        if value == BREAK_VALUE:
+            return _BREAK, 0.0
+        try:
+            return _FLOAT, float(value)
+        except ValueError:
+            pass
+    raise TypeError(f"MmapRingBuffer can't store {value!r}, only numbers, bools, and breaks")
+
+
+def _decode(kind: int, value: float):
+    if kind == _INT:
+        return int(value)
+    if kind == _BOOL:
+        return bool(value)
+    if kind == _BREAK:
+        return BREAK_VALUE
+    return value
+
+
+class _Items:
+    """Makes items from the columns on demand so a RingBufferView can be used over the file."""
+
+    __slots__ = ('_buffer',)
+
+    def __init__(self, buffer: MmapRingBuffer):
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return self._buffer._slots
+
+    def __getitem__(self, index: int):
+        buffer = self._buffer
+        return buffer._from_record(buffer._timestamps[index], _decode(buffer._kinds[index], buffer._values[index]))
+
+
+class MmapRingBuffer:
+    """A ring buffer of time stamped values kept in a memory mapped file.
+
+    The file holds a small header and three fixed size columns, int64 timestamps, float64 values,
+    and a byte for the type of each value. Items are only made when they are read, so a buffer of
+    days of history doesn't take up heap, and reopening the file on restart gives the history
+    back straight away.
+
+    The file has one more slot than size_max, and the next record always goes in the spare one.
+    A record is written before the header is updated to include it, and each header field is a
+    single int64 store, so a crash never leaves a half written or out of place record visible.
+
+    Without a path the same columns are kept in anonymous memory, a compact in memory buffer
+    for values that don't need to outlast the process.
+    """
+    def __init__(
+        self,
+        path: str | None,
+        size_max: int,
+        to_record: Callable[[object], tuple[int, object]],
+        from_record: Callable[[int, object], object]
+    ):
+        """A ring buffer of time stamped values kept in a memory mapped file.
+
+        Parameters
+        ----------
+        path : str or None
+            The file to keep the buffer in. It is created if it doesn't exist. None keeps the
+            buffer in memory.
+        size_max : int
+            The number of items to keep. An existing file must have been made with the same size.
+        to_record : Callable
+            Returns the (epoch seconds, value) of an item. Values can be int, float, bool, or "B" for a break.
+        from_record : Callable
+            Makes an item from epoch seconds and a value.
+
+        Raises
+        ------
+        ValueError
+            If the file isn't a ring buffer file or was made with a different size_max.
+        """
+        self.max = size_max
+        self._slots = size_max + 1
+        self.path = path
+        self._to_record = to_record
+        self._from_record = from_record
+        slots = self._slots
+        file_size = HEADER_SIZE + 17 * slots
+        if path is None:
+            self._fd = None
+            existing = 0
+            self._mm = mmap.mmap(-1, file_size)
+        else:
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                existing = os.fstat(self._fd).st_size
+                if existing == 0:
+                    os.ftruncate(self._fd, file_size)
+                self._mm = mmap.mmap(self._fd, 0)
+            except (OSError, ValueError):
+                os.close(self._fd)
+                raise
+        header = memoryview(self._mm)[:HEADER_SIZE]
+        byte_order = 1 if sys.byteorder == 'little' else 2
+        if existing == 0:
+            header[0:4] = MAGIC
+            header[4:6] = VERSION.to_bytes(2, sys.byteorder)
+            header[6:8] = byte_order.to_bytes(2, sys.byteorder)
+        error = None
+        self._header = header.cast('q')
+        if existing == 0:
+            self._header[_CAPACITY] = size_max
+        elif bytes(header[0:4]) != MAGIC or int.from_bytes(header[6:8], sys.byteorder) != byte_order:
+            error = f"{path} is not a ring buffer file for this machine"
+        elif int.from_bytes(header[4:6], sys.byteorder) != VERSION:
+            error = f"{path} was made by a different version of MmapRingBuffer"
+        elif self._header[_CAPACITY] != size_max or existing != file_size:
+            error = f"{path} was made with size_max={self._header[_CAPACITY]}"
+        header.release()
+        if error:
+            self.close()
+            raise ValueError(error)
+        columns = memoryview(self._mm)
+        self._timestamps = columns[HEADER_SIZE:HEADER_SIZE + 8 * slots].cast('q')
+        self._values = columns[HEADER_SIZE + 8 * slots:HEADER_SIZE + 16 * slots].cast('d')
+        self._kinds = columns[HEADER_SIZE + 16 * slots:file_size]
+        columns.release()
+        self._items = _Items(self)
+        # Appends can come from user threads while the Device thread streams a reply.
+        self._lock = threading.Lock()
+        # The timestamps are in order once _WRITTEN reaches this. Worked out from the file rather
+        # than stored in it, so a clock step back doesn't slow since() down for good.
+        self._ordered_from = 0
+        timestamps = self._ordered_timestamps()
+        for i in range(len(timestamps) - 1, 0, -1):
+            if timestamps[i] < timestamps[i - 1]:
+                # Ordered again once the item before the step back is overwritten.
+                self._ordered_from = self._header[_WRITTEN] + self.max - len(timestamps) + i
+                break
+
+    @property
+    def count(self) -> int:
+        """Total number of appends, kept in the file so it carries on after a restart."""
+        return self._header[_COUNT]
+
+    @count.setter
+    def count(self, val: int):
+        self._header[_COUNT] = val
+
+    @property
+    def cur(self) -> int:
+        """The slot the next item is written to."""
+        return self._header[_WRITTEN] % self._slots
+
+    def _start(self) -> int:
+        return (self._header[_WRITTEN] - len(self)) % self._slots
+
+    def _ordered_timestamps(self) -> RingBufferView:
+        return RingBufferView(self._timestamps, self._start(), len(self))
+
+    def _write(self, slot: int, item) -> int:
+        timestamp, value = self._to_record(item)
+        kind, number = _encode(value)
+        self._timestamps[slot] = timestamp
+        self._values[slot] = number
+        self._kinds[slot] = kind
+        return timestamp
+
+    def _latest_timestamp(self) -> int | None:
+        if not self._header[_WRITTEN]:
+            return None
+        return self._timestamps[(self._header[_WRITTEN] - 1) % self._slots]
+
+    def _append(self, val, previous: int | None) -> int:
+        # Write the record into the spare slot, then make it visible, which drops the oldest.
+        timestamp = self._write(self.cur, val)
+        self._header[_WRITTEN] += 1
+        self._header[_COUNT] += 1
+        if previous is not None and timestamp < previous:
+            self._ordered_from = self._header[_WRITTEN] + self.max
+        return timestamp
+
+    def append(self, val):
+        """Append an item, overwriting the oldest one when the buffer is full."""
+        with self._lock:
+            self._append(val, self._latest_timestamp())
+
+    def extend(self, vals):
+        """Append many items. Only the newest size_max are written."""
+        vals = list(vals)
+        if not vals:
+            return
+        with self._lock:
+            kept = vals[-self.max:]
+            self._header[_COUNT] += len(vals) - len(kept)
+            previous = self._latest_timestamp()
+            for val in kept:
+                previous = self._append(val, previous)
+
+    def get_latest(self):
+        """Get the last item in the buffer"""
+        return self._items[(self._header[_WRITTEN] - 1) % self._slots]
+
+    def empty(self) -> bool:
+        """Returns if empty"""
+        return not self._header[_WRITTEN]
+
+    def __len__(self) -> int:
+        return min(self._header[_WRITTEN], self.max)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def get(self) -> list:
+        """Return a list of items from the oldest to the newest."""
+        return list(self.view())
+
+    def view(self) -> RingBufferView:
+        """Returns an ordered view, oldest to newest, that reads items from the file as they are used."""
+        return RingBufferView(self._items, self._start(), len(self))
+
+    def since(self, timestamp: int) -> list:
+        """Returns a list of the items with a timestamp after timestamp, oldest to newest.
+
+        The timestamp column is searched in place with a binary search, or scanned if items
+        appended out of time order are still stored. Only the returned items are read from the
+        file, and the list stays valid while other threads append.
+
+        Parameters
+        ----------
+        timestamp : int
+            Epoch seconds.
+        """
+        with self._lock:
+            timestamps = self._ordered_timestamps()
+            if self._header[_WRITTEN] < self._ordered_from:
+                return [item for item, item_time in zip(self.view(), timestamps) if item_time > timestamp]
+            return list(self.view().tail(bisect_right(timestamps, timestamp)))
+
+    def flush(self):
+        """Write changes to disk. Changes survive the process exiting without this, flush guards
+        against the machine losing power."""
+        if self._fd is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Flush and close the file. The buffer can't be used after this."""
+        if self._mm.closed:
+            return
+        for attr in ('_timestamps', '_values', '_kinds', '_header'):
+            column = getattr(self, attr, None)
+            if column is not None:
+                column.release()
+        if self._fd is not None:
+            self._mm.flush()
+        self._mm.close()
+        if self._fd is not None:
+            os.close(self._fd)
@@ -21,28 +21,210 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from __future__ import annotations
+
+import threading
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Callable
+
+
+class RingBufferView(Sequence):
+    """An ordered, read only view of a ring buffers storage.
+
+    Nothing is copied, the view reads straight from the buffers storage so it is only valid
+    until the next append. Use RingBuffer.since() for anything read from another thread or
+    consumed lazily.
+    """
+
+    __slots__ = ('_data', '_first', '_len')
+
+    def __init__(self, data, first: int, length: int):
+        self._data = data
+        self._first = first
+        self._len = length
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("RingBufferView index out of range")
+        return self._data[(self._first + index) % len(self._data)]
+
+    def __iter__(self):
+        data = self._data
+        size = len(data)
+        end = self._first + self._len
+        if end <= size:
+            for i in range(self._first, end):
+                yield data[i]
+        else:
+            for i in range(self._first, size):
+                yield data[i]
+            for i in range(end - size):
+                yield data[i]
+
+    def tail(self, start: int) -> RingBufferView:
+        """Returns a view of this view from start to the end."""
+        start = min(max(start, 0), self._len)
+        return RingBufferView(self._data, (self._first + start) % max(len(self._data), 1), self._len - start)
 
 
 class RingBuffer:
     """ class that implements a not-yet-full buffer"""
-    def __init__(self, size_max):
+    def __init__(self, size_max, timestamp_key: Callable[[object], int] | None = None):
+        """A fixed size buffer that overwrites the oldest item when full.
+
+        Parameters
+        ----------
+        size_max : int
+            The number of items to keep.
+        timestamp_key : Callable, optional
+            Returns the epoch seconds of an item. When given the timestamps are kept in a
+            compact int64 column so since() can bisect them, by default None
+        """
         self.max = size_max
         self.data = []
         self._full = False
+        self.cur = 0
+        self._timestamp_key = timestamp_key
+        self._timestamps = array('q')
+        # The timestamps are in order once count reaches this, i.e. once the items appended out
+        # of order have been overwritten.
+        self._ordered_from = 0
+        # Total number of appends, lets users of the buffer tell if it has changed.
+        self.count = 0
+        # Appends can come from user threads while the Device thread streams a reply.
+        self._lock = threading.Lock()
+
+    def _mark_unordered(self):
+        self._ordered_from = self.count + self.max
 
     def append(self, val):
         """ append an element at the end of the buffer."""
-        if len(self.data) == self.max:
+        with self._lock:
+            self._append(val)
+
+    def _append(self, val):
+        self.count += 1
+        if self._timestamp_key is not None:
+            timestamp = self._timestamp_key(val)
+            if self._timestamps and timestamp < self._timestamps[self.cur - 1 if self.cur else -1]:
+                self._mark_unordered()
+        if not self._full and len(self.data) == self.max:
             self.cur = 0
-            # Permanently change self's class from non-full to full
             self._full = True
         if self._full:
             # Append an element overwriting the oldest one.
-            # pylint: disable=access-member-before-definition
             self.data[self.cur] = val
+            if self._timestamp_key is not None:
+                self._timestamps[self.cur] = timestamp
             self.cur = (self.cur + 1) % self.max
         else:
             self.data.append(val)
+            if self._timestamp_key is not None:
+                self._timestamps.append(timestamp)
+            self.cur = len(self.data) % self.max
+
+    def extend(self, vals):
+        """Append many elements in one step.
+
+        Only the newest size_max elements are kept, so the rest aren't stored at all.
+        """
+        vals = list(vals)
+        if not vals:
+            return
+        with self._lock:
+            self._extend(vals)
+
+    def _extend(self, vals: list):
+        self.count += len(vals)
+        vals = vals[-self.max:]
+        timestamps = None
+        if self._timestamp_key is not None:
+            timestamps = array('q', map(self._timestamp_key, vals))
+            previous = self._timestamps[self.cur - 1 if self.cur else -1] if self._timestamps else timestamps[0]
+            if previous > timestamps[0] or any(a > b for a, b in zip(timestamps, timestamps[1:])):
+                self._mark_unordered()
+        if not self._full:
+            room = self.max - len(self.data)
+            self.data.extend(vals[:room])
+            if timestamps is not None:
+                self._timestamps.extend(timestamps[:room])
+            vals = vals[room:]
+            if timestamps is not None:
+                timestamps = timestamps[room:]
+            self.cur = len(self.data) % self.max
+            if len(self.data) == self.max:
+                self._full = True
+        if vals:
+            # Overwrite the oldest elements, wrapping round to the start if needed.
+            first = min(len(vals), self.max - self.cur)
+            self.data[self.cur:self.cur + first] = vals[:first]
+            self.data[:len(vals) - first] = vals[first:]
+            if timestamps is not None:
+                self._timestamps[self.cur:self.cur + first] = timestamps[:first]
+                self._timestamps[:len(vals) - first] = timestamps[first:]
+            self.cur = (self.cur + len(vals)) % self.max
+
+    def replace_latest(self, val):
+        """Replace the newest element, or append it if the buffer is empty."""
+        with self._lock:
+            if not self.data:
+                self._append(val)
+                return
+            index = (self.cur - 1) % self.max
+            self.data[index] = val
+            if self._timestamp_key is not None:
+                timestamp = self._timestamp_key(val)
+                if timestamp < self._timestamps[index]:
+                    self._mark_unordered()
+                self._timestamps[index] = timestamp
+            # The contents have changed, so count it like an append.
+            self.count += 1
+
+    def drop_until(self, timestamp: int, min_items: int = 1) -> int:
+        """Drops the items with a timestamp at or before timestamp.
+
+        The kept items are copied into new storage, so min_items lets callers wait until there
+        are enough old items to make that worthwhile.
+
+        Parameters
+        ----------
+        timestamp : int
+            Epoch seconds.
+        min_items : int, optional
+            Only drop anything if at least this many items are old enough, by default 1
+
+        Returns
+        -------
+        int
+            The number of items dropped.
+        """
+        if self._timestamp_key is None:
+            raise ValueError("RingBuffer was created without a timestamp_key")
+        with self._lock:
+            start = self.cur if self._full else 0
+            timestamps = RingBufferView(self._timestamps, start, len(self._timestamps))
+            if self.count < self._ordered_from:
+                keep = [i for i, item_time in enumerate(timestamps) if item_time > timestamp]
+            else:
+                keep = range(bisect_right(timestamps, timestamp), len(timestamps))
+            dropped = len(self.data) - len(keep)
+            if dropped < max(min_items, 1):
+                return 0
+            view = self.view()
+            self.data = [view[i] for i in keep]
+            self._timestamps = array('q', (timestamps[i] for i in keep))
+            self._full = False
+            self.cur = len(self.data) % self.max
+            return dropped
 
     def get_latest(self):
         """Get the last item in the buffer
@@ -63,9 +245,44 @@ class RingBuffer:
             return True
         return False
 
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.view())
+
     def get(self):
         """ Return a list of elements from the oldest to the newest."""
-        if self._full:
-            # return list of elements in correct order
-            return self.data[self.cur:] + self.data[:self.cur]
-        return self.data
+        with self._lock:
+            if self._full:
+                # return list of elements in correct order
+                return self.data[self.cur:] + self.data[:self.cur]
+            return self.data[:]
+
+    def view(self) -> RingBufferView:
+        """Returns an ordered view, oldest to newest, without copying the buffer."""
+        return RingBufferView(self.data, self.cur if self._full else 0, len(self.data))
+
+    def since(self, timestamp: int) -> list:
+        """Returns a list of the items with a timestamp after timestamp, oldest to newest.
+
+        Uses a binary search of the timestamp column so only the returned items are copied.
+        If items appended out of time order are still stored the buffer is scanned instead.
+        The list is a copy, so it stays valid while other threads append.
+
+        Parameters
+        ----------
+        timestamp : int
+            Epoch seconds.
+        """
+        if self._timestamp_key is None:
+            raise ValueError("RingBuffer was created without a timestamp_key")
+        with self._lock:
+            if self.count < self._ordered_from:
+                return [item for item in self.view() if self._timestamp_key(item) > timestamp]
+            start = self.cur if self._full else 0
+            timestamps = RingBufferView(self._timestamps, start, len(self._timestamps))
+            first = start + bisect_right(timestamps, timestamp)
+            if first <= len(self.data):
+                return self.data[first:] + self.data[:start]
+            return self.data[first - len(self.data):start]
@@ -0,0 +1,93 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class RxMailbox:
+    """Holds the newest incoming message for a control and delivers it on its own thread.
+
+    A message that arrives while the last one is still being handled replaces any message that
+    is waiting, so slow callbacks always get the latest value rather than working through a
+    backlog. Deliveries are at most max_rate per second.
+    """
+    def __init__(self, deliver: Callable[[list], None], max_rate: float | None = None, name: str = ""):
+        """Holds the newest incoming message for a control and delivers it on its own thread.
+
+        Parameters
+        ----------
+        deliver : Callable
+            Called with each message that is delivered.
+        max_rate : float, optional
+            The most messages per second to deliver, by default None which delivers as fast as
+            deliver returns.
+        name : str, optional
+            Name for the delivery thread, by default ""
+        """
+        self._deliver = deliver
+        self.max_rate = max_rate
+        self._pending = None
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, message: list):
+        """Queue message for delivery, replacing any message still waiting."""
+        with self._condition:
+            self._pending = message
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                message = self._pending
+                self._pending = None
+            started = time.monotonic()
+            try:
+                self._deliver(message)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("RX callback failed")
+            if self.max_rate:
+                # Messages that arrive while waiting replace each other.
+                wait = started + 1.0 / self.max_rate - time.monotonic()
+                if wait > 0:
+                    with self._condition:
+                        self._condition.wait_for(lambda: self._closed, wait)
+
+    def close(self):
+        """Stop the delivery thread, a message still waiting is dropped."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
@@ -29,6 +29,8 @@ from .enums import TitlePosition
 class SelectorConfig(ControlConfig):
     """SelectorConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -68,6 +70,8 @@ class Selector(Control):
     """A Selector control
     """
 
+    __slots__ = ('selection_list', '_position')
+
     def __init__(
         self,
         control_id: str,
@@ -100,14 +104,15 @@ class Selector(Control):
         self.selection_list = []
         if selection is not None:
             self.selection_list = list(map(lambda s: s.translate(BAD_CHARS), selection))
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             SelectorConfig(
                 control_id,
                 title,
                 title_position,
                 control_position,
                 self.selection_list
-            )
+            ),
+            column_no
         )
         self._position = 0
 
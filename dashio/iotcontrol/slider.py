@@ -29,6 +29,8 @@ from .enums import Color, SliderBarStyle, TitlePosition, BarMode
 class SliderConfig(ControlConfig):
     """SliderConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -95,6 +97,10 @@ class Slider(Control):
     """Single slider bar control
     """
 
+    __slots__ = ('_control_id_bar', '_slider_value', '_bar1_value', '_bar2_value', '_slider_state_str', '_bar_state_str', '_bar_slider_state_str', '_bar_min', '_bar_max', '_red_value')
+
+    continuous_rx = True
+
     def __init__(
         self,
         control_id: str,
@@ -151,7 +157,7 @@ class Slider(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("SLDR", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             SliderConfig(
                 control_id,
                 title,
@@ -167,7 +173,8 @@ class Slider(Control):
                 knob_color,
                 bar_style,
                 control_position
-            )
+            ),
+            column_no
         )
 
         self._control_id_bar = f"\t{{device_id}}\tBAR\t{control_id}\t"
@@ -202,9 +209,9 @@ class Slider(Control):
                 self._bar_state_str = self._control_id_bar + f"{self._bar1_value}\n"
             else:
                 self._bar_state_str = self._control_id_bar + "{:.2f}\t{:.2f}\n".format(self._bar1_value, self._bar2_value)
-            self._message_tx_event(self._bar_state_str)
+            self.state_str = self._bar_state_str
             self._slider_state_str = self._control_hdr_str + f"{self._slider_value}\n"
-            self._message_tx_event(self._slider_state_str)
+            self.state_str = self._slider_state_str
             self._slider_state_str = self._control_hdr_str + f"{self._slider_value}\n"
             self._bar_slider_state_str = self._slider_state_str + self._bar_state_str
         else:
@@ -213,8 +220,8 @@ class Slider(Control):
             else:
                 self._bar_state_str = self._control_id_bar + "na\tna\n"
             self._slider_state_str = self._control_hdr_str + "na\n"
-            self._message_tx_event(self._slider_state_str)
-            self._message_tx_event(self._bar_state_str)
+            self.state_str = self._slider_state_str
+            self.state_str = self._bar_state_str
             self._bar_slider_state_str = self._slider_state_str + self._bar_state_str
 
     @property
@@ -265,6 +272,10 @@ class Slider(Control):
         tmp_cls.parent_id = cfg_dict["parentID"]
         return tmp_cls
 
+    def _transmit_key(self, message: str) -> str:
+        # The SLDR and BAR messages are filtered and paced on their own.
+        return message.split('\t', 3)[2]
+
     def get_state(self):
         return self._bar_slider_state_str
 
@@ -285,13 +296,13 @@ class Slider(Control):
         if not self._is_active:
             self._is_active = True
             self._slider_state_str = self._control_hdr_str + f"{self._slider_value}\n"
-            self._message_tx_event(self._slider_state_str)
+            self.state_str = self._slider_state_str
 
         if self._bar2_value is None:
             self._bar_state_str = self._control_id_bar + f"{self._bar1_value}\n"
         else:
             self._bar_state_str = self._control_id_bar + "{:.2f}\t{:.2f}\n".format(self._bar1_value, self._bar2_value)
-        self._message_tx_event(self._bar_state_str)
+        self.state_str = self._bar_state_str
         self._bar_slider_state_str = self._slider_state_str + self._bar_state_str
 
     @property
@@ -311,13 +322,13 @@ class Slider(Control):
         if not self._is_active:
             self._is_active = True
             self._slider_state_str = self._control_hdr_str + f"{self._slider_value}\n"
-            self._message_tx_event(self._slider_state_str)
+            self.state_str = self._slider_state_str
 
         if self._bar2_value is None:
             self._bar_state_str = self._control_id_bar + f"{self._bar1_value}\n"
         else:
             self._bar_state_str = self._control_id_bar + "{:.2f}\t{:.2f}\n".format(self._bar1_value, self._bar2_value)
-        self._message_tx_event(self._bar_state_str)
+        self.state_str = self._bar_state_str
         self._bar_slider_state_str = self._slider_state_str + self._bar_state_str
 
     @property
@@ -339,8 +350,8 @@ class Slider(Control):
                 self._bar_state_str = self._control_id_bar + f"{self._bar1_value}\n"
             else:
                 self._bar_state_str = self._control_id_bar + "{:.2f}\t{:.2f}\n".format(self._bar1_value, self._bar2_value)
-        self._message_tx_event(self._bar_state_str)
+        self.state_str = self._bar_state_str
         self._slider_value = val
         self._slider_state_str = self._control_hdr_str + f"{self._slider_value}\n"
-        self._message_tx_event(self._slider_state_str)
+        self.state_str = self._slider_state_str
         self._bar_slider_state_str = self._slider_state_str + self._bar_state_str
@@ -23,6 +23,7 @@ SOFTWARE.
 """
 from __future__ import annotations
 
+import contextlib
 import logging
 
 from ..constants import BAD_CHARS
@@ -36,6 +37,8 @@ logger = logging.getLogger(__name__)
 class TableConfig(ControlConfig):
     """TableConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -49,7 +52,7 @@ class TableConfig(ControlConfig):
         control_position: ControlPosition | None
     ) -> None:
         super().__init__(control_id, title, control_position, title_position)
-        ch = [heading.translate(BAD_CHARS) for heading in column_headings]
+        ch = [heading.translate(BAD_CHARS) for heading in column_headings or []]
         self.cfg["fontSize"] = font_size
         self.cfg["labelWidthPcnt"] = label_width_percent
         self.cfg["columns"] = columns
@@ -106,6 +109,8 @@ class Table(Control):
     """A Table control
     """
 
+    __slots__ = ('_rows', '_max_columns', '_batch_depth', '_batch_before', '_batch_cleared')
+
     def __init__(
         self,
         control_id: str,
@@ -150,7 +155,7 @@ class Table(Control):
         ch = column_headings
         if column_headings is not None:
             ch = [heading.translate(BAD_CHARS) for heading in column_headings]
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             TableConfig(
                 control_id,
                 title,
@@ -161,10 +166,15 @@ class Table(Control):
                 columns,
                 ch,
                 control_position
-            )
+            ),
+            column_no
         )
         self._rows = []
         self._max_columns = columns
+        # Inside batch() row changes are collected here and sent as one message when it ends.
+        self._batch_depth = 0
+        self._batch_before = {}
+        self._batch_cleared = False
 
     def get_state(self):
         return "".join([self._send_row(index, row) for index, row in enumerate(self._rows)])
@@ -197,6 +207,10 @@ class Table(Control):
         tmp_cls.parent_id = cfg_dict["parentID"]
         return tmp_cls
 
+    def _transmit_key(self, message: str) -> str:
+        # Each row is filtered and paced on its own.
+        return message[len(self._control_hdr_str):].split('\t', 1)[0]
+
     def _send_row(self, row_number: int, table_row: TableRow | None) -> str:
         header_str = self._control_hdr_str
         if table_row is None:
@@ -211,10 +225,67 @@ class Table(Control):
             return f"{header_str}{row_number}\t{columns}\n"
         return f"{header_str}{row_number}\t{columns}\t{table_row.label}\n"
 
+    def _touch(self, row_number: int):
+        """Keep the text of a row before it first changes in a batch, to diff against at the end."""
+        if self._batch_depth and not self._batch_cleared and row_number not in self._batch_before:
+            self._batch_before[row_number] = self._send_row(row_number, self._rows[row_number]) if row_number < len(self._rows) else None
+
+    def _row_changed(self, row_number: int):
+        if not self._batch_depth and self.has_consumers:
+            self.state_str = self._send_row(row_number, self._rows[row_number])
+
+    def _send_batch(self):
+        if not self.has_consumers:
+            rows = []
+        elif self._batch_cleared:
+            rows = [self._control_hdr_str + '\n'] + [self._send_row(index, row) for index, row in enumerate(self._rows)]
+        else:
+            rows = []
+            for row_number in sorted(self._batch_before):
+                if row_number >= len(self._rows):
+                    continue
+                row_str = self._send_row(row_number, self._rows[row_number])
+                if row_str != self._batch_before[row_number]:
+                    rows.append(row_str)
+        if self._batch_cleared:
+            self._reset_transmit()
+        self._batch_before = {}
+        self._batch_cleared = False
+        if rows:
+            self.state_str = "".join(rows)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Collect the row changes made inside the with block and send them as one message.
+
+        Rows are compared with how they were before the block, and only the rows whose text
+        changed are sent.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._send_batch()
+
+    def update_rows(self, rows: dict[int, TableRow]):
+        """Update many rows and send the ones that changed as one message.
+
+        Parameters
+        ----------
+        rows : dict
+            The new TableRow for each row index. Indexes past the end of the table are appended.
+        """
+        with self.batch():
+            for row_number in sorted(rows):
+                self.update_table_row(rows[row_number], row_number)
+
     def add_table_row(self, table_row: TableRow):
         """Add a row to the table and send it"""
+        self._touch(len(self._rows))
         self._rows.append(table_row)
-        self.state_str = self._send_row(len(self._rows) - 1, table_row)
+        self._row_changed(len(self._rows) - 1)
 
     def update_table_row(self, table_row: TableRow, row_number: int) -> int:
         """Update the row at row_number. If it doesn't exist then append it.
@@ -232,11 +303,11 @@ class Table(Control):
             The index of the updated row.
         """
         if row_number < len(self._rows):
+            self._touch(row_number)
             self._rows[row_number] = table_row
-            self.state_str = self._send_row(row_number, table_row)
+            self._row_changed(row_number)
             return row_number
-        self._rows.append(table_row)
-        self.state_str = self._send_row(len(self._rows) - 1, table_row)
+        self.add_table_row(table_row)
         return len(self._rows)-1
 
     def clear_row(self, row_number: int):
@@ -248,13 +319,19 @@ class Table(Control):
             The row to clear
         """
         if 0 <= row_number < len(self._rows):
+            self._touch(row_number)
             self._rows[row_number] = None
-            header_str = self._control_hdr_str + f"{row_number}\n"
-            self.state_str = header_str
+            self._row_changed(row_number)
 
     def clear_table(self):
         """Clears the table
         """
         self._rows = []
+        if self._batch_depth:
+            self._batch_cleared = True
+            self._batch_before = {}
+            return
+        # Rows sent or held before the clear don't count any more, and the clear is always sent.
+        self._reset_transmit()
         header_str = self._control_hdr_str + '\n'
-        self.state_str = header_str
+        self._message_tx_event(header_str)
@@ -38,6 +38,8 @@ from .enums import (
 class TextBoxConfig(ControlConfig):
     """TextBoxConfig"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -95,7 +97,7 @@ class TextBoxConfig(ControlConfig):
             _get_keyboard_type(cfg_dict["kbdType"]),
             cfg_dict["closeKbdOnSend"],
             _get_caption_mode(cfg_dict["captionMode"]),
-            cfg_dict["replace"],
+            cfg_dict.get("replace"),
             ControlPosition(cfg_dict["xPositionRatio"], cfg_dict["yPositionRatio"], cfg_dict["widthRatio"], cfg_dict["heightRatio"])
         )
         tmp_cls.parent_id = cfg_dict["parentID"]
@@ -106,6 +108,8 @@ class TextBox(Control):
     """A TextBox control
     """
 
+    __slots__ = ('_color', '_caption_color', '_text', '_caption')
+
     def __init__(
         self,
         control_id: str,
@@ -160,7 +164,7 @@ class TextBox(Control):
             phones or 2 column fold out phones or 3 column tablets.
         """
         super().__init__("TEXT", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             TextBoxConfig(
                 control_id,
                 title,
@@ -175,7 +179,8 @@ class TextBox(Control):
                 caption_mode,
                 replace,
                 control_position
-            )
+            ),
+            column_no
         )
         self._color = Color.WHITE
         self._caption_color = Color.WHITE
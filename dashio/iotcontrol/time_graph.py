@@ -23,58 +23,254 @@ SOFTWARE.
 """
 from __future__ import annotations
 import datetime
-
-import dateutil.parser
+from typing import Iterator, Sequence
 
 from ..constants import BAD_CHARS
 from .control import Control, ControlPosition, ControlConfig, _get_title_position
-from .enums import Color, TimeGraphLineType, TitlePosition
+from .enums import Color, TimeGraphLineType, TitlePosition, MessagePriority
+from .decimation import bucket_bounds, lttb, min_max, stride
+from .mmap_ring_buffer import MmapRingBuffer
 from .ring_buffer import RingBuffer
+from .timestamps import epoch_to_iso, iso_to_epoch, to_epoch
 from .event import Event
 
 
-class DataPointArray:
+class _TimeStampedData:
+    """Base for DataPoint and DataPointArray.
+
+    The time is held as whole epoch seconds and the text sent to the **Dash** app is made
+    the first time it's needed, then reused until the point is changed.
+    """
+
+    __slots__ = ('_epoch', '_data_point', '_text')
+
+    def __init__(self, data, timestamp: datetime.datetime | int | float | str | None = None):
+        self._epoch = to_epoch(timestamp)
+        self._data_point = data
+        self._text = None
+
+    @property
+    def epoch(self) -> int:
+        """The time of the data point in epoch seconds"""
+        return self._epoch
+
+    @epoch.setter
+    def epoch(self, val: int):
+        self._epoch = to_epoch(val)
+        self._text = None
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        """The time of the data point as a UTC datetime"""
+        return datetime.datetime.fromtimestamp(self._epoch, datetime.timezone.utc)
+
+    @timestamp.setter
+    def timestamp(self, val: datetime.datetime | int | float | str):
+        self._epoch = to_epoch(val)
+        self._text = None
+
+    @property
+    def data_point(self):
+        """The data"""
+        return self._data_point
+
+    @data_point.setter
+    def data_point(self, val):
+        self._data_point = val
+        self._text = None
+
+    def _format_data(self) -> str:
+        return str(self._data_point)
+
+    def __str__(self):
+        # History replies send the same points many times so the text is made once.
+        if self._text is None:
+            self._text = f"{epoch_to_iso(self._epoch)},{self._format_data()}"
+        return self._text
+
+
+class DataPointArray(_TimeStampedData):
     """
     A time stamped data array for a Time Graph
     """
-    def __init__(self, data: list):
+
+    __slots__ = ()
+
+    def __init__(self, data: list, timestamp: datetime.datetime | int | float | str | None = None):
         """
         A time stamped data array for a time series graph.
 
         Parameters
         ----------
             data: A data array can contain an int, float, or string representing a number.
+            timestamp: datetime, int, float, or str, optional
+                The time of the data as a datetime, epoch seconds, or ISO 8601 string. Defaults to now.
         """
-        self.timestamp = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
-        for item in data:
-            if isinstance(item, str):
-                item = item.translate(BAD_CHARS)
-        self.data_point = data
+        super().__init__([item.translate(BAD_CHARS) if isinstance(item, str) else item for item in data], timestamp)
 
-    def __str__(self):
-        dp_str = ','.join([str(i) for i in self.data_point])
-        return f"{self.timestamp.isoformat()},[{dp_str}]"
+    def _format_data(self) -> str:
+        dp_str = ','.join([str(i) for i in self._data_point])
+        return f"[{dp_str}]"
 
 
-class DataPoint:
+class DataPoint(_TimeStampedData):
     """
     A time stamped data point for a Time Graph
     """
-    def __init__(self, data):
+
+    __slots__ = ()
+
+    def __init__(self, data, timestamp: datetime.datetime | int | float | str | None = None):
         """
         A time stamped data point for a time series graph.
 
         Parameters
         ----------
             data: A data point can be an int, float, or boolean, or string representing a number.
+            timestamp: datetime, int, float, or str, optional
+                The time of the data as a datetime, epoch seconds, or ISO 8601 string. Defaults to now.
         """
-        self.timestamp = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
         if isinstance(data, str):
             data = data.translate(BAD_CHARS)
-        self.data_point = data
+        super().__init__(data, timestamp)
 
-    def __str__(self):
-        return f"{self.timestamp.isoformat()},{self.data_point}"
+
+def _epoch_seconds(data_point: _TimeStampedData) -> int:
+    return data_point.epoch
+
+
+def _to_record(data_point: _TimeStampedData) -> tuple[int, object]:
+    return data_point.epoch, data_point.data_point
+
+
+def _from_record(epoch: int, value) -> DataPoint:
+    return DataPoint(value, epoch)
+
+
+def _as_number(value) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _make_point(value, epoch: int) -> _TimeStampedData:
+    if isinstance(value, list):
+        return DataPointArray(value, epoch)
+    return DataPoint(value, epoch)
+
+
+def _sum(values) -> int | float:
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return sum(values)
+    return sum(_as_number(value) or 0.0 for value in values)
+
+
+def _is_break(value) -> bool:
+    # Breaks, and any other marker that isn't a number, are never decimated away.
+    return isinstance(value, str) and _as_number(value) is None
+
+
+class RollupTier:
+    """Aggregates of a TimeGraphLine over a fixed interval.
+
+    Points are combined as they are added to the line, so only the open interval and a ring
+    buffer of max_data_points aggregates are held.
+    """
+
+    __slots__ = ('interval', 'aggregate', 'data', '_bucket', '_count', '_total', '_top', '_last')
+
+    def __init__(self, interval: int, max_data_points: int, aggregate: str = "mean"):
+        """Aggregates of a TimeGraphLine over a fixed interval.
+
+        Parameters
+        ----------
+        interval : int
+            The interval in seconds that each aggregate covers.
+        max_data_points : int
+            The number of aggregates to keep.
+        aggregate : str, optional
+            How points are combined, "mean", "sum", "max", or "last", by default "mean"
+        """
+        if aggregate not in ("mean", "sum", "max", "last"):
+            raise ValueError('aggregate must be "mean", "sum", "max", or "last"')
+        self.interval = int(interval)
+        self.aggregate = aggregate
+        self.data = RingBuffer(max_data_points, timestamp_key=_epoch_seconds)
+        self._bucket = None
+
+    def _open(self, bucket: int):
+        self._bucket = bucket
+        self._count = 0
+        self._total = None
+        self._top = None
+        self._last = None
+
+    def _value(self):
+        if self.aggregate == "last":
+            return self._last
+        if self.aggregate == "max":
+            return self._top
+        if isinstance(self._total, list):
+            if self.aggregate == "sum":
+                return self._total
+            return [total / self._count for total in self._total]
+        if self.aggregate == "sum":
+            return self._total
+        return self._total / self._count
+
+    def _close(self):
+        if self._bucket is not None and self._count:
+            self.data.append(_make_point(self._value(), self._bucket))
+        self._bucket = None
+
+    def add(self, epoch: int, value):
+        """Add a point to the open interval, closing it first if the point is in a new one."""
+        if _is_break(value):
+            self._close()
+            self.data.append(DataPoint(value, epoch))
+            return
+        bucket = epoch - epoch % self.interval
+        if bucket != self._bucket:
+            self._close()
+            self._open(bucket)
+        self._count += 1
+        self._last = value
+        if isinstance(value, list):
+            numbers = [_as_number(item) or 0.0 for item in value]
+            self._total = numbers if self._total is None else [a + b for a, b in zip(self._total, numbers)]
+            return
+        number = _as_number(value)
+        if number is None:
+            return
+        if self._top is None or number > _as_number(self._top):
+            self._top = value
+        if self._total is None:
+            self._total = value if isinstance(value, int) and not isinstance(value, bool) else number
+        elif isinstance(self._total, int) and isinstance(value, int) and not isinstance(value, bool):
+            self._total += value
+        else:
+            self._total += number
+
+    def __len__(self) -> int:
+        return len(self.data) + (1 if self._bucket is not None and self._count else 0)
+
+    def covers(self, epoch: int) -> bool:
+        """True if the tier still holds everything after epoch."""
+        if self.data.count == len(self.data):
+            return True
+        return self.data.view()[0].epoch <= epoch
+
+    def since(self, epoch: int) -> list:
+        """The aggregates after epoch, including the one for the open interval."""
+        points = list(self.data.since(epoch))
+        if self._bucket is not None and self._count and self._bucket > epoch:
+            points.append(_make_point(self._value(), self._bucket))
+        return points
 
 
 class TimeGraphLine:
@@ -87,7 +283,10 @@ class TimeGraphLine:
         color: Color = Color.BLACK,
         max_data_points: int = 60,
         break_data: bool = False,
-        right_axis: bool = False
+        right_axis: bool = False,
+        bar_aggregate: str = "sum",
+        storage_path: str | None = None,
+        columnar: bool = False
     ):
         """A TimeGraphLine for a TimeGraph control
 
@@ -105,12 +304,31 @@ class TimeGraphLine:
             If true draws the line with breaks between missing data, by default False
         right_axis: bool, optional
             Defaults to left, right if true.
+        bar_aggregate: str, optional
+            How BAR lines combine points when a history reply is decimated, "sum" or "last", by default "sum"
+        storage_path: str, optional
+            Keep the data in a memory mapped file at this path instead of in memory. The history in
+            the file is served again after a restart. Only single values can be stored, not
+            DataPointArrays, by default None
+        columnar: bool, optional
+            Keep the data in memory as int64 timestamp and float64 value columns, about 17 bytes a
+            point, instead of as DataPoints. Only single values can be stored, not
+            DataPointArrays, by default False
         """
+        if bar_aggregate not in ("sum", "last"):
+            raise ValueError('bar_aggregate must be "sum" or "last"')
         self.name = name.translate(BAD_CHARS)
         self.line_type = line_type
         self.color = color
         self.break_data = break_data
-        self.data = RingBuffer(max_data_points)
+        self.bar_aggregate = bar_aggregate
+        if storage_path is None and not columnar:
+            self.data = RingBuffer(max_data_points, timestamp_key=_epoch_seconds)
+        else:
+            self.data = MmapRingBuffer(storage_path, max_data_points, _to_record, _from_record)
+        # Points already in a storage file were sent before the restart.
+        self._sent_count = self.data.count
+        self.rollup_tiers = []
         self.axis_side = 'left'
         if right_axis:
             self.axis_side = 'right'
@@ -118,57 +336,228 @@ class TimeGraphLine:
     def get_line_format(self):
         return f"\t{self.name}\t{self.line_type.value}\t{self.color.value}\t{self.axis_side}\n"
 
-    def get_line_from_timestamp(self, timestamp: str) -> str:
+    def _reduce_segment(self, segment: list, budget: int) -> list:
+        if len(segment) <= budget:
+            return segment
+        if self.line_type == TimeGraphLineType.BAR:
+            reduced = []
+            for start, end in bucket_bounds(len(segment), budget):
+                if self.bar_aggregate == "last" or end - start == 1:
+                    reduced.append(segment[end - 1])
+                    continue
+                bucket = [data_p.data_point for data_p in segment[start:end]]
+                if all(isinstance(value, list) for value in bucket):
+                    # Segmented bars, sum each segment.
+                    reduced.append(DataPointArray([_sum(items) for items in zip(*bucket)], segment[end - 1].epoch))
+                else:
+                    reduced.append(DataPoint(_sum(bucket), segment[end - 1].epoch))
+            return reduced
+        values = [_as_number(data_p.data_point) for data_p in segment]
+        if None in values:
+            indices = stride(len(segment), budget)
+        elif self.line_type == TimeGraphLineType.BOOL:
+            indices = min_max(values, budget)
+        else:
+            indices = lttb([data_p.epoch for data_p in segment], values, budget)
+        return [segment[i] for i in indices]
+
+    def _decimate(self, points, max_points: int) -> list:
+        """Reduce points to about max_points while keeping the shape of the line.
+
+        Break points split the line into segments that are reduced separately, so breaks are kept
+        where they are.
+        """
+        parts = [[]]
+        for data_p in points:
+            if _is_break(data_p.data_point):
+                parts.append(data_p)
+                parts.append([])
+            else:
+                parts[-1].append(data_p)
+        segments = [part for part in parts if isinstance(part, list)]
+        budget = max(max_points - (len(parts) - len(segments)), len(segments) * 2)
+        num_points = sum(len(segment) for segment in segments) or 1
+        reduced = []
+        for part in parts:
+            if isinstance(part, list):
+                reduced.extend(self._reduce_segment(part, max(2, budget * len(part) // num_points)))
+            else:
+                reduced.append(part)
+        return reduced
+
+    def add_rollup_tier(self, interval: int, max_data_points: int, aggregate: str | None = None) -> RollupTier:
+        """Keep aggregates of the line over interval seconds as well as the raw data.
+
+        History replies use the finest tier that still holds the whole requested window, so the
+        raw data can be kept short while tiers hold a longer, coarser history.
+
+        Parameters
+        ----------
+        interval : int
+            The interval in seconds that each aggregate covers.
+        max_data_points : int
+            The number of aggregates to keep.
+        aggregate : str, optional
+            "mean", "sum", "max", or "last". By default LINE lines use the mean, BAR lines use
+            bar_aggregate, and BOOL lines use the max so any True in the interval shows.
+
+        Returns
+        -------
+        RollupTier
+            The new tier.
+        """
+        if aggregate is None:
+            aggregate = "mean"
+            if self.line_type == TimeGraphLineType.BAR:
+                aggregate = self.bar_aggregate
+            elif self.line_type == TimeGraphLineType.BOOL:
+                aggregate = "max"
+        tier = RollupTier(interval, max_data_points, aggregate)
+        self.rollup_tiers.append(tier)
+        self.rollup_tiers.sort(key=lambda rollup: rollup.interval)
+        return tier
+
+    def _history_source(self, from_epoch: int, max_points: int | None) -> tuple[Sequence, int]:
+        """Returns the points after from_epoch from the raw data or the best rollup tier, and the
+        number of points stored in the source."""
+        if not self.rollup_tiers:
+            return self.data.since(from_epoch), len(self.data)
+        raw_covers = self.data.count == len(self.data) or self.data.view()[0].epoch <= from_epoch
+        candidates = [self.data] if raw_covers else []
+        candidates += [tier for tier in self.rollup_tiers if tier.covers(from_epoch)]
+        if not candidates:
+            # Nothing holds the whole window, the longest tier is closest.
+            candidates = [self.rollup_tiers[-1]]
+        # Finest first, move to a coarser tier if there are more points than the budget.
+        for candidate in candidates:
+            points = candidate.since(from_epoch)
+            if not max_points or len(points) <= max_points:
+                break
+        return points, len(candidate)
+
+    def get_line_from_timestamp(self, timestamp: str, max_points: int | None = None) -> str:
         """Converts data from timestamp to a string formatted for the **Dash** app
 
+        Parameters
+        ----------
+        timestamp : str
+            ISO 8601 time to send data after.
+        max_points : int, optional
+            If there are more points than this they are decimated, by default None
+
         Returns
         -------
         str
             Formatted line data
         """
-        data_str = f"\t{self.name}\t{self.line_type.value}\t{self.color.value}\t{self.axis_side}"
+        return "".join(self.get_lines_from_timestamp(timestamp, max_points))
 
+    def get_lines_from_timestamp(self, timestamp: str, max_points: int | None = None, points_per_line: int | None = None) -> Iterator[str]:
+        """Yields the data from timestamp formatted for the **Dash** app, split into lines of at
+        most points_per_line points that each start with the line's header.
+
+        Parameters
+        ----------
+        timestamp : str
+            ISO 8601 time to send data after.
+        max_points : int, optional
+            If there are more points than this they are decimated, by default None
+        points_per_line : int, optional
+            The most points in each line, by default None which sends them all in one line
+        """
         try:
-            d_stamp = dateutil.parser.isoparse(timestamp)
+            from_epoch = iso_to_epoch(timestamp)
         except ValueError:
-            return ""
-        first = True
-        valid_data = False
-        data_list = self.data.get()
-        for data_p in data_list:
-            if data_p.timestamp > d_stamp:
-                if first and self.break_data:
-                    data_str += "\t" + f"{data_p.timestamp.isoformat()},b"
-                data_str += "\t" + str(data_p)
-                valid_data = True
-            first = False
-        data_str += "\n"
-        if not valid_data:
-            data_str = ""
-        return data_str
-
-    def add_data_point(self, data):
-        """Add and sends a DataPoint to the line. It automatically timestamps to the current time.
+            return
+        data_list, stored_points = self._history_source(from_epoch, max_points)
+        if not data_list:
+            return
+        header = f"\t{self.name}\t{self.line_type.value}\t{self.color.value}\t{self.axis_side}"
+        break_str = ""
+        if self.break_data and len(data_list) == stored_points:
+            break_str = "\t" + f"{epoch_to_iso(data_list[0].epoch)},b"
+        if max_points and len(data_list) > max_points:
+            data_list = self._decimate(data_list, max_points)
+        points_per_line = points_per_line or len(data_list)
+        for start in range(0, len(data_list), points_per_line):
+            points = data_list[start:start + points_per_line]
+            yield header + break_str + "\t" + "\t".join(map(str, points)) + "\n"
+            break_str = ""
+
+    def add_data_point(self, data, timestamp: datetime.datetime | int | float | str | None = None):
+        """Add a DataPoint to the line. It is timestamped with the current time unless a timestamp is given.
 
         Parameters
         ----------
             data_point : str, int, float, DataPoint, DataPointArray
                 A data point to add to the line.
+            timestamp : datetime, int, float, or str, optional
+                The time of the data as a datetime, epoch seconds, or ISO 8601 string. Use this for
+                back filled or remotely sourced data. Defaults to the current time, or the
+                timestamp of a DataPoint.
         """
-        if isinstance(data, DataPoint) or isinstance(data, DataPointArray):
-            self.data.append(data)
-        elif isinstance(data, str) or isinstance(data, float) or isinstance(data, int) or isinstance(data, bool):
-            data_p = DataPoint(data)
-            self.data.append(data_p)
+        if isinstance(data, (DataPoint, DataPointArray)):
+            if timestamp is not None:
+                data.timestamp = timestamp
+        elif isinstance(data, (str, float, int, bool)):
+            data = DataPoint(data, timestamp)
         else:
             raise TypeError("Not a valid data point")
+        self.data.append(data)
+        for tier in self.rollup_tiers:
+            tier.add(data.epoch, data.data_point)
+
+    def add_data_points(self, timestamps, values):
+        """Add many data points to the line in one step.
+
+        Use this to back fill after an outage or load stored samples at startup. Only the newest
+        max_data_points are kept, so DataPoints are only made for those.
+
+        Parameters
+        ----------
+            timestamps : sequence or NumPy array
+                Times of the data as datetimes, epoch seconds, or ISO 8601 strings, or a NumPy datetime64 array.
+            values : sequence or NumPy array
+                The data, int, float, bool, or str, one for each timestamp.
+
+        Raises
+        ------
+            ValueError
+                If there aren't the same number of timestamps and values.
+        """
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must be the same length")
+        if getattr(getattr(timestamps, 'dtype', None), 'kind', '') == 'M':
+            # NumPy datetime64, convert to epoch seconds without going through datetime objects.
+            timestamps = timestamps.astype('datetime64[s]').astype('int64')
+        # NumPy arrays have tolist(), which is much quicker than iterating over them.
+        timestamps = timestamps.tolist() if hasattr(timestamps, 'tolist') else timestamps
+        values = values.tolist() if hasattr(values, 'tolist') else values
+        if self.rollup_tiers:
+            epochs = [to_epoch(timestamp) for timestamp in timestamps]
+            for tier in self.rollup_tiers:
+                for epoch, value in zip(epochs, values):
+                    tier.add(epoch, value)
+            timestamps = epochs
+        keep = self.data.max
+        self.data.extend(
+            DataPoint(value, timestamp) for timestamp, value in zip(timestamps[-keep:], values[-keep:])
+        )
+        # extend only counts what it's given, account for the points that were never made.
+        self.data.count += max(len(values) - keep, 0)
 
-    def add_break(self):
+    def add_break(self, timestamp: datetime.datetime | int | float | str | None = None):
         """Add graph break to the line.
+
+        Parameters
+        ----------
+            timestamp : datetime, int, float, or str, optional
+                The time of the break, defaults to the current time.
         """
-        self.timestamp = datetime.datetime.utcnow().replace(microsecond=0, tzinfo=datetime.timezone.utc)
-        dp_break = DataPoint("B")
+        dp_break = DataPoint("B", timestamp)
         self.data.append(dp_break)
+        for tier in self.rollup_tiers:
+            tier.add(dp_break.epoch, dp_break.data_point)
 
     def get_latest_data(self) -> str:
         """Get the last inserted DataPoint
@@ -180,12 +569,36 @@ class TimeGraphLine:
         """
         if self.data.empty():
             return ""
+        self._sent_count = self.data.count
         data_str = "\t" + str(self.data.get_latest()) + "\n"
         return data_str
 
+    def get_new_data(self) -> str:
+        """Get all the DataPoints added since data was last sent
+
+        Returns
+        -------
+        str
+            The new DataPoints, or "" if there aren't any
+        """
+        new_points = min(self.data.count - self._sent_count, len(self.data))
+        self._sent_count = self.data.count
+        if new_points <= 0:
+            return ""
+        view = self.data.view()
+        return "\t" + "\t".join(map(str, view.tail(len(view) - new_points))) + "\n"
+
+    def close(self):
+        """Flush and close the storage file of a line made with a storage_path or columnar."""
+        if isinstance(self.data, MmapRingBuffer):
+            self.data.close()
+
 
 class TimeGraphConfig(ControlConfig):
     """TimeGraphConfig"""
+
+    __slots__ = ()
+
     def __init__(
         self,
         control_id: str,
@@ -243,6 +656,16 @@ class TimeGraph(Control):
     """A TimeGraph control
     """
 
+    __slots__ = ('_y_axis_min', '_y_axis_max', '_y_axis_num_bars', '_y_axis_min_rt', '_y_axis_max_rt', 'line_dict', 'max_history_points')
+
+    reply_priority = MessagePriority.BULK
+    # Long histories are sent as several lines so they can be split into frames.
+    HISTORY_POINTS_PER_LINE = 200
+
+    def _process_rx_message(self, data_array: list) -> str:
+        self._fire_rx(data_array)
+        return self._get_lines_from_timestamp(data_array)
+
     def __init__(
         self,
         control_id: str,
@@ -256,7 +679,8 @@ class TimeGraph(Control):
         y_axis_min_rt=0.0,
         y_axis_max_rt=1000.0,
         control_position=None,
-        column_no=1
+        column_no=1,
+        max_history_points: int | None = None
     ):
         """A TimeGraph control
 
@@ -282,9 +706,11 @@ class TimeGraph(Control):
             The Dash App reports its screen size in columns. column_no allows you to specify which column no to load into.
             Each control can store three configs that define how the device looks for Dash apps installed on single column
             phones or 2 column fold out phones or 3 column tablets.
+        max_history_points : int, optional
+            Decimate each line of a history reply to about this many points, by default None sends every point.
         """
         super().__init__("TGRPH", control_id)
-        self._app_columns_cfg[str(column_no)].append(
+        self._append_config(
             TimeGraphConfig(
                 control_id,
                 title,
@@ -297,10 +723,10 @@ class TimeGraph(Control):
                 y_axis_min_rt,
                 y_axis_max_rt,
                 control_position
-            )
+            ),
+            column_no
         )
         self._message_rx_event = Event()
-        self._message_rx_event += self._get_lines_from_timestamp
         self._y_axis_min = y_axis_min
         self._y_axis_max = y_axis_max
         self._y_axis_num_bars = y_axis_num_bars
@@ -308,6 +734,7 @@ class TimeGraph(Control):
         self._y_axis_max_rt = y_axis_max_rt
 
         self.line_dict = {}
+        self.max_history_points = max_history_points
 
     @property
     def y_axis_min(self):
@@ -385,22 +812,23 @@ class TimeGraph(Control):
         self.line_dict[line_id] = gline
 
     def _get_lines_from_timestamp(self, msg):
-        state_str = ""
+        """Yields the history of each line, HISTORY_POINTS_PER_LINE points to a line."""
         try:
             dashboard_id = msg[3]
             from_timestamp = msg[4]
         except IndexError:
-            return ""
-        for key, line in self.line_dict.items():
+            return
+        for key, line in list(self.line_dict.items()):
             if line.data:
-                line_data = line.get_line_from_timestamp(from_timestamp)
-                if line_data:
-                    state_str += self._control_hdr_str + dashboard_id + "\t" + key + line_data
-        return state_str
+                header = self._control_hdr_str + dashboard_id + "\t" + key
+                for line_data in line.get_lines_from_timestamp(from_timestamp, self.max_history_points, self.HISTORY_POINTS_PER_LINE):
+                    yield header + line_data
 
     def send_data(self):
         """Sends the latest Data to the **Dash** app.
         """
+        if not self.has_consumers:
+            return
         state_str = ""
         for key, line in self.line_dict.items():
             if line.data:
@@ -408,3 +836,19 @@ class TimeGraph(Control):
                 if line_data:
                     state_str += self._control_hdr_str + key + line_data
         self.state_str = state_str
+
+    def send_new_data(self):
+        """Sends all the data added to each line since data was last sent to the **Dash** app, in one message.
+        """
+        if not self.has_consumers:
+            # Nobody to send to, count the data as sent so it isn't all sent when someone connects.
+            for line in self.line_dict.values():
+                line._sent_count = line.data.count
+            return
+        state_str = ""
+        for key, line in self.line_dict.items():
+            line_data = line.get_new_data()
+            if line_data:
+                state_str += self._control_hdr_str + key + line_data
+        if state_str:
+            self.state_str = state_str
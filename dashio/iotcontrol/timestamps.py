@@ -0,0 +1,80 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+import datetime
+import math
+import time
+
+import dateutil.parser
+
+_UTC = datetime.timezone.utc
+
+
+def iso_to_epoch(timestamp: str) -> int:
+    """Converts an ISO 8601 timestamp to whole epoch seconds, rounded down.
+
+    Uses datetime.fromisoformat, which is much faster than dateutil, and only falls back to
+    dateutil for the less common ISO forms. Timestamps without a timezone are taken as UTC.
+
+    Raises
+    ------
+    ValueError
+        If timestamp isn't an ISO 8601 timestamp.
+    """
+    if timestamp.endswith(("Z", "z")):
+        timestamp = timestamp[:-1] + "+00:00"
+    try:
+        d_stamp = datetime.datetime.fromisoformat(timestamp)
+    except ValueError:
+        d_stamp = dateutil.parser.isoparse(timestamp)
+    if d_stamp.tzinfo is None:
+        d_stamp = d_stamp.replace(tzinfo=_UTC)
+    return math.floor(d_stamp.timestamp())
+
+
+def epoch_to_iso(epoch: int) -> str:
+    """Converts epoch seconds to the ISO 8601 UTC format used by the **Dash** app."""
+    return datetime.datetime.fromtimestamp(epoch, _UTC).isoformat()
+
+
+def datetime_to_epoch(d_stamp: datetime.datetime) -> int:
+    """Converts a datetime to whole epoch seconds, a naive datetime is taken as UTC."""
+    if d_stamp.tzinfo is None:
+        d_stamp = d_stamp.replace(tzinfo=_UTC)
+    return math.floor(d_stamp.timestamp())
+
+
+def to_epoch(timestamp: datetime.datetime | int | float | str | None = None) -> int:
+    """Converts a datetime, epoch seconds, or ISO 8601 string to whole epoch seconds.
+
+    None returns the current time.
+    """
+    if timestamp is None:
+        return math.floor(time.time())
+    if isinstance(timestamp, datetime.datetime):
+        return datetime_to_epoch(timestamp)
+    if isinstance(timestamp, str):
+        return iso_to_epoch(timestamp)
+    return math.floor(timestamp)
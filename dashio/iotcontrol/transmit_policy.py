@@ -0,0 +1,92 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from __future__ import annotations
+
+
+def _number(field: str) -> float | None:
+    try:
+        return float(field)
+    except ValueError:
+        return None
+
+
+class TransmitPolicy:
+    """Decides which of the messages a control makes are worth sending.
+
+    Set it on a control to apply it to that control, or on a Control class, for example
+    Control.transmit_policy or Dial.transmit_policy, to apply it to every control of that class
+    that doesn't have its own.
+    """
+
+    __slots__ = ('deadband', 'relative_deadband', 'suppress_identical', 'max_rate')
+
+    def __init__(self, deadband: float = 0.0, relative_deadband: float = 0.0, suppress_identical: bool = True, max_rate: float | None = None):
+        """Decides which of the messages a control makes are worth sending.
+
+        Parameters
+        ----------
+        deadband : float, optional
+            Don't send a message if every number in it is within deadband of the number last sent, by default 0.0
+        relative_deadband : float, optional
+            As deadband but as a fraction of the number last sent, 0.01 is 1%, by default 0.0
+        suppress_identical : bool, optional
+            Don't send a message that is the same as the last one sent, by default True
+        max_rate : float, optional
+            The most messages per second to send. Messages that come too soon are held and the
+            latest one is sent when the interval is up, by default None
+        """
+        self.deadband = deadband
+        self.relative_deadband = relative_deadband
+        self.suppress_identical = suppress_identical
+        self.max_rate = max_rate
+
+    def is_significant(self, previous: str | None, message: str) -> bool:
+        """True if message should be sent when previous was the last message sent.
+
+        Messages are compared field by field, fields that aren't numbers must match exactly.
+        """
+        if previous is None:
+            return True
+        if message == previous:
+            return not self.suppress_identical
+        if not (self.deadband or self.relative_deadband):
+            return True
+        old_fields = previous.split('\t')
+        new_fields = message.split('\t')
+        if len(old_fields) != len(new_fields):
+            return True
+        for old, new in zip(old_fields, new_fields):
+            if old == new:
+                continue
+            old_value, new_value = _number(old), _number(new)
+            if old_value is None or new_value is None:
+                return True
+            if abs(new_value - old_value) > max(self.deadband, self.relative_deadband * abs(old_value)):
+                return True
+        return False
+
+    @property
+    def min_interval(self) -> float:
+        """The shortest time in seconds between messages"""
+        return 1.0 / self.max_rate if self.max_rate else 0.0
@@ -27,7 +27,6 @@ import base64
 import zlib
 
 from .iotcontrol import (
-    Label,
     DeviceView, DeviceViewConfig,
     Menu, MenuConfig,
     ButtonGroup, ButtonGroupConfig,
@@ -37,12 +36,13 @@ from .iotcontrol import (
     Dial, DialConfig,
     ColorPicker, ColorPickerConfig,
     TimeGraph, TimeGraphConfig,
-    Selector,
+    Selector, SelectorConfig,
     Slider, SliderConfig,
     Direction, DirectionConfig,
     EventLog,
     Knob, KnobConfig,
     AudioVisualDisplay, ControlConfig,
+    Label, LabelConfig,
     Map, Table, TableConfig
 )
 
@@ -79,12 +79,12 @@ CONFIG_INSTANCE_DICT = {
     "CLR": ColorPickerConfig,
     "TGRPH": TimeGraphConfig,
     "KNOB": KnobConfig,
-    "SLCTR": ControlConfig,
+    "SLCTR": SelectorConfig,
     "SLDR": SliderConfig,
     "DIR": DirectionConfig,
     "LOG": ControlConfig,
-    "LBL": ControlConfig,
-    "Map": ControlConfig,
+    "LBL": LabelConfig,
+    "MAP": ControlConfig,
     "TBL": TableConfig
 }
 
@@ -105,7 +105,7 @@ def decode_cfg64(cfg: str) -> dict:
     if not cfg:
         return {}
     ztmp_b = base64.b64decode(cfg)
-    tmp_b = zlib.decompress(ztmp_b, wbits=-9)  # Deal with missing header
+    tmp_b = zlib.decompress(ztmp_b, wbits=-15)  # Raw deflate, no header. The largest window also reads streams made with smaller ones.
     try:
         cfg_dict = json.loads(tmp_b)
     except json.JSONDecodeError:
@@ -122,7 +122,11 @@ def encode_cfg64(cfg: dict) -> str:
     Returns:
         str: the cfg encoded as C64 format
     """
-    cfg_json = json.dumps(cfg)
+    return encode_cfg64_json(json.dumps(cfg))
+
+
+def encode_cfg64_json(cfg_json: str) -> str:
+    """Encodes a config already converted to json into C64 string"""
     compress = zlib.compressobj(9, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY)
     tmp_z = compress.compress(cfg_json.encode())
     tmp_z += compress.flush()
@@ -177,24 +181,32 @@ def get_control_dict_from_config(control_type: str, control_id: str, cfg_dict: d
     raise ValueError(f"Control with control_id: {control_id} not found")
 
 
-def load_all_controls_from_config(device, cfg_dict):
+def load_all_controls_from_config(device, cfg_dict: dict, column_no=1):
     """Loads all the controls in cfg_dict into device.
 
+    The config is read in one pass. Configs for controls already in the device, or earlier in
+    cfg_dict, are added to those controls, and the new controls are added to the device together.
+
     Parameters
     ----------
     device : Dashio.Device
         The device to attach the controls to
     cfg_dict : Dict
         dictionary of the CFG loaded by decode_cfg from a CFG64 or json
-
+    column_no: Int From 1 to 3 (default 1).
+        The column config to load the controls into.
     """
+    loaded = device.controls_dict
+    new_controls = {}
     for control_type, control_list in cfg_dict.items():
-        if isinstance(control_list, list):
-            for control in control_list:
-                key = f"{control_type}\t{control['controlID']}"
-                if device.is_control_loaded(control_type, control['controlID']):
-                    cfg = CONFIG_INSTANCE_DICT[control_type].from_dict(control)
-                    device.control_dict[key].add_config_columnar(cfg)
-                else:
-                    new_control = CONTROL_INSTANCE_DICT[control_type].from_cfg_dict(control)
-                    device.add_control(new_control)
+        if not isinstance(control_list, list):
+            continue
+        control_cls = CONTROL_INSTANCE_DICT[control_type]
+        for control in control_list:
+            key = control_type + "\t" + control["controlID"]
+            iot_control = new_controls.get(key) or loaded.get(key)
+            if iot_control is None:
+                new_controls[key] = control_cls.from_cfg_dict(control, column_no=column_no)
+            else:
+                iot_control.add_config(CONFIG_INSTANCE_DICT[control_type].from_dict(control), column_no=column_no)
+    device.add_controls(new_controls.values())
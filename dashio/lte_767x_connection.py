@@ -32,6 +32,7 @@ from .sim767x import Sim767x, ErrorState
 from .constants import CONNECTION_PUB_URL
 from .device import Device
 from .iotcontrol.enums import ConnectionState
+from .priority_outbox import split_frames
 
 
 logger = logging.getLogger(__name__)
@@ -173,7 +174,7 @@ class Lte767xConnection(threading.Thread):
                 break
             if self.rx_zmq_sub in socks and self.connection_state == ConnectionState.CONNECTED:  # If not connected the incoming messages are queued
                 try:
-                    [msg_to, data] = self.rx_zmq_sub.recv_multipart()
+                    msg_to, data, _ = split_frames(self.rx_zmq_sub.recv_multipart())
                     logger.debug("LTE con ZMQ rx: %s, %s", msg_to, data)
                 except ValueError:
                     #  If there aren't two parts continue.
@@ -32,10 +32,12 @@ import time
 import paho.mqtt.client as mqtt  # type: ignore
 import shortuuid  # type: ignore
 import zmq  # type: ignore
-from socket import gaierror
+from .connection_multiplexer import ConnectionMultiplexer
 from .constants import CONNECTION_PUB_URL
+from .priority_outbox import PriorityOutbox, split_frames
+from .rate_governor import ALARM_LANE, ANNOUNCE_LANE, DATA_LANE, RateGovernor
 
-from .iotcontrol.enums import ConnectionState
+from .iotcontrol.enums import ConnectionState, MessagePriority
 
 
 logger = logging.getLogger(__name__)
@@ -118,7 +120,17 @@ class MQTTConnection(threading.Thread):
         """Close the connection."""
         self.running = False
 
-    def __init__(self, host, port, username="", password="", use_ssl=False, context: zmq.Context | None = None):
+    def __init__(
+        self,
+        host,
+        port,
+        username="",
+        password="",
+        use_ssl=False,
+        context: zmq.Context | None = None,
+        multiplexer: ConnectionMultiplexer | None = None,
+        rate_governor: RateGovernor | None = None
+    ):
         """
         Setups and manages a connection thread to the MQTT Server.
 
@@ -137,6 +149,12 @@ class MQTTConnection(threading.Thread):
         -----------------
             use_ssl : bool
                 Whether to use ssl for the connection or not. (default: {False})
+            context : optional
+                ZMQ context. Defaults to None.
+            multiplexer : ConnectionMultiplexer, optional
+                Service the connection from a shared ConnectionMultiplexer instead of its own threads. Defaults to None.
+            rate_governor : RateGovernor, optional
+                Pace announce, alarm, and data publishes with token buckets. Defaults to None, no pacing.
         """
 
         threading.Thread.__init__(self, daemon=True)
@@ -160,6 +178,15 @@ class MQTTConnection(threading.Thread):
         self.mqttc.on_disconnect = self._on_disconnect  # type: ignore
         self.mqttc.on_subscribe = self._on_subscribe
 
+        self.tx_zmq_pub = self.context.socket(zmq.PUB)
+        self.tx_zmq_pub.bind(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
+
+        self.rx_zmq_sub = self.context.socket(zmq.SUB)
+        #  Subscribe on ALL, and my connection
+        self.rx_zmq_sub.setsockopt(zmq.SUBSCRIBE, b"ALL")
+        self.rx_zmq_sub.setsockopt(zmq.SUBSCRIBE, b"MQTT")
+        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, self.zmq_connection_uuid)
+
         if use_ssl:
             self.mqttc.tls_set(
                 ca_certs=None,
@@ -176,14 +203,18 @@ class MQTTConnection(threading.Thread):
         # Connect
         if username and password:
             self.mqttc.username_pw_set(username, password)
-        try:
-            self.mqttc.connect(self.host, self.port)
-            self._connection_state = ConnectionState.CONNECTING
-        except gaierror as error:
-            logger.debug("No connection to internet: %s", str(error))
         # Start subscribe, with QoS level 0
         self._disconnect_timeout = 1.0
-        self.start()
+        self._reconnect_time = None
+        self.rate_governor = rate_governor
+        self._outbox = PriorityOutbox()
+        self._multiplexer = multiplexer
+        self._connect_thread = None
+        self._start_connect()
+        if multiplexer is None:
+            self.start()
+        else:
+            multiplexer.add_connection(self, self.mqttc)
 
     def _mqtt_command(self, msg_dict: dict):
         logger.debug("MQTT CMD: %s", msg_dict)
@@ -192,61 +223,142 @@ class MQTTConnection(threading.Thread):
         if msg_dict['msgType'] == 'disconnect':
             self._del_device_rx(msg_dict)
 
-    def run(self):
-        self.mqttc.loop_start()
+    @property
+    def has_consumers(self) -> bool:
+        """True while connected to the MQTT server"""
+        return self._connection_state == ConnectionState.CONNECTED
 
-        self.tx_zmq_pub = self.context.socket(zmq.PUB)
-        self.tx_zmq_pub.bind(CONNECTION_PUB_URL.format(id=self.zmq_connection_uuid))
+    def _zmq_rx_ready(self) -> bool:
+        return True
 
-        self.rx_zmq_sub = self.context.socket(zmq.SUB)
-        self.tx_zmq_pub = self.context.socket(zmq.PUB)
+    def _service_zmq_rx(self):
+        try:
+            msg_to, data, priority = split_frames(self.rx_zmq_sub.recv_multipart())
+        except ValueError:
+            logger.debug("MQTT value error")
+            return
+        if not data:
+            logger.debug("MQTT no data error")
+            return
+        # logger.debug("DASH: %s ,%s", msg_to, data)
+        if msg_to == b'COMMAND':
+            logger.debug("MQTT RX COMMAND")
+            self._mqtt_command(json.loads(data))
+            return
+        msg_l = data.split(b'\t')
+        try:
+            device_id = msg_l[1].decode().strip()
+        except IndexError:
+            return
+        data_topic = f"{self.username}/{device_id}/data"
+        lane = DATA_LANE
+        if priority == MessagePriority.ALARM or (len(msg_l) > 3 and msg_l[2] == b'ALM'):
+            lane = ALARM_LANE
+        elif len(msg_l) > 2 and msg_l[2] == b'WHO':
+            # ANNOUNCE frames are for the Dash server and aren't subscribed to, but WHO replies
+            # burst on reconnect like announces do.
+            lane = ANNOUNCE_LANE
+        if self._connection_state == ConnectionState.CONNECTED:
+            logger.debug("MQTT Tx →\n%s", data.decode().rstrip())
+            self._publish(priority, lane, data_topic, data.decode())
+
+    def _check_reconnect(self):
+        if self._connection_state != ConnectionState.DISCONNECTED:
+            self._reconnect_time = None
+            return
+        now = time.monotonic()
+        if self._reconnect_time is None:
+            self._disconnect_timeout = min(self._disconnect_timeout, 900)
+            self._reconnect_time = now + self._disconnect_timeout
+            return
+        if now < self._reconnect_time:
+            return
+        self._reconnect_time = None
+        self._start_connect()
+        self._disconnect_timeout = self._disconnect_timeout * 2
+
+    def _connect(self):
+        try:
+            self.mqttc.connect(self.host, self.port)
+            self._connection_state = ConnectionState.CONNECTING
+        except (OSError, ValueError) as error:
+            # Name lookup, refused, timed out, TLS, and bad host or port errors are all retried later.
+            logger.debug("No connection to server: %s", str(error))
+            self._connection_state = ConnectionState.DISCONNECTED
+
+    def _start_connect(self):
+        if self._multiplexer is None:
+            self._connect()
+            return
+        # paho's connect blocks, so connect on another thread rather than hold up every
+        # connection on the multiplexer. The multiplexer leaves the client alone until it's done.
+        self._connection_state = ConnectionState.CONNECTING
+        self._connect_thread = threading.Thread(target=self._connect, name=f"{self.zmq_connection_uuid} connect", daemon=True)
+        self._connect_thread.start()
+
+    def _socket_active(self) -> bool:
+        """True when the multiplexer should service paho's socket."""
+        if self._connect_thread is not None and self._connect_thread.is_alive():
+            return False
+        return self._connection_state != ConnectionState.DISCONNECTED
+
+    def _connection_lost(self):
+        """Called by the multiplexer when servicing the connection fails, it reconnects later."""
+        self._connection_state = ConnectionState.DISCONNECTED
 
-        #  Subscribe on ALL, and my connection
-        self.rx_zmq_sub.setsockopt(zmq.SUBSCRIBE, b"ALL")
-        self.rx_zmq_sub.setsockopt(zmq.SUBSCRIBE, b"MQTT")
-        self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, self.zmq_connection_uuid)
+    def _publish(self, priority: MessagePriority, lane: str, topic: str, payload: str):
+        self._outbox.put(priority, (lane, topic, payload))
+
+    def _can_send(self, priority: MessagePriority, item: tuple) -> bool:
+        # Hold bulk frames back until paho has written what it already has, so alarms and
+        # interactive messages queued behind them don't wait for a whole bulk reply.
+        if priority == MessagePriority.BULK and self.mqttc.want_write():
+            return False
+        if self.rate_governor is None:
+            return True
+        lane, _, payload = item
+        return self.rate_governor.try_acquire(lane, len(payload))
+
+    def _tx_pending(self) -> bool:
+        return len(self._outbox) > 0
+
+    def _service_tx_queues(self):
+        """Publish queued messages in priority order while the rate governor has tokens for them."""
+        if self._connection_state != ConnectionState.CONNECTED:
+            return
+        while True:
+            item = self._outbox.pop(self._can_send)
+            if item is None:
+                break
+            _, topic, payload = item
+            self.mqttc.publish(topic, payload)
+
+    @property
+    def queued_messages(self) -> dict:
+        """The number of messages waiting to be published for each message priority"""
+        return self._outbox.queued()
+
+    def _close_sockets(self):
+        self.tx_zmq_pub.close()
+        self.rx_zmq_sub.close()
+
+    def run(self):
+        self.mqttc.loop_start()
 
         poller = zmq.Poller()
         poller.register(self.rx_zmq_sub, zmq.POLLIN)
 
         while self.running:
             try:
-                socks = dict(poller.poll(100))
+                socks = dict(poller.poll(10 if self._tx_pending() else 100))
             except zmq.error.ContextTerminated:
                 break
             if self.rx_zmq_sub in socks:
-                try:
-                    [msg_to, data] = self.rx_zmq_sub.recv_multipart()
-                except ValueError:
-                    logger.debug("MQTT value error")
-                    continue
-                if not data:
-                    logger.debug("MQTT no data error")
-                    continue
-                # logger.debug("DASH: %s ,%s", msg_to, data)
-                if msg_to == b'COMMAND':
-                    logger.debug("MQTT RX COMMAND")
-                    self._mqtt_command(json.loads(data))
-                    continue
-                msg_l = data.split(b'\t')
-                try:
-                    device_id = msg_l[1].decode().strip()
-                except IndexError:
-                    continue
-                data_topic = f"{self.username}/{device_id}/data"
-                if self._connection_state == ConnectionState.CONNECTED:
-                    logger.debug("MQTT Tx →\n%s", data.decode().rstrip())
-                    self.mqttc.publish(data_topic, data.decode())
-            if self._connection_state == ConnectionState.DISCONNECTED:
-                self._disconnect_timeout = min(self._disconnect_timeout, 900)
-                time.sleep(self._disconnect_timeout)
-                try:
-                    self.mqttc.connect(self.host, self.port)
-                    self._connection_state = ConnectionState.CONNECTING
-                except gaierror as error:
-                    logger.debug("No connection to internet: %s", str(error))
-                self._disconnect_timeout = self._disconnect_timeout * 2
+                # Queue everything waiting so the outbox can order it by priority.
+                while self.rx_zmq_sub.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                    self._service_zmq_rx()
+            self._service_tx_queues()
+            self._check_reconnect()
 
         self.mqttc.loop_stop()
-        self.tx_zmq_pub.close()
-        self.rx_zmq_sub.close()
+        self._close_sockets()
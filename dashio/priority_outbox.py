@@ -0,0 +1,132 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Callable, Iterable, Iterator
+
+from .iotcontrol.enums import MessagePriority
+
+_PRIORITY_FRAMES = {priority: str(priority.value).encode() for priority in MessagePriority}
+
+
+def priority_frame(priority: MessagePriority) -> bytes:
+    """Returns the ZMQ frame used to carry priority with a Device message"""
+    return _PRIORITY_FRAMES[priority]
+
+
+def split_frames(frames: list) -> tuple[bytes, bytes, MessagePriority]:
+    """Splits a Device message into msg_to, data and priority.
+
+    Messages from senders that don't add a priority frame are treated as interactive.
+
+    Raises
+    ------
+    ValueError
+        If there are not two or three frames.
+    """
+    if len(frames) == 2:
+        return frames[0], frames[1], MessagePriority.INTERACTIVE
+    if len(frames) == 3:
+        try:
+            return frames[0], frames[1], MessagePriority(int(frames[2]))
+        except ValueError:
+            return frames[0], frames[1], MessagePriority.INTERACTIVE
+    raise ValueError(f"Expected 2 or 3 frames, got {len(frames)}")
+
+
+def split_reply(reply: str | Iterable[str], max_frame_size: int) -> Iterator[str]:
+    """Split a reply into frames of complete lines no longer than max_frame_size.
+
+    The reply may be a string or an iterable of strings, such as a generator producing the
+    reply a few lines at a time. Frames are yielded as soon as they are full so the whole
+    reply is never held in memory. A single line longer than max_frame_size is sent as a
+    frame of its own.
+    """
+    if isinstance(reply, str):
+        if len(reply) <= max_frame_size:
+            if reply:
+                yield reply
+            return
+        reply = (reply,)
+    frame = []
+    frame_size = 0
+    for piece in reply:
+        for line in piece.splitlines(keepends=True):
+            # Only cut after a newline so a line is never split across frames.
+            if frame and frame_size + len(line) > max_frame_size and frame[-1].endswith("\n"):
+                yield "".join(frame)
+                frame = []
+                frame_size = 0
+            frame.append(line)
+            frame_size += len(line)
+    if frame:
+        yield "".join(frame)
+
+
+class PriorityOutbox:
+    """FIFO queues for each MessagePriority.
+
+    Items are always taken from the highest priority queue that is allowed to send, so
+    alarms and interactive replies overtake the frames of a bulk reply still waiting to go.
+    """
+
+    def __init__(self):
+        self._queues = {priority: deque() for priority in MessagePriority}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def put(self, priority: MessagePriority, item):
+        """Add item to the back of the priority queue."""
+        self._queues[priority].append(item)
+
+    def pop(self, can_send: Callable[[MessagePriority, object], bool] | None = None):
+        """Remove and return the next item to send.
+
+        Parameters
+        ----------
+        can_send : Callable, optional
+            Called with the priority and item at the head of each queue, highest priority first.
+            Returning False skips to the next queue.
+
+        Returns
+        -------
+            The item or None if nothing can be sent.
+        """
+        for priority, queue in self._queues.items():
+            if queue and (can_send is None or can_send(priority, queue[0])):
+                return queue.popleft()
+        return None
+
+    def queued(self) -> dict:
+        """The number of items waiting in each priority queue
+
+        Returns
+        -------
+        dict
+            {priority name: int}
+        """
+        return {priority.name.lower(): len(queue) for priority, queue in self._queues.items()}
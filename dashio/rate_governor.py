@@ -0,0 +1,170 @@
+"""
+MIT License
+
+Copyright (c) 2020 DashIO-Connect
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+ANNOUNCE_LANE = "announce"
+ALARM_LANE = "alarm"
+DATA_LANE = "data"
+
+
+class TokenBucket:
+    """A token bucket that refills continuously at rate tokens per second."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """A token bucket
+
+        Parameters
+        ----------
+        rate : float
+            Tokens added per second.
+        capacity : float, optional
+            Max tokens the bucket can hold, by default one seconds worth of tokens.
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def level(self, now: float | None = None) -> float:
+        """Returns the number of tokens currently in the bucket"""
+        self._refill(now if now is not None else time.monotonic())
+        return self._tokens
+
+    def can_consume(self, amount: float, now: float | None = None) -> bool:
+        """Returns True if amount tokens can be taken now.
+
+        An amount larger than the capacity is allowed once the bucket is full, and
+        leaves the bucket in debt, so oversized messages are delayed rather than blocked forever.
+        """
+        return self.level(now) >= min(amount, self.capacity)
+
+    def consume(self, amount: float):
+        """Take amount tokens from the bucket. The level may go negative."""
+        self._tokens -= amount
+
+
+class RateGovernor:
+    """Paces outgoing messages for a connection with token buckets.
+
+    Each lane (announce, alarm and data) has a messages per second and a bytes per second bucket.
+    A message may only be sent when both buckets of its lane have enough tokens. Messages that
+    can't be sent are left queued by the connection and retried on the next pass.
+
+    Methods
+    -------
+    set_lane_rate(lane, messages_per_sec, bytes_per_sec) :
+        Change the rates for a lane.
+    try_acquire(lane, num_bytes) :
+        Take the tokens for a message if they are available.
+    levels() :
+        Returns the current bucket levels for every lane.
+    """
+
+    def __init__(self, messages_per_sec: float = 20.0, bytes_per_sec: float = 100000.0, burst_seconds: float = 1.0):
+        """Token bucket rate governor
+
+        Parameters
+        ----------
+        messages_per_sec : float, optional
+            Default message rate for each lane, by default 20.0
+        bytes_per_sec : float, optional
+            Default byte rate for each lane, by default 100000.0
+        burst_seconds : float, optional
+            Bucket capacity expressed in seconds of traffic, by default 1.0
+        """
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self._lanes = {}
+        for lane in (ANNOUNCE_LANE, ALARM_LANE, DATA_LANE):
+            self.set_lane_rate(lane, messages_per_sec, bytes_per_sec)
+
+    @property
+    def lanes(self) -> list[str]:
+        """The lane names"""
+        return list(self._lanes)
+
+    def set_lane_rate(self, lane: str, messages_per_sec: float, bytes_per_sec: float):
+        """Set the rates for a lane
+
+        Parameters
+        ----------
+        lane : str
+            One of "announce", "alarm", or "data"
+        messages_per_sec : float
+            Messages per second allowed on the lane
+        bytes_per_sec : float
+            Bytes per second allowed on the lane
+        """
+        with self._lock:
+            self._lanes[lane] = (
+                TokenBucket(messages_per_sec, messages_per_sec * self.burst_seconds),
+                TokenBucket(bytes_per_sec, bytes_per_sec * self.burst_seconds)
+            )
+
+    def try_acquire(self, lane: str, num_bytes: int) -> bool:
+        """Take the tokens for one message of num_bytes on lane.
+
+        Parameters
+        ----------
+        lane : str
+            The lane the message is sent on
+        num_bytes : int
+            The size of the message
+
+        Returns
+        -------
+        bool
+            True if the message can be sent now.
+        """
+        with self._lock:
+            msg_bucket, byte_bucket = self._lanes.get(lane, self._lanes[DATA_LANE])
+            now = time.monotonic()
+            if not (msg_bucket.can_consume(1, now) and byte_bucket.can_consume(num_bytes, now)):
+                return False
+            msg_bucket.consume(1)
+            byte_bucket.consume(num_bytes)
+            return True
+
+    def levels(self) -> dict:
+        """Returns the current bucket levels
+
+        Returns
+        -------
+        dict
+            {lane: {"messages": float, "bytes": float}}
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                lane: {"messages": msg_bucket.level(now), "bytes": byte_bucket.level(now)}
+                for lane, (msg_bucket, byte_bucket) in self._lanes.items()
+            }
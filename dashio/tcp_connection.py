@@ -35,6 +35,8 @@ import zmq
 from . import ip
 from .constants import CONNECTION_PUB_URL
 from .device import Device
+from .iotcontrol.enums import MessagePriority
+from .priority_outbox import PriorityOutbox, split_frames
 from .zeroconf_service import ZeroconfService
 
 logger = logging.getLogger(__name__)
@@ -99,6 +101,7 @@ class TCPConnection(threading.Thread):
         self.ext_url = "tcp://*:" + str(self.local_port)
 
         self.socket_ids = []
+        self._outbox = PriorityOutbox()
         self.local_device_id_list = []
         self.remote_connection_dict = {}
         self.remote_device_con_dict = {}
@@ -228,6 +231,22 @@ class TCPConnection(threading.Thread):
             self._del_device_rx(msg_dict)
 
     def _service_device_messaging(self):
+        try:
+            msg_to, data, priority = split_frames(self.rx_zmq_sub.recv_multipart())
+        except ValueError:
+            logger.debug("TCP value error")
+            return
+        if not data:
+            logger.debug("TCP no data error")
+            return
+        if msg_to == b'COMMAND':
+            self._tcp_command(json.loads(data))
+            return
+        if msg_to == b'ALL' and not self.socket_ids:
+            return
+        self._outbox.put(priority, (msg_to, data))
+
+    def _send_queued_messages(self):
 
         def _zmq_tcp_send(tcp_id, data: bytearray):
             logger.debug("TCP Tx %s →\n%s", tcp_id.hex(), data.decode().rstrip())
@@ -240,26 +259,37 @@ class TCPConnection(threading.Thread):
             except OSError as exc:
                 logger.debug("Socket assignment error: %s", exc)
 
-        try:
-            [msg_to, data] = self.rx_zmq_sub.recv_multipart()
-        except ValueError:
-            logger.debug("TCP value error")
-            return
-        if not data:
-            logger.debug("TCP no data error")
-            return
-        if msg_to == b'ALL':
-            for tcp_id in self.socket_ids:
-                _zmq_tcp_send(tcp_id, data)
-        elif msg_to == b'COMMAND':
-            self._tcp_command(json.loads(data))
-            return
-        else:
-            dest = msg_to.split(b':')[-1]
-            if dest in self.socket_ids:
-                _zmq_tcp_send(dest, data)
-            if dest in self.remote_device_id_msg_dict:
-                self._send_remote_device(dest, data)
+        bulk_sent = False
+
+        def _can_send(priority, _):
+            # Only one bulk frame per pass so new alarms and replies can get in between them.
+            nonlocal bulk_sent
+            if priority != MessagePriority.BULK:
+                return True
+            if bulk_sent:
+                return False
+            bulk_sent = True
+            return True
+
+        while True:
+            item = self._outbox.pop(_can_send)
+            if item is None:
+                break
+            msg_to, data = item
+            if msg_to == b'ALL':
+                for tcp_id in self.socket_ids:
+                    _zmq_tcp_send(tcp_id, data)
+            else:
+                dest = msg_to.split(b':')[-1]
+                if dest in self.socket_ids:
+                    _zmq_tcp_send(dest, data)
+                if dest in self.remote_device_id_msg_dict:
+                    self._send_remote_device(dest, data)
+
+    @property
+    def has_consumers(self) -> bool:
+        """True if any TCP clients are connected"""
+        return bool(self.socket_ids)
 
     def _service_tcp_messages(self, tx_zmq_pub):
         tcp_id = self.tcpsocket.recv()
@@ -301,13 +331,15 @@ class TCPConnection(threading.Thread):
 
         while self.running:
             try:
-                socks = dict(poller.poll(100))
+                socks = dict(poller.poll(0 if len(self._outbox) else 100))
             except zmq.error.ContextTerminated:
                 break
             if self.tcpsocket in socks:
                 self._service_tcp_messages(self.tx_zmq_pub)
             if self.rx_zmq_sub in socks:
-                self._service_device_messaging()
+                while self.rx_zmq_sub.getsockopt(zmq.EVENTS) & zmq.POLLIN:
+                    self._service_device_messaging()
+            self._send_queued_messages()
             if rx_zconf_pull in socks:
                 self._service_zconf_message(rx_zconf_pull)
 
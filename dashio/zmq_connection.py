@@ -33,6 +33,7 @@ from zeroconf import IPVersion, ServiceInfo, Zeroconf
 
 from . import ip
 from .constants import CONNECTION_PUB_URL
+from .priority_outbox import split_frames
 
 
 logger = logging.getLogger(__name__)
@@ -105,6 +106,7 @@ class ZMQConnection(threading.Thread):
         self.running = True
 
         self._device_id_list = []
+        self._subscriptions = 0
         self.zmq_connection_uuid = "ZMQ:" + shortuuid.uuid()
         self.b_zmq_connection_id = self.zmq_connection_uuid.encode('utf-8')
 
@@ -130,6 +132,19 @@ class ZMQConnection(threading.Thread):
         logger.debug("TCP DEVICE_DISCONNECT: %s", device_id)
         #  TODO finish this
 
+    @property
+    def has_consumers(self) -> bool:
+        """True if anyone is subscribed to the external publisher"""
+        return self._subscriptions > 0
+
+    def _service_subscription(self, ext_tx_zmq_pub):
+        # XPUB_VERBOSER passes on every subscribe and unsubscribe so they can be counted.
+        event = ext_tx_zmq_pub.recv()
+        if event[:1] == b'\x01':
+            self._subscriptions += 1
+        elif event[:1] == b'\x00':
+            self._subscriptions = max(self._subscriptions - 1, 0)
+
     def _zmq_command(self, msg_dict: dict):
         logger.debug("TCP CMD: %s", msg_dict)
         if msg_dict['msgType'] == 'connect':
@@ -151,7 +166,8 @@ class ZMQConnection(threading.Thread):
         self.rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, self.zmq_connection_uuid)
         # rx_zmq_sub.setsockopt_string(zmq.SUBSCRIBE, "ANNOUNCE")
 
-        ext_tx_zmq_pub = self.context.socket(zmq.PUB)
+        ext_tx_zmq_pub = self.context.socket(zmq.XPUB)
+        ext_tx_zmq_pub.setsockopt(zmq.XPUB_VERBOSER, 1)
         ext_tx_zmq_pub.bind(self.tx_url_external)
         self.ext_rx_zmq_sub = self.context.socket(zmq.SUB)
         self.ext_rx_zmq_sub.bind(self.rx_url_external)
@@ -162,6 +178,7 @@ class ZMQConnection(threading.Thread):
         poller = zmq.Poller()
         poller.register(self.ext_rx_zmq_sub, zmq.POLLIN)
         poller.register(self.rx_zmq_sub, zmq.POLLIN)
+        poller.register(ext_tx_zmq_pub, zmq.POLLIN)
 
         while self.running:
             try:
@@ -173,15 +190,20 @@ class ZMQConnection(threading.Thread):
                 logger.debug("ZMQ Rx ←\n%s", message.decode('utf-8').rstrip())
                 self.tx_zmq_pub.send_multipart([message, self.b_zmq_connection_id])
 
+            if ext_tx_zmq_pub in socks:
+                self._service_subscription(ext_tx_zmq_pub)
+
             if self.rx_zmq_sub in socks:
-                [msg_to, data] = self.rx_zmq_sub.recv_multipart()
+                try:
+                    msg_to, data, _ = split_frames(self.rx_zmq_sub.recv_multipart())
+                except ValueError:
+                    continue
 
-                if msg_to == b'ALL':
+                if msg_to == b'ALL' and self.has_consumers:
                     logger.debug("ZMQ Tx →\n%s", data.decode('utf-8').rstrip())
                     ext_tx_zmq_pub.send(data)
                 elif msg_to == b'COMMAND':
                     self._zmq_command(json.loads(data))
-                    return
 
         self.tx_zmq_pub.close()
         self.rx_zmq_sub.close()
@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+
+from dashio import CallbackExecutor
+
+
+class TestCallbackExecutor(unittest.TestCase):
+
+    def test_per_key_ordering(self):
+        executor = CallbackExecutor(max_workers=4)
+        results = {"A": [], "B": []}
+        for i in range(50):
+            executor.submit("A", results["A"].append, i)
+            executor.submit("B", results["B"].append, i)
+        executor.shutdown()
+        self.assertEqual(results["A"], list(range(50)))
+        self.assertEqual(results["B"], list(range(50)))
+        self.assertEqual(executor.metrics()["completed"], 100)
+
+    def test_slow_key_doesnt_block_others(self):
+        executor = CallbackExecutor(max_workers=2)
+        release = threading.Event()
+        done = threading.Event()
+        executor.submit("SLOW", release.wait, 1.0)
+        executor.submit("FAST", done.set)
+        self.assertTrue(done.wait(0.5), "A slow key shouldn't hold up other keys")
+        release.set()
+        executor.shutdown()
+
+    def test_metrics(self):
+        executor = CallbackExecutor(max_workers=1, timeout=0.01)
+
+        def fail():
+            raise RuntimeError("fail")
+        executor.submit("A", time.sleep, 0.05)
+        executor.submit("A", fail)
+        executor.shutdown()
+        metrics = executor.metrics()
+        self.assertEqual(metrics["submitted"], 2)
+        self.assertEqual(metrics["failed"], 1)
+        self.assertEqual(metrics["timed_out"], 1)
+        self.assertEqual(metrics["pending"], 0)
+        self.assertGreaterEqual(metrics["run_time_max"], 0.05)
+        self.assertGreaterEqual(metrics["queue_time_max"], 0.04)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -66,6 +66,37 @@ class TestChart(unittest.TestCase):
         cfg_dict = self._get_cfg_dict(test_control.get_cfg(["DEVICEID", "CONTROLID", "DASHID", 1]))
         self.assertEqual(ChartXAxisLabelsStyle(cfg_dict['xAxisLabelsStyle']), ChartXAxisLabelsStyle.BETWEEN, "CFG xAxisLabelsStyle Should be BETWEEN")
 
+    def test_chart_line_precision(self):
+        test_data = ChartLine("LINE", precision=2)
+        test_data.data = [1, 2.345, "a"]
+        self.assertTrue(test_data.get_line_data().endswith("\t1.00\t2.35\ta\n"))
+        test_data.data.append(3)
+        self.assertTrue(test_data.get_line_data().endswith("\t2.35\ta\t3.00\n"), "In place changes should be seen")
+        test_data.data[0] = 4
+        self.assertTrue(test_data.get_line_data().endswith("\t4.00\t2.35\ta\t3.00\n"))
+        test_data.precision = 1
+        self.assertTrue(test_data.get_line_data().endswith("\t4.0\t2.3\ta\t3.0\n"))
+
+    def test_chart_send_chart_changed_lines(self):
+        test_control = Chart("CHARTID", precision=1)
+        sent = []
+        test_control._message_tx_event += sent.append
+        line_1 = ChartLine("ONE")
+        line_2 = ChartLine("TWO")
+        test_control.add_line("L1", line_1)
+        test_control.add_line("L2", line_2)
+        line_1.data = [1, 2]
+        line_2.data = [3, 4]
+        test_control.send_chart(changed_only=True)
+        self.assertEqual(sent[-1].count("\n"), 2)
+        line_2.data[0] = 5
+        test_control.send_chart(changed_only=True)
+        self.assertEqual(sent[-1], "\t{device_id}\tCHRT\tCHARTID\tL2\tTWO\tLINE\t0\tleft\t5.0\t4.0\n")
+        test_control.send_chart(changed_only=True)
+        self.assertEqual(len(sent), 2, "Nothing changed so nothing should be sent")
+        test_control.send_chart()
+        self.assertEqual(sent[-1].count("\n"), 2, "By default every line is sent")
+
 
 if __name__ == '__main__':
     unittest.main()
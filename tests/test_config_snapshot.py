@@ -0,0 +1,74 @@
+import marshal
+import os
+import tempfile
+import unittest
+
+from dashio import ConfigSnapshot, ControlPosition, Device, Knob, encode_cfg64
+from dashio.config_snapshot import _MAGIC, _PYTHON_TAG
+from dashio.load_config import decode_cfg64
+
+
+def _make_c64():
+    knob = Knob("KNOB_ID", control_position=ControlPosition(0.0, 0.0, 1.0, 0.2))
+    return encode_cfg64({"CFG": {"deviceSetup": "", "cfgRev": 3}, "KNOB": knob.get_cfg64(["", "", "DASH_ID", "1"])})
+
+
+class TestConfigSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "device.cfgsnap")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_snapshot_round_trip(self):
+        c64 = _make_c64()
+        snapshot = ConfigSnapshot(self.path, c64)
+        self.assertEqual(snapshot.cfg_dict, decode_cfg64(c64))
+        snapshot.add_payload("HASH", "PAYLOAD")
+        snapshot.flush()
+        reloaded = ConfigSnapshot(self.path, c64)
+        self.assertEqual(reloaded.cfg_dict, snapshot.cfg_dict)
+        self.assertEqual(reloaded.get_payload("HASH"), "PAYLOAD")
+
+    def test_changed_source_rebuilds(self):
+        snapshot = ConfigSnapshot(self.path, _make_c64())
+        snapshot.add_payload("HASH", "PAYLOAD")
+        snapshot.flush()
+        other = ConfigSnapshot(self.path, {"CFG": {"deviceSetup": "", "cfgRev": 4}})
+        self.assertEqual(other.cfg_dict["CFG"]["cfgRev"], 4)
+        self.assertIsNone(other.get_payload("HASH"))
+
+    def test_corrupt_file_rebuilds(self):
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot")
+        c64 = _make_c64()
+        self.assertEqual(ConfigSnapshot(self.path, c64).cfg_dict, decode_cfg64(c64))
+
+    def test_wrong_types_rebuild(self):
+        c64 = _make_c64()
+        snapshot = ConfigSnapshot(self.path, c64)
+        with open(self.path, "wb") as snapshot_file:
+            snapshot_file.write(_MAGIC + b"\n" + _PYTHON_TAG + b"\n" + marshal.dumps((snapshot.source_hash, [], {"HASH": 1})))
+        reloaded = ConfigSnapshot(self.path, c64)
+        self.assertEqual(reloaded.cfg_dict, decode_cfg64(c64))
+        self.assertIsNone(reloaded.get_payload("HASH"))
+
+    def test_device_reuses_payload(self):
+        c64 = _make_c64()
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", cfg_dict=ConfigSnapshot(self.path, c64))
+        reply = test_device._make_cfg64(["DEVICEID", "CFG", "DASH_ID", "1"])
+        self.assertIn("KNOB_ID", str(decode_cfg64(reply.rstrip().rpartition("\t")[2])))
+        test_device._cfg_snapshot.flush()
+        self.assertEqual(len(ConfigSnapshot(self.path, c64)._payloads), 1)
+        test_device._cfg64_cache.clear()
+        encode_calls = []
+        test_device._cfg_snapshot = ConfigSnapshot(self.path, c64)
+        test_device._cfg_snapshot.add_payload = lambda *args: encode_calls.append(args)
+        self.assertEqual(test_device._make_cfg64(["DEVICEID", "CFG", "DASH_ID", "1"]), reply)
+        self.assertEqual(encode_calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+import paho.mqtt.client as mqtt
+
+from dashio import ConnectionMultiplexer, ConnectionState, DashConnection, MQTTConnection
+
+
+class _FakeBroker(threading.Thread):
+    """Accepts one client and answers its CONNECT with a CONNACK."""
+
+    def __init__(self):
+        threading.Thread.__init__(self, daemon=True)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.start()
+
+    def run(self):
+        client, _ = self.server.accept()
+        client.recv(1024)
+        client.sendall(b"\x20\x02\x00\x00")
+        time.sleep(2)
+        client.close()
+        self.server.close()
+
+
+def _wait_for(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestConnectionMultiplexer(unittest.TestCase):
+
+    def test_multiplexed_connection_has_no_thread(self):
+        mux = ConnectionMultiplexer()
+        connection = DashConnection(multiplexer=mux)
+        self.assertFalse(connection.is_alive(), "Multiplexed connection shouldn't start its own thread")
+        self.assertEqual(mux.number_of_connections, 1)
+        connection.close()
+        self.assertTrue(_wait_for(lambda: mux.number_of_connections == 0), "Closed connection should be removed")
+        mux.close()
+
+    def test_multiplexer_drives_paho_client(self):
+        broker = _FakeBroker()
+        mux = ConnectionMultiplexer()
+        connection = MQTTConnection("127.0.0.1", broker.port, multiplexer=mux)
+        self.assertTrue(
+            _wait_for(lambda: connection._connection_state == ConnectionState.CONNECTED),
+            "Multiplexer should read the CONNACK"
+        )
+        connection.close()
+        mux.close()
+
+    def test_slow_connect_doesnt_block_others(self):
+        real_connect = mqtt.Client.connect
+
+        def slow_connect(client, host, *args, **kwargs):
+            if host == "slow.invalid":
+                time.sleep(1)
+                raise socket.gaierror("slow lookup")
+            return real_connect(client, host, *args, **kwargs)
+
+        with mock.patch.object(mqtt.Client, "connect", slow_connect):
+            mux = ConnectionMultiplexer()
+            start = time.monotonic()
+            slow = MQTTConnection("slow.invalid", 1883, multiplexer=mux)
+            self.assertLess(time.monotonic() - start, 0.5, "Connecting shouldn't block the caller")
+            broker = _FakeBroker()
+            connection = MQTTConnection("127.0.0.1", broker.port, multiplexer=mux)
+            self.assertTrue(
+                _wait_for(lambda: connection._connection_state == ConnectionState.CONNECTED, 0.8),
+                "Other connections should connect while one is still connecting"
+            )
+            self.assertTrue(_wait_for(lambda: slow._connection_state == ConnectionState.DISCONNECTED), "A failed connect is retried later")
+        slow.close()
+        connection.close()
+        mux.close()
+
+    def test_failing_client_is_isolated(self):
+        mux = ConnectionMultiplexer()
+        bad_broker = _FakeBroker()
+        with self.assertLogs("dashio.connection_multiplexer", "ERROR"):
+            bad = MQTTConnection("127.0.0.1", bad_broker.port, multiplexer=mux)
+            bad.mqttc.loop_read = mock.Mock(side_effect=RuntimeError("broken client"))
+            self.assertTrue(_wait_for(lambda: bad.mqttc.loop_read.called))
+            self.assertTrue(_wait_for(lambda: bad._connection_state == ConnectionState.DISCONNECTED), "A failed client should be marked disconnected")
+        broker = _FakeBroker()
+        connection = MQTTConnection("127.0.0.1", broker.port, multiplexer=mux)
+        self.assertTrue(
+            _wait_for(lambda: connection._connection_state == ConnectionState.CONNECTED),
+            "The multiplexer should keep servicing the other connections"
+        )
+        bad.close()
+        connection.close()
+        mux.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
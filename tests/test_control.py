@@ -1,7 +1,12 @@
 import json
+import threading
+import time
 import unittest
 
-from dashio import Control
+from dashio import Button, Control, Dial, Knob, Slider, Table, TableRow, TransmitPolicy
+from dashio import Color, TitlePosition
+from dashio.iotcontrol.control import ControlConfig, _get_color, _get_title_position
+from dashio.iotcontrol.event import Event
 
 
 class TestControl(unittest.TestCase):
@@ -13,6 +18,167 @@ class TestControl(unittest.TestCase):
         test_control = Control("CONTROLTYPE", "CONTROLID")
         self.assertEqual(test_control._control_hdr_str, '\t{device_id}\tCONTROLTYPE\tCONTROLID\t', "ControlID Should be CONTROLID")
 
+    def test_controls_are_slotted(self):
+        for test_control in (Dial("DIALID"), Slider("SLIDERID"), Button("BUTTONID"), Table("TABLEID")):
+            self.assertFalse(vars(test_control), f"{type(test_control).__name__} attributes should all have slots")
+        test_control = Dial("DIALID")
+        test_control.transmit_policy = TransmitPolicy()
+        self.assertIsInstance(test_control.transmit_policy, TransmitPolicy)
+
+    def test_columns_not_shared(self):
+        first = Control("CONTROLTYPE", "CONTROLID1")
+        second = Control("CONTROLTYPE", "CONTROLID2")
+        first.add_config(ControlConfig("CONTROLID1", "Title", None, None), column_no=2)
+        self.assertEqual(len(first.get_cfg(["", "", "DASHID", "2"])), 1)
+        self.assertEqual(second.get_cfg(["", "", "DASHID", "2"]), [])
+        first.del_config(column_no=2)
+        self.assertEqual(first.get_cfg(["", "", "DASHID", "2"]), [])
+
+    def test_enum_lookup(self):
+        self.assertIs(_get_color("4"), Color.RED)
+        self.assertIs(_get_color("Orange Red"), Color.ORANGE_RED)
+        self.assertEqual(_get_color("#FFFFFF"), "#FFFFFF")
+        self.assertIs(_get_title_position("Bottom"), TitlePosition.BOTTOM)
+        self.assertIs(_get_title_position("bottom"), TitlePosition.BOTTOM)
+        self.assertIs(_get_title_position("B o t t o m"), TitlePosition.BOTTOM)
+        with self.assertRaises(KeyError):
+            _get_title_position("Middle")
+
+    def test_event_handlers(self):
+        event = Event()
+        calls = []
+        event += calls.append
+        event += calls.append
+        self.assertEqual(len(event), 1)
+        event("fired")
+        self.assertEqual(calls, ["fired"])
+        event -= calls.append
+        self.assertEqual(len(event), 0)
+        with self.assertRaises(ValueError):
+            event -= calls.append
+
+
+class TestTransmitPolicy(unittest.TestCase):
+
+    def _make_dial(self, policy):
+        test_control = Dial("DIALID")
+        test_control.transmit_policy = policy
+        sent = []
+        test_control.add_transmit_message_callback(sent.append)
+        return test_control, sent
+
+    def test_no_policy_sends_everything(self):
+        test_control, sent = self._make_dial(None)
+        for _ in range(3):
+            test_control.dial_value = 1
+        self.assertEqual(len(sent), 3)
+
+    def test_suppress_identical(self):
+        test_control, sent = self._make_dial(TransmitPolicy())
+        for value in (1, 1, 2, 2, 1):
+            test_control.dial_value = value
+        self.assertEqual([msg.rsplit('\t', 1)[1] for msg in sent], ["1\n", "2\n", "1\n"])
+
+    def test_deadband(self):
+        test_control, sent = self._make_dial(TransmitPolicy(deadband=0.5))
+        for value in (10.0, 10.2, 10.4, 10.6, 10.7, 9.0):
+            test_control.dial_value = value
+        self.assertEqual([msg.rsplit('\t', 1)[1] for msg in sent], ["10.0\n", "10.6\n", "9.0\n"], "Changes are measured from the last value sent")
+
+    def test_relative_deadband(self):
+        policy = TransmitPolicy(relative_deadband=0.1)
+        self.assertFalse(policy.is_significant("\tA\t100\n", "\tA\t109\n"))
+        self.assertTrue(policy.is_significant("\tA\t100\n", "\tA\t111\n"))
+        self.assertTrue(policy.is_significant("\tA\t100\n", "\tB\t100.5\n"), "Text fields must match")
+
+    def test_max_rate_trailing_edge(self):
+        test_control, sent = self._make_dial(TransmitPolicy(max_rate=20))
+        for value in range(10):
+            test_control.dial_value = value
+        self.assertEqual(len(sent), 1, "Only the first message should be sent straight away")
+        time.sleep(0.2)
+        self.assertEqual([msg.rsplit('\t', 1)[1] for msg in sent], ["0\n", "9\n"], "The latest value should be sent when the interval is up")
+
+    def test_class_policy_and_keys(self):
+        Table.transmit_policy = TransmitPolicy()
+        try:
+            test_control = Table("TABLEID", columns=3)
+            sent = []
+            test_control.add_transmit_message_callback(sent.append)
+            for _ in range(2):
+                test_control.update_table_row(TableRow("A", ["1", "2"]), 0)
+                test_control.update_table_row(TableRow("B", ["1", "2"]), 1)
+            self.assertEqual(len(sent), 2, "Each row is compared with the last message for that row")
+            test_control.clear_table()
+            test_control.clear_table()
+            test_control.update_table_row(TableRow("A", ["1", "2"]), 0)
+            self.assertEqual(len(sent), 5, "Clearing the table resets what has been sent")
+        finally:
+            Table.transmit_policy = None
+
+    def test_slider_and_knob_streams(self):
+        test_control = Slider("SLIDERID")
+        test_control.transmit_policy = TransmitPolicy()
+        sent = []
+        test_control.add_transmit_message_callback(sent.append)
+        for _ in range(3):
+            test_control.bar1_value = 5
+        self.assertEqual(len(sent), 1, "Repeated bar values should be suppressed")
+        test_control.slider_value = 5
+        self.assertEqual(sent[-1].split('\t')[2:], ["SLDR", "SLIDERID", "5\n"], "The slider is paced apart from the bar")
+        self.assertEqual(len(sent), 2)
+
+        test_control = Knob("KNOBID")
+        test_control.transmit_policy = TransmitPolicy(max_rate=20)
+        sent = []
+        test_control.add_transmit_message_callback(sent.append)
+        for value in range(10):
+            test_control.knob_value = value
+            test_control.knob_dial_value = value
+        self.assertEqual(len(sent), 2, "The first KNOB and KBDL messages should be sent straight away")
+        time.sleep(0.2)
+        self.assertEqual(sorted(msg.split('\t', 2)[2] for msg in sent[2:]), ["KBDL\tKNOBID\t9\n", "KNOB\tKNOBID\t9\n"])
+
+
+class TestRxCoalescing(unittest.TestCase):
+
+    def test_latest_wins(self):
+        test_control = Slider("SLIDERID")
+        received = []
+        release = threading.Event()
+
+        def slow_callback(msg):
+            release.wait(1.0)
+            received.append(msg[3])
+        test_control.add_receive_message_callback(slow_callback)
+        test_control.enable_rx_coalescing()
+        for value in range(20):
+            test_control._process_rx_message(["DEVICEID", "SLDR", "SLIDERID", str(value)])
+        release.set()
+        time.sleep(0.1)
+        test_control.disable_rx_coalescing()
+        self.assertEqual(received[-1], "19", "The newest value should always be delivered")
+        self.assertLess(len(received), 20, "Values that arrived while busy should be dropped")
+
+    def test_max_rate(self):
+        test_control = Slider("SLIDERID")
+        received = []
+        test_control.add_receive_message_callback(lambda msg: received.append(msg[3]))
+        test_control.enable_rx_coalescing(max_rate=10)
+        test_control._process_rx_message(["DEVICEID", "SLDR", "SLIDERID", "1"])
+        time.sleep(0.02)
+        test_control._process_rx_message(["DEVICEID", "SLDR", "SLIDERID", "2"])
+        test_control._process_rx_message(["DEVICEID", "SLDR", "SLIDERID", "3"])
+        time.sleep(0.02)
+        self.assertEqual(received, ["1"])
+        time.sleep(0.15)
+        test_control.disable_rx_coalescing()
+        self.assertEqual(received, ["1", "3"])
+
+    def test_buttons_keep_every_message(self):
+        with self.assertRaises(ValueError):
+            Button("BUTTONID").enable_rx_coalescing()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import unittest
+
+import dashio
+from dashio.control_registry import ControlRegistry
+
+
+class TestControlRegistry(unittest.TestCase):
+
+    def test_dict_api(self):
+        registry = ControlRegistry()
+        knob = dashio.Knob("KB1")
+        registry["KNOB\tKB1"] = knob
+        self.assertIn("KNOB\tKB1", registry)
+        self.assertIs(registry["KNOB\tKB1"], knob)
+        self.assertIs(registry.get("KNOB\tKB2"), None)
+        self.assertEqual(len(registry), 1)
+        self.assertEqual(list(registry), ["KNOB\tKB1"])
+        del registry["KNOB\tKB1"]
+        self.assertEqual(len(registry), 0)
+        with self.assertRaises(KeyError):
+            del registry["KNOB\tKB1"]
+        self.assertIs(registry.pop("KNOB\tKB1", None), None)
+
+    def test_setdefault_keeps_first(self):
+        registry = ControlRegistry()
+        first = dashio.Knob("KB1")
+        self.assertIs(registry.setdefault("KNOB\tKB1", first), first)
+        self.assertIs(registry.setdefault("KNOB\tKB1", dashio.Knob("KB1")), first)
+
+    def test_type_index(self):
+        registry = ControlRegistry()
+        knob1 = dashio.Knob("KB1")
+        knob2 = dashio.Knob("KB2")
+        dial = dashio.Dial("DL1")
+        registry.update({"KNOB\tKB1": knob1, "DIAL\tDL1": dial, "KNOB\tKB2": knob2})
+        self.assertEqual(registry.by_type("KNOB"), (knob1, knob2))
+        self.assertEqual(registry.by_type("DIAL"), (dial,))
+        self.assertEqual(registry.by_type("TGRPH"), ())
+        self.assertEqual(list(registry.types()), ["KNOB", "DIAL"])
+        index = registry.types()
+        self.assertIs(registry.types(), index)
+        del registry["KNOB\tKB1"]
+        self.assertEqual(registry.by_type("KNOB"), (knob2,))
+        self.assertEqual(index["KNOB"], (knob1, knob2))
+
+    def test_snapshot_is_unchanged_by_mutation(self):
+        registry = ControlRegistry()
+        registry["KNOB\tKB1"] = dashio.Knob("KB1")
+        snapshot = registry.snapshot()
+        registry["KNOB\tKB2"] = dashio.Knob("KB2")
+        self.assertEqual(len(snapshot), 1)
+        with self.assertRaises(TypeError):
+            snapshot["KNOB\tKB3"] = None
+
+    def test_iterate_while_mutating(self):
+        registry = ControlRegistry()
+        for i in range(50):
+            registry[f"KNOB\tKB{i}"] = dashio.Knob(f"KB{i}")
+        stop = threading.Event()
+        errors = []
+
+        def writer():
+            i = 50
+            while not stop.is_set():
+                registry[f"KNOB\tKB{i}"] = dashio.Knob(f"KB{i}")
+                del registry[f"KNOB\tKB{i - 50}"]
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(200):
+                for control in registry.values():
+                    control.get_state()
+        except RuntimeError as err:
+            errors.append(err)
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,20 @@
 import json
+import threading
+import time
 import unittest
+from unittest import mock
 
-from dashio import Device
+import zmq
+
+from dashio import (CallbackExecutor, Color, ControlPosition, Device, DeviceView, Dial, Knob, Label, MessagePriority, TextBox, TimeGraph, TimeGraphLine,
+                    decode_cfg64, encode_cfg64)
+
+
+class _IdleConnection:
+    def __init__(self, has_consumers):
+        self.zmq_connection_uuid = f"IDLE:{id(self)}"
+        self.rx_zmq_sub = zmq.Context.instance().socket(zmq.SUB)
+        self.has_consumers = has_consumers
 
 
 class TestDashDevice(unittest.TestCase):
@@ -25,6 +38,211 @@ class TestDashDevice(unittest.TestCase):
         test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME",)
         self.assertEqual(test_device._cfg['numDeviceViews'], 0, "editLock type should be 0")
 
+    def test_dash_device_status_is_bulk(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        test_device.add_control(TextBox("TB_ID"))
+        reply, priority = test_device._on_command("DEVICEID\tSTATUS")
+        self.assertIn("TB_ID", "".join(reply))
+        self.assertEqual(priority, MessagePriority.BULK)
+
+    def test_dash_device_time_graph_history_reply(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        t_graph = TimeGraph("TG_ID")
+        t_graph.add_line("L1", TimeGraphLine("line"))
+        t_graph.line_dict["L1"].add_data_point(1.0)
+        test_device.add_control(t_graph)
+        reply, priority = test_device._on_command("DEVICEID\tTGRPH\tTG_ID\tDASH_ID\t2000-01-01T00:00:00Z")
+        self.assertTrue("".join(reply).startswith("\tDEVICEID\tTGRPH\tTG_ID\tDASH_ID\tL1"), "History should be returned as the reply")
+        self.assertEqual(priority, MessagePriority.BULK)
+
+    def test_dash_device_callback_executor(self):
+        executor = CallbackExecutor(max_workers=2)
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", callback_executor=executor)
+        knob = Knob("KNOB_ID")
+        release = threading.Event()
+        received = []
+        knob.add_receive_message_callback(lambda msg: (release.wait(1.0), received.append(msg[3])))
+        test_device.add_control(knob)
+        for value in ("1", "2", "3"):
+            test_device._on_command(f"DEVICEID\tKNOB\tKNOB_ID\t{value}")
+        reply, _ = test_device._on_command("DEVICEID\tSTATUS")
+        self.assertIn("KNOB_ID", "".join(reply), "STATUS should be answered while the callback is busy")
+        self.assertEqual(received, [])
+        release.set()
+        executor.shutdown()
+        self.assertEqual(received, ["1", "2", "3"], "Callbacks for a control should run in order")
+
+    def _listen(self, test_device):
+        connection = _IdleConnection(True)
+        connection.rx_zmq_sub.setsockopt(zmq.SUBSCRIBE, b"ALL")
+        test_device.register_connection(connection)
+        time.sleep(0.1)
+        return connection.rx_zmq_sub
+
+    def _receive(self, sub_socket) -> list:
+        messages = []
+        while sub_socket.poll(500):
+            messages.append(sub_socket.recv_multipart()[1].decode())
+        return messages
+
+    def test_dash_device_setup_reply_sent_by_device_thread(self):
+        executor = CallbackExecutor(max_workers=2)
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", callback_executor=executor)
+        sub_socket = self._listen(test_device)
+        called_on = []
+        test_device.set_wifi_callback(lambda msg: called_on.append(threading.current_thread()) or True)
+        reply, _ = test_device._on_command("DEVICEID\tWIFI\tSSID\tPASSWORD\tNZ")
+        self.assertEqual(reply, "")
+        executor.shutdown()
+        self.assertIsNot(called_on[0], test_device, "The callback should run on the executor")
+        self.assertIn("\tDEVICEID\tWIFI\n", self._receive(sub_socket))
+        self.assertFalse(test_device._tx_queue, "The Device thread should send queued messages")
+
+    def test_dash_device_control_set_from_executor_callback(self):
+        executor = CallbackExecutor(max_workers=2)
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", callback_executor=executor)
+        sub_socket = self._listen(test_device)
+        knob = Knob("KNOB_ID")
+        dial = Dial("DIAL_ID")
+        knob.add_receive_message_callback(lambda msg: setattr(dial, "dial_value", float(msg[3])))
+        test_device.add_control(knob)
+        test_device.add_control(dial)
+        for value in ("1", "2", "3"):
+            test_device._on_command(f"DEVICEID\tKNOB\tKNOB_ID\t{value}")
+        executor.shutdown()
+        messages = self._receive(sub_socket)
+        self.assertIn("\tDEVICEID\tDIAL\tDIAL_ID\t3.0\n", messages, "Values set on executor threads should be sent")
+        self.assertIn("\tDEVICEID\tKNOB\tKNOB_ID\t3\n", messages, "The echo of the knob should be sent")
+        self.assertFalse(test_device._tx_queue)
+
+    def test_dash_device_control_set_from_rx_mailbox(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        sub_socket = self._listen(test_device)
+        knob = Knob("KNOB_ID")
+        dial = Dial("DIAL_ID")
+        called_on = []
+
+        def knob_handler(msg):
+            called_on.append(threading.current_thread())
+            dial.dial_value = float(msg[3])
+
+        knob.add_receive_message_callback(knob_handler)
+        knob.enable_rx_coalescing()
+        test_device.add_control(knob)
+        test_device.add_control(dial)
+        test_device._on_command("DEVICEID\tKNOB\tKNOB_ID\t7")
+        messages = self._receive(sub_socket)
+        knob.disable_rx_coalescing()
+        self.assertNotIn(called_on[0], (test_device, threading.main_thread()), "The callback should run on the mailbox thread")
+        self.assertIn("\tDEVICEID\tDIAL\tDIAL_ID\t7.0\n", messages)
+        self.assertIn("\tDEVICEID\tKNOB\tKNOB_ID\t7\n", messages)
+        self.assertFalse(test_device._tx_queue)
+
+    def test_dash_device_has_consumers(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        self.assertFalse(test_device.has_consumers, "No connections means no consumers")
+        test_device.register_connection(_IdleConnection(False))
+        self.assertFalse(test_device.has_consumers)
+        test_device.register_connection(_IdleConnection(True))
+        self.assertTrue(test_device.has_consumers)
+
+    def test_dash_device_idle_controls_skip_formatting(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        test_device.register_connection(_IdleConnection(False))
+        test_control = TimeGraph("TG_ID")
+        line = TimeGraphLine("LINE")
+        test_control.add_line("L1", line)
+        test_device.add_control(test_control)
+        line.add_data_point(1.0)
+        self.assertFalse(test_control.has_consumers)
+        with mock.patch.object(TimeGraphLine, "get_latest_data") as get_latest_data:
+            test_control.send_data()
+        get_latest_data.assert_not_called()
+        test_control.send_new_data()
+        self.assertEqual(line.get_new_data(), "", "Data added while idle is counted as sent")
+
+        test_device.register_connection(_IdleConnection(True))
+        self.assertTrue(test_control.has_consumers)
+        with mock.patch.object(TimeGraphLine, "get_latest_data", return_value="") as get_latest_data:
+            test_control.send_data()
+        get_latest_data.assert_called_once()
+
+    def test_dash_device_add_all_c64_controls(self):
+        position = ControlPosition(0.0, 0.0, 1.0, 0.2)
+        source = [
+            Knob("KNOB_ID", dial_color=Color.AQUA, control_position=position),
+            Dial("DIAL_ID", control_position=position),
+            DeviceView("DV_ID"),
+            Label("LBL_ID", color=Color.RED, control_position=position)
+        ]
+        c64_dict = {"CFG": {"deviceSetup": "name"}}
+        for control in source:
+            c64_dict.setdefault(control.ctrl_type, []).extend(control.get_cfg64(["", "", "DASH_ID", "1"]))
+        c64_dict = decode_cfg64(encode_cfg64(c64_dict))
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        test_device.add_all_c64_controls(c64_dict)
+        self.assertEqual(len(test_device.controls_dict), 4)
+        self.assertEqual(test_device._cfg["numDeviceViews"], 1)
+        self.assertIn("name", test_device._cfg["deviceSetup"])
+        for control in source:
+            loaded = test_device.controls_dict[f"{control.ctrl_type}\t{control.control_id}"]
+            self.assertEqual(loaded.get_cfg64(["", "", "DASH_ID", "1"]), control.get_cfg64(["", "", "DASH_ID", "1"]))
+        test_device.add_all_c64_controls(c64_dict, column_no=2)
+        self.assertEqual(len(test_device.controls_dict), 4)
+        self.assertEqual(test_device._cfg["numDeviceViews"], 1)
+        self.assertEqual(len(test_device.controls_dict["KNOB\tKNOB_ID"].get_cfg64(["", "", "DASH_ID", "2"])), 1)
+
+    def test_dash_device_add_controls(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        knob = Knob("KNOB_ID")
+        test_device.add_control(knob)
+        self.assertEqual(test_device.add_controls([Knob("KNOB_ID"), TextBox("TB_ID"), TextBox("TB_ID")]), 1)
+        self.assertIs(test_device.controls_dict["KNOB\tKNOB_ID"], knob)
+        self.assertEqual(list(test_device.controls_dict), ["KNOB\tKNOB_ID", "TEXT\tTB_ID"])
+
+    def test_dash_device_cfg_rev_from_content(self):
+        position = ControlPosition(0.0, 0.0, 1.0, 0.5)
+        devices = []
+        for _ in range(2):
+            test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", cfg_rev_from_content=True)
+            test_device.add_control(Knob("KNOB_ID", control_position=position))
+            devices.append(test_device)
+        revision = devices[0].config_revision
+        self.assertEqual(revision, devices[1].config_revision, "The same config should give the same cfgRev")
+        self.assertGreater(revision, 0)
+        reply, _ = devices[0]._on_command("WHO")
+        self.assertTrue(reply.endswith(f"\t{revision}\n"))
+        cfg_dict = decode_cfg64(devices[0]._on_command("DEVICEID\tCFG\tDASH_ID\t1")[0].rpartition("\t")[2].strip())
+        self.assertEqual(cfg_dict["CFG"]["cfgRev"], revision)
+
+        devices[0].inc_config_revision()
+        self.assertEqual(devices[0].config_revision, revision, "Bumping an unchanged config shouldn't change cfgRev")
+
+        devices[0].add_control(TextBox("TB_ID", control_position=position))
+        added_revision = devices[0].config_revision
+        self.assertNotEqual(added_revision, revision)
+        devices[0].controls_dict["KNOB\tKNOB_ID"].add_config(Knob("KNOB_ID", control_position=position)._columns_cfg[0][0], column_no=2)
+        self.assertNotEqual(devices[0].config_revision, added_revision)
+        devices[0].remove_control(devices[0].controls_dict["TEXT\tTB_ID"])
+        self.assertNotEqual(devices[0].config_revision, revision)
+
+        devices[1].controls_dict["KNOB\tKNOB_ID"]._columns_cfg[0][0].cfg["title"] = "Edited"
+        devices[1].inc_config_revision()
+        self.assertNotEqual(devices[1].config_revision, revision, "Editing a config in place should change cfgRev")
+
+    def test_dash_device_cfg_rev_from_content_device_view(self):
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME", cfg_rev_from_content=True)
+        knob = Knob("KNOB_ID", control_position=ControlPosition(0.0, 0.0, 1.0, 0.5))
+        device_view = DeviceView("DV_ID", "A View")
+        test_device.add_control(knob)
+        test_device.add_control(device_view)
+        revision = test_device.config_revision
+        device_view.add_control(knob)
+        moved_revision = test_device.config_revision
+        self.assertNotEqual(moved_revision, revision, "Changing the parentID should change cfgRev")
+        knob._columns_cfg[0][0].update_position(ControlPosition(0.0, 0.5, 1.0, 0.5))
+        self.assertNotEqual(test_device.config_revision, moved_revision, "Moving a control should change cfgRev")
+
 
 if __name__ == '__main__':
     unittest.main()
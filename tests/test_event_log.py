@@ -1,4 +1,5 @@
 import json
+import tempfile
 import unittest
 from datetime import datetime
 
@@ -28,6 +29,38 @@ class TestEventLog(unittest.TestCase):
         test_str_list = test_control._control_hdr_str.split('\t')
         self.assertEqual(test_str_list[3], 'EVENTLOGID', "control_id type should be EVENTLOGID")
 
+    def test_event_log_history_is_split_into_lines(self):
+        test_control = EventLog("ELID", max_log_entries=200)
+        test_control.HISTORY_ENTRIES_PER_LINE = 50
+        for i in range(120):
+            test_control.log.append(EventData(f"Line {i}"))
+        history = list(test_control._process_rx_message(["DEVICEID", "LOG", "ELID", "DASHID", "2000-01-01T00:00:00Z"]))
+        self.assertEqual(len(history), 3, "120 entries should be sent as three lines")
+        self.assertEqual(sum(line.count("{\"time\"") for line in history), 120)
+        for line in history:
+            self.assertTrue(line.startswith("\t{device_id}\tLOG\tELID\tDASHID\t{"))
+            self.assertTrue(line.endswith("\n"))
+
+    def test_event_log_storage_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test_control = EventLog("ELID", max_log_entries=5, storage_dir=tmp_dir)
+            for i in range(20):
+                test_control.add_event_data(EventData(f"Line {i}"))
+            history = list(test_control._process_rx_message(["DEVICEID", "LOG", "ELID", "DASHID", "2000-01-01T00:00:00Z"]))
+            self.assertEqual(sum(line.count("{\"time\"") for line in history), 20, "History should come from the store")
+            test_control.close()
+            test_control = EventLog("ELID", storage_dir=tmp_dir)
+            sent = []
+            test_control._message_tx_event += sent.append
+            test_control.send_latest_data()
+            self.assertTrue(sent[0].endswith("\tLine 19\n"), "Latest entry should survive a restart")
+            test_control.close()
+
+    def test_event_data_json_round_trip(self):
+        test_data = EventData("Line 1\nLine 2", Color.RED)
+        copy = EventData.from_json(test_data.to_json())
+        self.assertEqual(str(copy), str(test_data))
+
 
 if __name__ == '__main__':
     unittest.main()
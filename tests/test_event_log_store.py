@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from dashio.iotcontrol.event_log_store import EventLogStore
+
+
+class TestEventLogStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_event_log_store_since(self):
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=200, index_every=4)
+        for i in range(100):
+            store.append(i * 10, f"entry {i}")
+        self.assertGreater(len(os.listdir(self.tmp_dir.name)), 1, "Should have rolled to new segments")
+        self.assertEqual(list(store.since(955)), ["entry 96", "entry 97", "entry 98", "entry 99"])
+        self.assertEqual(len(list(store.since(-1))), 100)
+        self.assertEqual(list(store.since(990)), [])
+        self.assertEqual(store.latest(), "entry 99")
+        store.close()
+
+    def test_event_log_store_reopen(self):
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=100)
+        for i in range(20):
+            store.append(i, f"entry {i}")
+        store.close()
+        path = os.path.join(self.tmp_dir.name, sorted(os.listdir(self.tmp_dir.name))[-1])
+        with open(path, 'ab') as outfile:
+            outfile.write(b"20\tpartial")
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=100)
+        self.assertEqual(len(store), 20, "The partial entry should be dropped")
+        store.append(21, "entry 21")
+        self.assertEqual(list(store.since(18)), ["entry 19", "entry 21"])
+        store.close()
+
+    def test_event_log_store_retention(self):
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=100, max_bytes=300)
+        for i in range(100):
+            store.append(i, f"entry {i}")
+        self.assertLessEqual(sum(os.path.getsize(os.path.join(self.tmp_dir.name, name)) for name in os.listdir(self.tmp_dir.name)), 400)
+        self.assertEqual(list(store.since(-1))[-1], "entry 99")
+        store.close()
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=100, max_age=5)
+        store.append(200, "entry 200")
+        store.append(201, "entry 201")
+        store.close()
+        store = EventLogStore(self.tmp_dir.name, segment_bytes=100, max_age=5)
+        self.assertEqual(list(store.since(-1)), ["entry 200", "entry 201"], "Old segments should be removed")
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
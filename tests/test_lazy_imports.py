@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import unittest
+
+import dashio
+import dashio.iotcontrol
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_all_names_resolve(self):
+        for name in dashio.__all__:
+            self.assertTrue(hasattr(dashio, name), name)
+        for name in dashio.iotcontrol.__all__:
+            self.assertTrue(hasattr(dashio.iotcontrol, name), name)
+        self.assertIs(dashio.Knob, dashio.iotcontrol.Knob)
+
+    def test_dir_lists_public_names(self):
+        self.assertTrue(set(dashio.__all__) <= set(dir(dashio)))
+
+    def test_submodule_attributes(self):
+        self.assertIs(dashio.iotcontrol.enums.Color, dashio.Color)
+        code = "import dashio\nprint(dashio.iotcontrol.knob.Knob.__name__)\n"
+        output = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "Knob")
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            dashio.NotAControl
+
+    def test_import_loads_no_connections(self):
+        code = (
+            "import sys, dashio\n"
+            "dashio.Knob\n"
+            "print(' '.join(sorted(sys.modules)))\n"
+        )
+        modules = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+        for module in ("paho", "zeroconf", "serial", "dashio.mqtt_connection", "dashio.tcp_connection", "dashio.device"):
+            self.assertNotIn(module, modules)
+        self.assertIn("dashio.iotcontrol.knob", modules)
+
+    def test_device_loads_no_controls(self):
+        code = (
+            "import sys, dashio\n"
+            "dashio.Device\n"
+            "print(' '.join(sorted(sys.modules)))\n"
+        )
+        modules = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+        for module in ("dashio.load_config", "dashio.config_snapshot", "dashio.iotcontrol.time_graph", "dateutil"):
+            self.assertNotIn(module, modules)
+        self.assertIn("dashio.device", modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from dashio import ControlPosition, Device, Knob, decode_cfg64, encode_cfg64, load_all_controls_from_config
+
+
+class TestLoadConfig(unittest.TestCase):
+
+    def _make_cfg(self, count):
+        position = ControlPosition(0.0, 0.0, 1.0, 0.2)
+        knobs = [Knob(f"KNOB_{i}", control_position=position) for i in range(count)]
+        return {"KNOB": [cfg for knob in knobs for cfg in knob.get_cfg64(["", "", "DASH_ID", "1"])]}
+
+    def test_large_cfg64_round_trip(self):
+        cfg = self._make_cfg(500)
+        self.assertEqual(decode_cfg64(encode_cfg64(cfg)), cfg)
+
+    def test_load_all_controls_from_config(self):
+        cfg = self._make_cfg(3)
+        cfg["KNOB"].append(dict(cfg["KNOB"][0], title="Second"))
+        test_device = Device("DEVICETYPE", "DEVICEID", "DEVICENAME")
+        load_all_controls_from_config(test_device, cfg)
+        self.assertEqual(len(test_device.controls_dict), 3)
+        knob_cfgs = test_device.controls_dict["KNOB\tKNOB_0"].get_cfg64(["", "", "DASH_ID", "1"])
+        self.assertEqual([knob_cfg["title"] for knob_cfg in knob_cfgs], ["A Knob", "Second"])
+
+
+if __name__ == '__main__':
+    unittest.main()
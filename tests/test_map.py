@@ -1,6 +1,8 @@
 import json
 import unittest
 
+from dashio import Map, MapLocation, MapTrack
+
 
 def _get_cfg_dict(cfg_list: list):
     json_str = cfg_list[0].rpartition('\t')[2]
@@ -71,5 +73,58 @@ class TestMap(unittest.TestCase):
 """
 
 
+class TestMapTrack(unittest.TestCase):
+
+    def test_map_location_json(self):
+        test_location = MapLocation("-45.2", "168.8", average_speed="10", timestamp=60)
+        test_loc = json.loads(test_location.to_json())
+        self.assertEqual(test_loc, {"time": "1970-01-01T00:01:00+00:00", "latitude": "-45.2", "longitude": "168.8", "avgeSpeed": "10"})
+
+    def test_map_track_is_bounded(self):
+        test_track = MapTrack("TRACK", max_points=10)
+        for i in range(25):
+            test_track.add_location(MapLocation("-45.0", str(168 + i * 0.01), timestamp=i))
+        self.assertEqual(len(test_track.locations), 10)
+        self.assertEqual([loc.epoch for loc in test_track.get_locations(20)], [21, 22, 23, 24])
+
+    def test_map_track_max_age(self):
+        test_track = MapTrack("TRACK", max_age=5)
+        for i in range(25):
+            test_track.add_location(MapLocation("-45.0", str(168 + i * 0.01), timestamp=i))
+        self.assertEqual([loc.epoch for loc in test_track.get_locations()], [20, 21, 22, 23, 24])
+        self.assertLessEqual(len(test_track.locations), 6, "Locations older than max_age shouldn't be kept")
+
+    def test_map_track_tolerance(self):
+        test_track = MapTrack("TRACK", tolerance=5.0)
+        # A straight line east, then a turn north.
+        for i in range(10):
+            test_track.add_location(MapLocation("-45.0", str(168 + i * 0.001), timestamp=i))
+        for i in range(1, 10):
+            test_track.add_location(MapLocation(str(-45.0 + i * 0.001), "168.009", timestamp=10 + i))
+        corners = [(loc.latitude, loc.longitude) for loc in test_track.get_locations()]
+        self.assertEqual(corners, [("-45.0", "168.0"), ("-45.0", "168.009"), ("-44.991", "168.009")])
+
+
+class TestMap(unittest.TestCase):
+
+    def test_map_history(self):
+        test_control = Map("MAPID")
+        for i in range(5):
+            test_control.add_location_to_track(MapLocation("-45.0", str(168 + i), timestamp=i * 60), "TRACK1")
+        test_control.add_location_to_track(MapLocation("-46.0", "169.0", timestamp=30), "TRACK2")
+        history = list(test_control._process_rx_message(["DEVICEID", "MAP", "MAPID", "DASHID", "1970-01-01T00:02:00Z"]))
+        self.assertEqual(len(history), 1, "TRACK2 has nothing after the timestamp")
+        self.assertTrue(history[0].startswith("\t{device_id}\tMAP\tMAPID\tDASHID\tTRACK1\t"))
+        self.assertEqual(history[0].count("{\"time\""), 2)
+
+    def test_map_track_id_is_sanitised(self):
+        test_control = Map("MAPID")
+        test_control.add_track(MapTrack("TRACK\t1", max_points=5))
+        for i in range(10):
+            test_control.add_location_to_track(MapLocation("-45.0", str(168 + i), timestamp=i), "TRACK\t1")
+        self.assertEqual(list(test_control.tracks), ["TRACK 1"])
+        self.assertEqual(len(test_control.tracks["TRACK 1"].locations), 5)
+
+
 if __name__ == '__main__':
     unittest.main()
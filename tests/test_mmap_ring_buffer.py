@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from dashio.iotcontrol.mmap_ring_buffer import _WRITTEN, MmapRingBuffer
+
+
+def _to_record(item):
+    return item
+
+
+def _from_record(epoch, value):
+    return (epoch, value)
+
+
+class TestMmapRingBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "line.ring")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _open(self, size_max=5):
+        return MmapRingBuffer(self.path, size_max, _to_record, _from_record)
+
+    def test_mmap_ring_buffer_keeps_newest(self):
+        test_buffer = self._open()
+        for i in range(12):
+            test_buffer.append((i, float(i)))
+        self.assertEqual(test_buffer.get(), [(i, float(i)) for i in range(7, 12)])
+        self.assertEqual(test_buffer.get_latest(), (11, 11.0))
+        self.assertEqual(test_buffer.count, 12)
+        self.assertEqual(list(test_buffer.since(8)), [(9, 9.0), (10, 10.0), (11, 11.0)])
+        test_buffer.close()
+
+    def test_mmap_ring_buffer_in_memory(self):
+        test_buffer = MmapRingBuffer(None, 3, _to_record, _from_record)
+        test_buffer.extend([(10, 1), (20, True), (30, "B"), (40, 2.5)])
+        self.assertEqual(test_buffer.get(), [(20, True), (30, "B"), (40, 2.5)])
+        self.assertEqual(list(test_buffer.since(25)), [(30, "B"), (40, 2.5)])
+        test_buffer.flush()
+        test_buffer.close()
+        self.assertEqual(os.listdir(self.tmp_dir.name), [], "No file should be made")
+
+    def test_mmap_ring_buffer_reopen(self):
+        test_buffer = self._open()
+        test_buffer.extend([(10, 1), (20, True), (30, "B"), (40, 2.5)])
+        test_buffer.close()
+        test_buffer = self._open()
+        self.assertEqual(test_buffer.get(), [(10, 1), (20, True), (30, "B"), (40, 2.5)])
+        self.assertEqual(test_buffer.count, 4)
+        test_buffer.extend([(50, 3), (60, 4)])
+        self.assertEqual([item[0] for item in test_buffer], [20, 30, 40, 50, 60])
+        test_buffer.close()
+
+    def test_mmap_ring_buffer_since_out_of_order(self):
+        test_buffer = self._open()
+        for epoch in (10, 30, 20, 40):
+            test_buffer.append((epoch, 0.0))
+        self.assertEqual([item[0] for item in test_buffer.since(15)], [30, 20, 40])
+        test_buffer.close()
+
+    def test_mmap_ring_buffer_crash_before_header_update(self):
+        test_buffer = self._open(size_max=3)
+        test_buffer.extend([(10, 1.0), (20, 2.0), (30, 3.0)])
+        # A crash after the record is written but before the header includes it.
+        test_buffer._write(test_buffer.cur, (40, 4.0))
+        test_buffer.close()
+        test_buffer = self._open(size_max=3)
+        self.assertEqual(test_buffer.get(), [(10, 1.0), (20, 2.0), (30, 3.0)])
+        self.assertEqual(list(test_buffer.since(15)), [(20, 2.0), (30, 3.0)])
+        test_buffer.close()
+
+    def test_mmap_ring_buffer_ordered_again_once_overwritten(self):
+        test_buffer = self._open(size_max=3)
+        for epoch in (10, 30, 20):
+            test_buffer.append((epoch, 0.0))
+        test_buffer.close()
+        test_buffer = self._open(size_max=3)
+        self.assertEqual([item[0] for item in test_buffer.since(15)], [30, 20])
+        test_buffer.extend([(40, 0.0), (50, 0.0)])
+        self.assertGreaterEqual(test_buffer._header[_WRITTEN], test_buffer._ordered_from)
+        self.assertEqual([item[0] for item in test_buffer.since(25)], [40, 50])
+        test_buffer.close()
+
+    def test_mmap_ring_buffer_errors(self):
+        test_buffer = self._open()
+        with self.assertRaises(TypeError):
+            test_buffer.append((1, "text"))
+        test_buffer.close()
+        with self.assertRaises(ValueError):
+            self._open(size_max=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from dashio import MessagePriority
+from dashio.priority_outbox import PriorityOutbox, priority_frame, split_frames, split_reply
+
+
+class TestPriorityOutbox(unittest.TestCase):
+
+    def test_priority_outbox_highest_priority_first(self):
+        outbox = PriorityOutbox()
+        outbox.put(MessagePriority.BULK, "bulk")
+        outbox.put(MessagePriority.INTERACTIVE, "interactive")
+        outbox.put(MessagePriority.ALARM, "alarm")
+        self.assertEqual([outbox.pop(), outbox.pop(), outbox.pop()], ["alarm", "interactive", "bulk"])
+        self.assertIsNone(outbox.pop(), "Empty outbox should return None")
+
+    def test_priority_outbox_can_send_skips_blocked_queue(self):
+        outbox = PriorityOutbox()
+        outbox.put(MessagePriority.BULK, "bulk")
+        outbox.put(MessagePriority.INTERACTIVE, "interactive")
+        self.assertEqual(outbox.pop(lambda priority, _: priority == MessagePriority.BULK), "bulk")
+        self.assertEqual(outbox.queued(), {"alarm": 0, "interactive": 1, "bulk": 0})
+
+    def test_split_frames_without_priority_is_interactive(self):
+        self.assertEqual(split_frames([b"ALL", b"data"]), (b"ALL", b"data", MessagePriority.INTERACTIVE))
+
+    def test_split_frames_with_priority(self):
+        frames = [b"ALL", b"data", priority_frame(MessagePriority.ALARM)]
+        self.assertEqual(split_frames(frames), (b"ALL", b"data", MessagePriority.ALARM))
+
+    def test_split_frames_bad_length(self):
+        with self.assertRaises(ValueError):
+            split_frames([b"ALL"])
+
+    def test_split_reply_keeps_whole_lines(self):
+        reply = "".join(f"\tDEVICEID\tTEXT\tID{i}\tHello\n" for i in range(100))
+        frames = list(split_reply(reply, 200))
+        self.assertGreater(len(frames), 1)
+        self.assertEqual("".join(frames), reply)
+        for frame in frames:
+            self.assertLessEqual(len(frame), 200)
+            self.assertTrue(frame.endswith("\n"), "Frames should end on a whole line")
+
+    def test_split_reply_from_generator(self):
+        lines = [f"\tDEVICEID\tTEXT\tID{i}\tHello\n" for i in range(100)]
+        frames = list(split_reply((line for line in lines), 200))
+        self.assertEqual("".join(frames), "".join(lines))
+        for frame in frames:
+            self.assertLessEqual(len(frame), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
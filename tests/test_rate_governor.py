@@ -0,0 +1,38 @@
+import unittest
+
+from dashio import RateGovernor
+
+
+class TestRateGovernor(unittest.TestCase):
+
+    def test_rate_governor_burst_is_paced(self):
+        governor = RateGovernor(messages_per_sec=5, bytes_per_sec=10000)
+        sent = [governor.try_acquire("announce", 10) for _ in range(10)]
+        self.assertEqual(sent.count(True), 5, "Only a bursts worth of messages should pass")
+
+    def test_rate_governor_bytes_limit(self):
+        governor = RateGovernor(messages_per_sec=100, bytes_per_sec=100)
+        self.assertTrue(governor.try_acquire("data", 80))
+        self.assertFalse(governor.try_acquire("data", 80), "Byte bucket should be empty")
+
+    def test_rate_governor_oversized_message_passes_when_full(self):
+        governor = RateGovernor(messages_per_sec=10, bytes_per_sec=100)
+        self.assertTrue(governor.try_acquire("data", 1000), "Oversized message should pass from a full bucket")
+        self.assertLess(governor.levels()["data"]["bytes"], 0, "Bucket should be in debt")
+
+    def test_rate_governor_lanes_are_independent(self):
+        governor = RateGovernor(messages_per_sec=1, bytes_per_sec=1000)
+        self.assertTrue(governor.try_acquire("announce", 10))
+        self.assertFalse(governor.try_acquire("announce", 10))
+        self.assertTrue(governor.try_acquire("alarm", 10), "Alarm lane shouldn't be throttled by announces")
+
+    def test_rate_governor_set_lane_rate(self):
+        governor = RateGovernor()
+        governor.set_lane_rate("alarm", 2, 500)
+        levels = governor.levels()
+        self.assertAlmostEqual(levels["alarm"]["messages"], 2)
+        self.assertAlmostEqual(levels["alarm"]["bytes"], 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from dashio.iotcontrol.ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_ring_buffer_keeps_newest(self):
+        test_buffer = RingBuffer(5)
+        for i in range(12):
+            test_buffer.append(i)
+        self.assertEqual(test_buffer.get(), [7, 8, 9, 10, 11])
+        self.assertEqual(list(test_buffer.view()), [7, 8, 9, 10, 11])
+        self.assertEqual(test_buffer.get_latest(), 11)
+
+    def test_ring_buffer_since(self):
+        test_buffer = RingBuffer(5, timestamp_key=lambda item: item)
+        for i in range(8):
+            test_buffer.append(i * 10)
+        self.assertEqual(list(test_buffer.since(45)), [50, 60, 70])
+        self.assertEqual(list(test_buffer.since(0)), [30, 40, 50, 60, 70])
+        self.assertEqual(len(test_buffer.since(70)), 0)
+
+    def test_ring_buffer_since_out_of_order(self):
+        test_buffer = RingBuffer(5, timestamp_key=lambda item: item)
+        for item in (10, 30, 20, 40):
+            test_buffer.append(item)
+        self.assertEqual(list(test_buffer.since(15)), [30, 20, 40])
+
+    def test_ring_buffer_since_is_a_copy(self):
+        test_buffer = RingBuffer(5, timestamp_key=lambda item: item)
+        for i in range(8):
+            test_buffer.append(i * 10)
+        history = test_buffer.since(35)
+        for i in range(8, 12):
+            test_buffer.append(i * 10)
+        self.assertEqual(history, [40, 50, 60, 70], "Appends shouldn't change a reply being streamed")
+
+    def test_ring_buffer_since_ordered_again_once_overwritten(self):
+        test_buffer = RingBuffer(3, timestamp_key=lambda item: item)
+        for item in (10, 30, 20):
+            test_buffer.append(item)
+        for item in (40, 50, 60):
+            test_buffer.append(item)
+        self.assertGreaterEqual(test_buffer.count, test_buffer._ordered_from)
+        self.assertEqual(test_buffer.since(45), [50, 60])
+
+    def test_ring_buffer_drop_until(self):
+        test_buffer = RingBuffer(5, timestamp_key=lambda item: item)
+        for i in range(8):
+            test_buffer.append(i * 10)
+        self.assertEqual(test_buffer.drop_until(45, min_items=3), 0)
+        self.assertEqual(test_buffer.drop_until(45), 2)
+        self.assertEqual(test_buffer.get(), [50, 60, 70])
+        test_buffer.extend([80, 90, 100])
+        self.assertEqual(test_buffer.get(), [60, 70, 80, 90, 100])
+        self.assertEqual(test_buffer.since(75), [80, 90, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
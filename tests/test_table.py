@@ -0,0 +1,54 @@
+import unittest
+
+from dashio import Table, TableRow
+
+
+class TestTable(unittest.TestCase):
+
+    def _make_table(self, rows=0):
+        test_control = Table("TABLEID", columns=3)
+        for i in range(rows):
+            test_control.add_table_row(TableRow(f"Row {i}", [str(i), "OK"]))
+        self.sent = []
+        test_control._message_tx_event += self.sent.append
+        return test_control
+
+    def test_table_control_type(self):
+        test_control = Table("TABLEID")
+        test_str_list = test_control._control_hdr_str.split('\t')
+        self.assertEqual(test_str_list[2], 'TBL', "control type should be TBL")
+
+    def test_table_update_row(self):
+        test_control = self._make_table(2)
+        test_control.update_table_row(TableRow("Row 1", ["1", "FAIL"]), 1)
+        self.assertEqual(self.sent, ["\t{device_id}\tTBL\tTABLEID\t1\t1\tFAIL\tRow 1\n"])
+
+    def test_table_batch(self):
+        test_control = self._make_table(200)
+        with test_control.batch():
+            for i in range(200):
+                status = "FAIL" if i % 50 == 0 else "OK"
+                test_control.update_table_row(TableRow(f"Row {i}", [str(i), status]), i)
+            test_control.add_table_row(TableRow("Row 200", ["200", "OK"]))
+            test_control.clear_row(199)
+        self.assertEqual(len(self.sent), 1, "A batch should be sent as one message")
+        rows = self.sent[0].splitlines()
+        self.assertEqual([row.split('\t')[4] for row in rows], ["0", "50", "100", "150", "199", "200"], "Only changed rows should be sent")
+
+    def test_table_update_rows(self):
+        test_control = self._make_table(3)
+        test_control.update_rows({0: TableRow("Row 0", ["0", "OK"]), 2: TableRow("Row 2", ["2", "FAIL"])})
+        self.assertEqual(self.sent, ["\t{device_id}\tTBL\tTABLEID\t2\t2\tFAIL\tRow 2\n"])
+        test_control.update_rows({0: TableRow("Row 0", ["0", "OK"])})
+        self.assertEqual(len(self.sent), 1, "Nothing changed so nothing should be sent")
+
+    def test_table_batch_clear_table(self):
+        test_control = self._make_table(3)
+        with test_control.batch():
+            test_control.clear_table()
+            test_control.add_table_row(TableRow("New", ["1", "OK"]))
+        self.assertEqual(self.sent, ["\t{device_id}\tTBL\tTABLEID\t\n\t{device_id}\tTBL\tTABLEID\t0\t1\tOK\tNew\n"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import datetime
 import json
+import os
+import tempfile
 import unittest
 
-from dashio import TimeGraph
+from dashio import DataPoint, DataPointArray, TimeGraph, TimeGraphLine, TimeGraphLineType
+from dashio.iotcontrol.timestamps import epoch_to_iso, iso_to_epoch
 
 
 def _get_cfg_dict(cfg_list: list):
@@ -41,6 +45,167 @@ class TestTimeGraph(unittest.TestCase):
         cfg_dict = _get_cfg_dict(test_control.get_cfg(["DEVICEID", "CONTROLID", "DASHID", 1]))
         self.assertEqual(cfg_dict['yAxisNumBars'], 3, "CFG yAxisNumBars should be 3")
 
+    def test_time_graph_line_history(self):
+        test_line = TimeGraphLine("LINE", break_data=True)
+        start = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        for i in range(5):
+            data_p = DataPoint(i)
+            data_p.timestamp = start + datetime.timedelta(seconds=i)
+            test_line.add_data_point(data_p)
+        line_str = test_line.get_line_from_timestamp("2024-01-01T00:00:02Z")
+        self.assertEqual(line_str, "\tLINE\tLINE\t0\tleft\t2024-01-01T00:00:03+00:00,3\t2024-01-01T00:00:04+00:00,4\n")
+        line_str = test_line.get_line_from_timestamp("2023-12-31T00:00:00")
+        self.assertTrue(line_str.startswith("\tLINE\tLINE\t0\tleft\t2024-01-01T00:00:00+00:00,b\t2024-01-01T00:00:00+00:00,0"))
+        self.assertEqual(test_line.get_line_from_timestamp("2024-01-01T00:00:04Z"), "")
+
+    def test_time_graph_line_history_cache_updates(self):
+        test_line = TimeGraphLine("LINE")
+        test_line.add_data_point(1)
+        first = test_line.get_line_from_timestamp("2000-01-01T00:00:00Z")
+        self.assertEqual(first, test_line.get_line_from_timestamp("2000-01-01T00:00:00Z"))
+        test_line.add_data_point(2)
+        self.assertTrue(test_line.get_line_from_timestamp("2000-01-01T00:00:00Z").endswith(",2\n"), "New points should be sent")
+
+    def test_time_graph_long_history_bounded_lines(self):
+        test_control = TimeGraph("TGRAPH_ID")
+        test_line = TimeGraphLine("LINE", max_data_points=1000, break_data=True)
+        test_line.add_data_points([1000 + i for i in range(1000)], list(range(1000)))
+        test_control.add_line("L1", test_line)
+        lines = list(test_control._process_rx_message(["DEVICEID", "TGRPH", "TGRAPH_ID", "DASHID", "1970-01-01T00:00:00Z"]))
+        self.assertEqual(len(lines), 5)
+        for line in lines:
+            self.assertTrue(line.startswith("\t{device_id}\tTGRPH\tTGRAPH_ID\tDASHID\tL1\tLINE\tLINE\t0\tleft\t"))
+            self.assertLessEqual(line.count(",") - line.count(",b"), TimeGraph.HISTORY_POINTS_PER_LINE)
+        self.assertEqual(sum(line.count(",") for line in lines), 1001, "Every point and one break should be sent")
+        self.assertLess(max(map(len, lines)), 10000)
+
+    def test_data_point_wire_format(self):
+        timestamp = datetime.datetime(2024, 1, 1, 12, 30, tzinfo=datetime.timezone.utc)
+        self.assertEqual(str(DataPoint(1.5, timestamp)), "2024-01-01T12:30:00+00:00,1.5")
+        self.assertEqual(str(DataPointArray([1, 2.5, "3"], timestamp)), "2024-01-01T12:30:00+00:00,[1,2.5,3]")
+        self.assertEqual(str(DataPoint(True, 1704112200)), "2024-01-01T12:30:00+00:00,True")
+        self.assertFalse(hasattr(DataPoint(1), "__dict__"), "DataPoint should be slotted")
+
+    def test_data_point_change_updates_text(self):
+        data_p = DataPoint(1, 1704067200)
+        self.assertEqual(str(data_p), "2024-01-01T00:00:00+00:00,1")
+        data_p.data_point = 2
+        data_p.timestamp = datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+        self.assertEqual(str(data_p), "2024-01-02T00:00:00+00:00,2")
+
+    def test_time_graph_line_explicit_timestamp(self):
+        test_line = TimeGraphLine("LINE")
+        test_line.add_data_point(5, timestamp="2024-01-01T00:00:00Z")
+        self.assertEqual(test_line.get_latest_data(), "\t2024-01-01T00:00:00+00:00,5\n")
+
+    def test_time_graph_line_add_data_points(self):
+        test_line = TimeGraphLine("LINE", max_data_points=3)
+        test_line.add_data_points([1704067200 + i for i in range(5)], [float(i) for i in range(5)])
+        self.assertEqual(len(test_line.data), 3)
+        self.assertEqual([data_p.data_point for data_p in test_line.data.view()], [2.0, 3.0, 4.0])
+        self.assertEqual(test_line.data.count, 5)
+        with self.assertRaises(ValueError):
+            test_line.add_data_points([1, 2], [1.0])
+
+    def test_time_graph_send_new_data(self):
+        test_control = TimeGraph("TGID")
+        test_line = TimeGraphLine("LINE")
+        test_control.add_line("L1", test_line)
+        sent = []
+        test_control.add_transmit_message_callback(sent.append)
+        test_line.add_data_points([1704067200, 1704067201], [1, 2])
+        test_control.send_new_data()
+        self.assertEqual(sent[-1], "\t{device_id}\tTGRPH\tTGID\tL1\t2024-01-01T00:00:00+00:00,1\t2024-01-01T00:00:01+00:00,2\n")
+        test_line.add_data_point(3, 1704067202)
+        test_control.send_new_data()
+        self.assertEqual(sent[-1], "\t{device_id}\tTGRPH\tTGID\tL1\t2024-01-01T00:00:02+00:00,3\n")
+        test_control.send_new_data()
+        self.assertEqual(len(sent), 2, "Nothing new to send")
+
+    def test_time_graph_line_history_decimated(self):
+        test_line = TimeGraphLine("LINE", max_data_points=1200)
+        test_line.add_data_points(list(range(1000)), [i % 17 for i in range(1000)])
+        test_line.add_break(1000)
+        test_line.add_data_points(list(range(1001, 1101)), [1.0] * 100)
+        points = test_line.get_line_from_timestamp("1960-01-01T00:00:00Z", max_points=100).rstrip("\n").split("\t")[5:]
+        self.assertLessEqual(len(points), 110)
+        self.assertIn("1970-01-01T00:16:40+00:00,B", points, "Break should be kept")
+        self.assertEqual(points[0], "1970-01-01T00:00:00+00:00,0", "First point should be kept")
+        self.assertEqual(points[-1], "1970-01-01T00:18:20+00:00,1.0", "Last point should be kept")
+
+    def test_time_graph_bar_history_decimated_by_sum(self):
+        test_line = TimeGraphLine("BARS", line_type=TimeGraphLineType.BAR, max_data_points=100)
+        test_line.add_data_points(list(range(100)), [1] * 100)
+        points = test_line.get_line_from_timestamp("1960-01-01T00:00:00Z", max_points=10).rstrip("\n").split("\t")[5:]
+        self.assertEqual(len(points), 10)
+        self.assertTrue(all(point.endswith(",10") for point in points), "Each bar should be the sum of its bucket")
+
+    def test_time_graph_bool_history_keeps_changes(self):
+        test_line = TimeGraphLine("BOOL", line_type=TimeGraphLineType.BOOL, max_data_points=100)
+        values = [False] * 100
+        values[37] = True
+        test_line.add_data_points(list(range(100)), values)
+        points = test_line.get_line_from_timestamp("1960-01-01T00:00:00Z", max_points=10).rstrip("\n").split("\t")[5:]
+        self.assertLessEqual(len(points), 10)
+        self.assertIn("1970-01-01T00:00:37+00:00,True", points, "A short pulse should survive decimation")
+
+    def test_time_graph_line_rollup_tier(self):
+        test_line = TimeGraphLine("LINE", max_data_points=60)
+        tier = test_line.add_rollup_tier(60, 100)
+        test_line.add_data_points(list(range(3600)), [i // 60 for i in range(3600)])
+        self.assertEqual(len(tier), 60, "One aggregate a minute")
+        self.assertEqual(tier.data.view()[1].data_point, 1.0, "Aggregate should be the mean")
+        history = test_line.get_line_from_timestamp("1960-01-01T00:00:00Z").rstrip("\n").split("\t")[5:]
+        self.assertEqual(len(history), 60)
+        self.assertEqual(history[0], "1970-01-01T00:00:00+00:00,0.0", "Whole window should come from the tier")
+        recent = test_line.get_line_from_timestamp("1970-01-01T00:59:29Z").rstrip("\n").split("\t")[5:]
+        self.assertEqual(len(recent), 30, "Recent window should come from the raw data")
+
+    def test_time_graph_line_storage_path(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "line.ring")
+            test_line = TimeGraphLine("LINE", max_data_points=100, break_data=True, storage_path=path)
+            test_line.add_data_points(list(range(60, 120)), [i * 0.5 for i in range(60)])
+            history = test_line.get_line_from_timestamp("1970-01-01T00:00:00Z")
+            test_line.close()
+            test_line = TimeGraphLine("LINE", max_data_points=100, break_data=True, storage_path=path)
+            self.assertEqual(test_line.get_line_from_timestamp("1970-01-01T00:00:00Z"), history, "History should survive a restart")
+            self.assertEqual(test_line.get_new_data(), "", "Stored points were already sent")
+            test_line.add_data_point(1.5, 200)
+            self.assertEqual(test_line.get_new_data(), "\t1970-01-01T00:03:20+00:00,1.5\n")
+            test_line.close()
+
+    def test_time_graph_line_columnar(self):
+        test_line = TimeGraphLine("LINE", max_data_points=50, break_data=True, columnar=True)
+        object_line = TimeGraphLine("LINE", max_data_points=50, break_data=True)
+        for line in (test_line, object_line):
+            line.add_data_points(list(range(60, 120)), [i * 0.5 for i in range(60)])
+            line.add_data_point(3, 130)
+            line.add_break(140)
+            line.add_data_point(True, 150)
+        self.assertIsNone(test_line.data.path)
+        self.assertEqual(
+            test_line.get_line_from_timestamp("1970-01-01T00:00:00Z"),
+            object_line.get_line_from_timestamp("1970-01-01T00:00:00Z"),
+            "Columns should give the same history as DataPoints"
+        )
+        self.assertEqual(test_line.get_latest_data(), object_line.get_latest_data())
+        with self.assertRaises(TypeError):
+            test_line.add_data_point(DataPointArray([1, 2]))
+        test_line.close()
+
+    def test_time_graph_line_rollup_tier_bar_sum(self):
+        test_line = TimeGraphLine("BARS", line_type=TimeGraphLineType.BAR, max_data_points=10)
+        tier = test_line.add_rollup_tier(10, 10)
+        test_line.add_data_points(list(range(25)), [1] * 25)
+        self.assertEqual([data_p.data_point for data_p in tier.since(-1)], [10, 10, 5])
+
+    def test_timestamps(self):
+        self.assertEqual(iso_to_epoch("2024-01-01T00:00:00Z"), 1704067200)
+        self.assertEqual(iso_to_epoch("2024-01-01T00:00:00.900+00:00"), 1704067200)
+        self.assertEqual(iso_to_epoch("2024-01-01T01:00:00+01:00"), 1704067200)
+        self.assertEqual(epoch_to_iso(1704067200), "2024-01-01T00:00:00+00:00")
+
 
 if __name__ == '__main__':
     unittest.main()